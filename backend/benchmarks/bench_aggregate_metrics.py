@@ -0,0 +1,142 @@
+"""
+Time aggregate_metrics end to end: Python sums vs the RPC.
+
+The previous implementation fetched the org's monitor ids, then every
+``metrics_json`` row in the window, and summed nine fields in Python. The
+``digest_metrics_totals`` function returns one row of nine totals. Both run
+here through the real async Supabase client against the local stand-in
+PostgREST server (benchmarks.fake_postgrest), which serves the bodies each
+approach receives for a synthetic org after ``--latency-ms``. The current
+path is DigestService.aggregate_metrics itself; the previous one is kept
+below. Database-side scan time is not included; it is paid by both.
+
+    cd backend && python -m benchmarks.bench_aggregate_metrics --monitors 100 --days 90
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from supabase import AsyncClient, acreate_client
+from benchmarks.fake_postgrest import BENCH_KEY, FakePostgrest
+from services.db import execute
+from services.digest import METRIC_FIELDS, DigestService
+
+ORG_ID = "00000000-0000-0000-0000-00000000000a"
+
+
+def synthetic_responses(
+    monitors: int, days: int, per_day: int, seed: int = 11
+) -> Tuple[bytes, bytes, bytes]:
+    """PostgREST bodies: monitor ids, digest rows, and the RPC totals row."""
+    rng = random.Random(seed)
+    monitor_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(monitors)]
+    rows: List[Dict[str, Any]] = []
+    for monitor_id in monitor_ids:
+        for _ in range(days * per_day):
+            rows.append(
+                {
+                    "metrics_json": {f: rng.randint(0, 12) for f in METRIC_FIELDS},
+                    "monitor_id": monitor_id,
+                }
+            )
+    totals = {f: sum(r["metrics_json"][f] for r in rows) for f in METRIC_FIELDS}
+    return (
+        json.dumps([{"id": m} for m in monitor_ids]).encode(),
+        json.dumps(rows).encode(),
+        json.dumps([totals]).encode(),
+    )
+
+
+async def legacy_aggregate_metrics(
+    client: AsyncClient, org_id: str, period_days: int = 7
+) -> Dict[str, int]:
+    """The previous org-wide aggregate_metrics: two queries, summed in Python."""
+    since = (datetime.utcnow() - timedelta(days=period_days)).isoformat()
+    monitors = await execute(
+        client.table("monitors").select("id").eq("org_id", org_id).eq("deleted", False)
+    )
+    monitor_ids = [m["id"] for m in (monitors.data or [])]
+    query = client.table("digests").select("metrics_json,monitor_id")
+    if monitor_ids:
+        query = query.in_("monitor_id", monitor_ids)
+    resp = await execute(query.gte("delivered_at", since))
+    digests = resp.data if resp and resp.data else []
+    digests = [d for d in digests if d.get("monitor_id") in monitor_ids]
+    totals = {field: 0 for field in METRIC_FIELDS}
+    for d in digests:
+        m = d.get("metrics_json") or {}
+        for field in METRIC_FIELDS:
+            totals[field] += int(m.get(field, 0) or 0)
+    return totals
+
+
+async def best_time(fn: Callable[[], Awaitable[Any]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main(
+    monitors: int, days: int, per_day: int, latency_ms: float, repeat: int
+) -> None:
+    logging.disable(logging.INFO)
+    monitors_body, digests_body, rpc_body = synthetic_responses(monitors, days, per_day)
+    with FakePostgrest(
+        {"monitors": monitors_body, "digests": digests_body},
+        {"digest_metrics_totals": rpc_body},
+        latency=latency_ms / 1000,
+    ) as server:
+        client = await acreate_client(server.url, BENCH_KEY)
+        service = DigestService(client)
+
+        async def legacy() -> Dict[str, int]:
+            return await legacy_aggregate_metrics(client, ORG_ID)
+
+        async def current() -> Dict[str, int]:
+            return await service.aggregate_metrics(ORG_ID)
+
+        assert await legacy() == await current()
+        legacy_time = await best_time(legacy, repeat)
+        current_time = await best_time(current, repeat)
+        await client.postgrest.aclose()
+
+    python_bytes = len(monitors_body) + len(digests_body)
+    rpc_bytes = len(rpc_body)
+    rows = monitors * days * per_day
+    print(f"org: {monitors} monitors x {days} days x {per_day}/day = {rows} digests")
+    print(
+        f"measured via the async client against a local stand-in PostgREST, "
+        f"{latency_ms:.0f} ms per request, best of {repeat}"
+    )
+    print(f"{'':22}{'payload':>12}{'latency':>12}")
+    print(
+        f"{'python sums (2 RTT)':22}{python_bytes / 1024:10.1f}KB"
+        f"{legacy_time * 1000:10.1f}ms"
+    )
+    print(f"{'rpc totals (1 RTT)':22}{rpc_bytes:11d}B{current_time * 1000:10.1f}ms")
+    print(
+        f"reduction: {python_bytes / rpc_bytes:,.0f}x payload, "
+        f"{legacy_time / current_time:.1f}x latency"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--monitors", type=int, default=100)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-day", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.monitors, args.days, args.per_day, args.latency_ms, args.repeat)
+    )
@@ -0,0 +1,133 @@
+"""
+Microbenchmark GitHubService.group_commit_messages over a synthetic corpus.
+
+Compares the original per-commit substring checks (repeated ``lower()`` calls
+and five separate tests) with CommitClassifier, which scans each lowercased
+summary once with a single compiled keyword alternation. On one-line
+messages both spend most of their time in the Python loop and run about
+even. The original also split every full message on newlines;
+``--body-lines`` gives commits a multi-line body, as squash merges of PRs usually have.
+
+    cd backend && python -m benchmarks.bench_commit_classifier --commits 100000
+    cd backend && python -m benchmarks.bench_commit_classifier --body-lines 20
+"""
+
+import argparse
+import logging
+import random
+import time
+from typing import Any, Dict, List
+from services.github import GitHubService
+
+SUBJECTS = [
+    "fix: handle empty payload in webhook",
+    "feat(api): add pagination to digest history",
+    "perf: cache compiled templates",
+    "docs: document rate limit settings",
+    "refactor(github): extract request helper",
+    "Bump httpx from 0.27.0 to 0.28.1",
+    "Merge pull request #412 from org/branch",
+    "Speed up CI by caching wheels",
+    "Fix flaky test in monitor service",
+    "chore: update lockfile",
+    "Add feature flag for weekly digests",
+    "update",
+]
+
+
+def synthetic_commits(
+    count: int, body_lines: int = 1, seed: int = 7
+) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    body = "\n".join(f"* Item {j} of the change description" for j in range(body_lines))
+    return [
+        {"commit": {"message": f"{rng.choice(SUBJECTS)} #{i}\n\n{body}"}}
+        for i in range(count)
+    ]
+
+
+def legacy_group_commit_messages(commits: List[Any]) -> Dict[str, List[str]]:
+    """The pre-classifier implementation, kept here as the baseline."""
+    grouped: Dict[str, List[str]] = {
+        "bugfix": [],
+        "feature": [],
+        "perf": [],
+        "docs": [],
+        "refactor": [],
+        "other": [],
+    }
+    for commit in commits:
+        msg = commit["commit"]["message"]
+        if not msg or len(msg.strip()) < 3:
+            continue
+        summary = msg.split("\n")[0][:100].strip()
+        if len(summary) < 5 or summary in [
+            ".",
+            "!",
+            "?",
+            "...",
+            "update",
+            "fix",
+            "wip",
+        ]:
+            continue
+        matched = False
+        if "fix" in summary.lower() or "bug" in summary.lower():
+            grouped["bugfix"].append(summary)
+            matched = True
+        if "feat" in summary.lower() or "feature" in summary.lower():
+            grouped["feature"].append(summary)
+            matched = True
+        if "perf" in summary.lower() or "speed" in summary.lower():
+            grouped["perf"].append(summary)
+            matched = True
+        if "doc" in summary.lower():
+            grouped["docs"].append(summary)
+            matched = True
+        if "refactor" in summary.lower():
+            grouped["refactor"].append(summary)
+            matched = True
+        if not matched:
+            grouped["other"].append(summary)
+    return {k: v for k, v in grouped.items() if v}
+
+
+def best_of(fns: Dict[str, Any], commits: List[Any], repeat: int) -> Dict[str, float]:
+    """Min wall time per implementation, interleaving runs to share noise."""
+    timings: Dict[str, List[float]] = {name: [] for name in fns}
+    for _ in range(repeat):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            fn(commits)
+            timings[name].append(time.perf_counter() - start)
+    return {name: min(values) for name, values in timings.items()}
+
+
+def main(count: int, repeat: int, body_lines: int) -> None:
+    logging.disable(logging.INFO)
+    commits = synthetic_commits(count, body_lines)
+    service = GitHubService(github_token="bench-token")
+    assert legacy_group_commit_messages(commits).keys() == (
+        service.group_commit_messages(commits).keys()
+    )
+    best = best_of(
+        {
+            "legacy": legacy_group_commit_messages,
+            "current": service.group_commit_messages,
+        },
+        commits,
+        repeat,
+    )
+    print(f"commits: {count} with {body_lines}-line bodies, best of {repeat}")
+    print(f"legacy substring checks: {best['legacy'] * 1000:8.1f} ms")
+    print(f"compiled alternation:    {best['current'] * 1000:8.1f} ms")
+    print(f"speedup:                 {best['legacy'] / best['current']:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--body-lines", type=int, default=1)
+    args = parser.parse_args()
+    main(args.commits, args.repeat, args.body_lines)
@@ -0,0 +1,74 @@
+"""
+Compare digest summary storage: inline text vs content-addressed zstd bodies.
+
+Digests used to carry their full ``summary`` markdown in every row. With
+``migrations/006_digest_contents.sql`` each distinct summary is stored once,
+compressed, and rows keep a 64 character hash. This benchmark builds synthetic
+summaries for ``--repos`` repositories watched by ``--monitors-per-repo``
+monitors each (identical summaries per repo and day), then reports the
+summary bytes each layout stores and the compression cost.
+
+    cd backend && python -m benchmarks.bench_digest_contents --repos 200 --days 90
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+from services.digest_contents import compress, content_hash
+
+WORDS = (
+    "fix add update refactor remove bump docs test ci api auth cache digest "
+    "monitor webhook slack discord email metrics timeseries org billing"
+).split()
+
+
+def synthetic_summary(rng: random.Random, repo: int) -> str:
+    lines = [f"## acme/repo-{repo}", "", "### Highlights"]
+    for section in ("Features", "Bug fixes", "Refactors", "Docs"):
+        lines += ["", f"### {section}"]
+        for _ in range(rng.randint(2, 12)):
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10)))
+            lines.append(
+                f"- {title} (#{rng.randint(100, 9999)}) by @dev{rng.randint(1, 40)}"
+            )
+    return "\n".join(lines)
+
+
+def main(repos: int, monitors_per_repo: int, days: int) -> None:
+    rng = random.Random(3)
+    summaries: List[str] = [
+        synthetic_summary(rng, repo) for repo in range(repos) for _ in range(days)
+    ]
+    rows = len(summaries) * monitors_per_repo
+    inline = sum(len(s.encode()) for s in summaries) * monitors_per_repo
+
+    started = time.perf_counter()
+    bodies: Dict[str, int] = {}
+    for summary in summaries:
+        data = summary.encode()
+        bodies.setdefault(content_hash(data), len(compress(data)))
+    elapsed = time.perf_counter() - started
+    stored = sum(bodies.values()) + rows * 64
+
+    print(
+        f"{repos} repos x {monitors_per_repo} monitors x {days} days = {rows:,} digests"
+    )
+    print(f"inline summaries:      {inline / 1024 / 1024:8.1f} MB")
+    print(
+        f"content-addressed:     {stored / 1024 / 1024:8.1f} MB "
+        f"({len(bodies):,} bodies + hashes)"
+    )
+    print(f"reduction:             {inline / stored:8.1f}x")
+    print(
+        f"hash + compress:       {elapsed / len(summaries) * 1e6:8.1f} us per summary"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repos", type=int, default=200)
+    parser.add_argument("--monitors-per-repo", type=int, default=3)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+    main(args.repos, args.monitors_per_repo, args.days)
@@ -0,0 +1,96 @@
+"""
+Compare digest history paging cost by depth: OFFSET vs (delivered_at, id) keyset.
+
+Builds an in-memory SQLite ``digests`` table with the index from
+``migrations/005_digests_keyset_index.sql`` and one busy monitor, then times
+fetching one page at increasing depths. OFFSET has to walk every skipped index
+entry; the keyset predicate, written as DigestService sends it (a
+``delivered_at <=`` bound plus the tiebreak OR), seeks straight to the cursor.
+SQLite stands in for Postgres; both plan these as a B-tree range scan.
+
+    cd backend && python -m benchmarks.bench_digest_pagination --rows 500000
+"""
+
+import argparse
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Tuple
+
+PAGE_QUERY = (
+    "SELECT id, status, delivered_at FROM digests WHERE monitor_id = ? {where}"
+    "ORDER BY delivered_at DESC, id DESC LIMIT ? {offset}"
+)
+
+
+def build(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE digests (id TEXT PRIMARY KEY, monitor_id TEXT NOT NULL, "
+        "status TEXT, delivered_at TEXT NOT NULL)"
+    )
+    start = datetime(2024, 1, 1)
+    conn.executemany(
+        "INSERT INTO digests VALUES (?, ?, 'sent', ?)",
+        (
+            # Every other pair shares a timestamp, exercising the id tiebreak
+            (f"d{i:08d}", "m1", (start + timedelta(minutes=i // 2)).isoformat())
+            for i in range(rows)
+        ),
+    )
+    conn.execute(
+        "CREATE INDEX digests_monitor_delivered_at_id_idx "
+        "ON digests (monitor_id, delivered_at DESC, id DESC)"
+    )
+    return conn
+
+
+def offset_page(conn: sqlite3.Connection, depth: int, limit: int) -> List[Any]:
+    sql = PAGE_QUERY.format(where="", offset="OFFSET ?")
+    return conn.execute(sql, ("m1", limit, depth)).fetchall()
+
+
+def keyset_page(
+    conn: sqlite3.Connection, after: Tuple[str, str], limit: int
+) -> List[Any]:
+    sql = PAGE_QUERY.format(
+        where="AND delivered_at <= ? "
+        "AND (delivered_at < ? OR (delivered_at = ? AND id < ?)) ",
+        offset="",
+    )
+    at, key = after
+    return conn.execute(sql, ("m1", at, at, at, key, limit)).fetchall()
+
+
+def best_time(fn: Any, *args: Any, repeat: int = 5) -> Tuple[float, Any]:
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(rows: int, limit: int) -> None:
+    conn = build(rows)
+    print(f"{rows:,} digests for one monitor, {limit} per page")
+    print(f"{'depth':>10}{'offset':>12}{'keyset':>12}")
+    depth = 0
+    while depth < rows - limit:
+        offset_s, page = best_time(offset_page, conn, depth, limit)
+        if depth:
+            last_id, _, last_at = offset_page(conn, depth - 1, 1)[0]
+            keyset_s, keyed = best_time(keyset_page, conn, (last_at, last_id), limit)
+            assert keyed == page
+        else:
+            keyset_s = offset_s
+        print(f"{depth:>10,}{offset_s * 1000:10.2f}ms{keyset_s * 1000:10.2f}ms")
+        depth = depth * 10 if depth else 100
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.limit)
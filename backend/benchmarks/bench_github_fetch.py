@@ -0,0 +1,67 @@
+"""
+Benchmark sequential vs concurrent GitHubService.fetch_repository_data.
+
+Runs against the in-process fake GitHub (benchmarks.fake_github) over ASGI,
+which answers every request after a fixed delay, so the numbers reflect
+request scheduling only and no network is needed.
+
+    cd backend && python -m benchmarks.bench_github_fetch --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+from benchmarks.fake_github import (
+    FAKE_GITHUB_URL,
+    FakeGitHubConfig,
+    create_fake_github,
+    fake_github_client,
+)
+from services.github import GitHubService
+
+
+async def time_fetch(service: GitHubService, concurrent: bool, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        await service.fetch_repository_data(
+            "octocat/hello-world", concurrent=concurrent
+        )
+    return (time.perf_counter() - start) / runs
+
+
+async def time_mode(latency_ms: float, concurrent: bool, runs: int) -> float:
+    # A fresh fake and token per mode, with the search limit sized to the
+    # run: each digest makes 4 search calls and the default 30/window would
+    # 403 midway. The client-side rate limiter is keyed by token, so reusing
+    # one would carry the first mode's exhausted quota into the second.
+    config = FakeGitHubConfig(
+        latency=latency_ms / 1000, search_rate_limit=max(30, 4 * runs)
+    )
+    async with fake_github_client(create_fake_github(config)) as client:
+        service = GitHubService(
+            github_token=f"bench-{'concurrent' if concurrent else 'sequential'}",
+            client=client,
+            base_url=FAKE_GITHUB_URL,
+        )
+        # Measure request scheduling, not 304 replays
+        service.cache = None
+        return await time_fetch(service, concurrent=concurrent, runs=runs)
+
+
+async def main(latency_ms: float, runs: int) -> Dict[str, float]:
+    sequential = await time_mode(latency_ms, concurrent=False, runs=runs)
+    concurrent = await time_mode(latency_ms, concurrent=True, runs=runs)
+    print(f"latency per request: {latency_ms:.0f} ms, runs: {runs}")
+    print(f"sequential: {sequential * 1000:8.1f} ms / digest")
+    print(f"concurrent: {concurrent * 1000:8.1f} ms / digest")
+    print(f"speedup:    {sequential / concurrent:8.2f}x")
+    return {"sequential": sequential, "concurrent": concurrent}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency_ms, args.runs))
@@ -0,0 +1,90 @@
+"""
+Benchmark concurrent request throughput with the sync and async Supabase clients.
+
+Starts the local stand-in PostgREST server (benchmarks.fake_postgrest), which
+answers every query after ``--latency-ms``, and drives the real supabase-py
+clients against it. Each simulated request makes ``--queries`` round-trips:
+
+- "blocking" calls the sync client inline inside the coroutine, as the
+  services used to;
+- "pooled" awaits services.db.execute on a sync client query, which runs it
+  on the bounded Supabase thread pool (SUPABASE_MAX_WORKERS);
+- "async" awaits services.db.execute on an async client query, as the
+  digest and metrics paths now do.
+
+The pool caps in-flight queries at its worker count, the async client at its
+connection limit; the gap grows with latency. httpx's async path costs more
+CPU per request, so where client and server share one CPU and queries are
+quick (the 20 ms default) the pool can still come out ahead.
+
+    cd backend && python -m benchmarks.bench_supabase_concurrency --requests 200
+    cd backend && python -m benchmarks.bench_supabase_concurrency --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict
+from supabase import acreate_client, create_client
+from benchmarks.fake_postgrest import BENCH_KEY, FakePostgrest
+from services.db import execute, shutdown_executor
+
+
+async def throughput(
+    handler: Callable[[], Awaitable[None]], requests: int, queries: int
+) -> float:
+    async def request() -> None:
+        for _ in range(queries):
+            await handler()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, queries: int, latency_ms: float) -> Dict[str, float]:
+    logging.disable(logging.INFO)
+    monitors = json.dumps([{"id": 1}]).encode()
+    with FakePostgrest({"monitors": monitors}, latency=latency_ms / 1000) as server:
+        sync_client = create_client(server.url, BENCH_KEY)
+        async_client = await acreate_client(server.url, BENCH_KEY)
+
+        async def blocking() -> None:
+            sync_client.table("monitors").select("id").limit(1).execute()
+
+        async def pooled() -> None:
+            await execute(sync_client.table("monitors").select("id").limit(1))
+
+        async def non_blocking() -> None:
+            await execute(async_client.table("monitors").select("id").limit(1))
+
+        # Open connections before timing anything
+        await non_blocking()
+        await pooled()
+        results = {
+            "async": await throughput(non_blocking, requests, queries),
+            "pooled": await throughput(pooled, requests, queries),
+            "blocking": await throughput(blocking, requests, queries),
+        }
+        await async_client.postgrest.aclose()
+        shutdown_executor()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    results = asyncio.run(main(args.requests, args.queries, args.latency_ms))
+    print(
+        f"requests: {args.requests} x {args.queries} queries, "
+        f"{args.latency_ms:.0f} ms per query (local stand-in PostgREST)"
+    )
+    print(f"blocking sync client: {results['blocking']:8.1f} req/s")
+    print(f"pooled execute():     {results['pooled']:8.1f} req/s")
+    print(f"async client:         {results['async']:8.1f} req/s")
+    print(f"async vs pooled:      {results['async'] / results['pooled']:8.2f}x")
@@ -0,0 +1,107 @@
+"""
+Compare timeseries bucketing: a per-row dict loop vs the NumPy columnar path.
+
+The previous ``timeseries_metrics`` walked every digest in Python, adding nine
+``metrics_json`` fields into a per-day dict. ``services.timeseries`` loads the
+window into an int64 matrix (one column per metric) plus a bucket-index column
+and sums with ``np.add.at``. This benchmark buckets ``--rows`` synthetic digest
+rows hourly, daily and weekly with both, checks they agree, and reports the
+time split between building the columns and bucketing them.
+
+    cd backend && python -m benchmarks.bench_timeseries_bucketing --rows 1000000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from services.digest import METRIC_FIELDS
+from services.timeseries import (
+    GRANULARITIES,
+    bucket_rows,
+    bucket_sums,
+    metric_matrix,
+    parse_times,
+)
+
+
+def synthetic_digests(
+    rows: int, days: int, end: datetime, seed: int = 7
+) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    span = days * 86400
+    return [
+        {
+            "delivered_at": (end - timedelta(seconds=rng.randrange(span))).isoformat()
+            + "+00:00",
+            "metrics_json": {f: rng.randint(0, 12) for f in METRIC_FIELDS},
+        }
+        for _ in range(rows)
+    ]
+
+
+def loop_buckets(
+    digests: List[Dict[str, Any]], start: datetime, step: timedelta, count: int
+) -> List[List[int]]:
+    """Client-side work of the previous per-row implementation."""
+    sums = [[0] * len(METRIC_FIELDS) for _ in range(count)]
+    for d in digests:
+        delivered = datetime.fromisoformat(d["delivered_at"][:19])
+        index = int((delivered - start) // step)
+        if not 0 <= index < count:
+            continue
+        m = d.get("metrics_json") or {}
+        bucket = sums[index]
+        for i, field in enumerate(METRIC_FIELDS):
+            bucket[i] += int(m.get(field, 0) or 0)
+    return sums
+
+
+def timed(fn: Any, *args: Any) -> Any:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(rows: int, days: int) -> None:
+    end = datetime(2025, 1, 1)
+    digests = synthetic_digests(rows, days, end)
+    print(f"{rows:,} digests over {days} days")
+
+    times, parse_s = timed(parse_times, [d["delivered_at"] for d in digests])
+    values, matrix_s = timed(metric_matrix, digests, METRIC_FIELDS, "metrics_json")
+    print(f"columns: parse {parse_s:.2f}s, metric matrix {matrix_s:.2f}s")
+    print(
+        f"{'granularity':12}{'buckets':>9}{'dict loop':>12}{'numpy':>10}{'speedup':>9}"
+    )
+    for name, step in GRANULARITIES.items():
+        count = -(-days * 86400 // int(step.total_seconds()))
+        start = end - step * count
+        expected, loop_s = timed(loop_buckets, digests, start, step, count)
+        sums, numpy_s = timed(bucket_sums, times, values, start, step, count)
+        assert sums.tolist() == expected
+        print(
+            f"{name:12}{count:9d}{loop_s:11.2f}s{numpy_s:9.3f}s"
+            f"{loop_s / numpy_s:8.0f}x"
+        )
+
+    _, end_to_end_s = timed(
+        bucket_rows,
+        digests,
+        "delivered_at",
+        METRIC_FIELDS,
+        end - timedelta(days=days),
+        timedelta(days=1),
+        days,
+        "metrics_json",
+    )
+    print(f"bucket_rows end to end (daily, columns included): {end_to_end_s:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+    main(args.rows, args.days)
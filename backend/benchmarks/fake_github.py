@@ -0,0 +1,318 @@
+"""
+In-process stand-in for the GitHub REST and GraphQL APIs.
+
+Serves /repos, /repos/{repo}/commits, /search/issues and /graphql from
+deterministic synthetic fixtures, with configurable latency, pagination,
+per-token rate limit headers, ETags and injected 403/502 errors. Plug it
+into GitHubService over ASGI (no network):
+
+    app = create_fake_github(FakeGitHubConfig(latency=0.05))
+    service = GitHubService("token", client=fake_github_client(app),
+                            base_url=FAKE_GITHUB_URL)
+
+or run it as a server and point GITHUB_API_URL at it:
+
+    cd backend && python -m benchmarks.fake_github --port 8765
+"""
+
+import re
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+FAKE_GITHUB_URL = "http://fake-github"
+
+COMMIT_MESSAGES = [
+    "feat: add export endpoint",
+    "fix: handle empty payloads",
+    "docs: update README",
+    "refactor: split service module",
+    "perf: cache parsed config",
+    "chore: bump dependencies",
+    "Merge pull request #{n} from org/branch",
+    "Improve error messages",
+]
+
+
+@dataclass
+class FakeGitHubConfig:
+    # Seconds added to every response, plus up to ``jitter`` seconds
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Commits per repository, one every ``commit_interval`` back from now
+    commits_per_repo: int = 250
+    commit_interval: timedelta = timedelta(minutes=30)
+    # Search total_count for each issue/PR query
+    search_total: int = 12
+    max_per_page: int = 100
+    # Requests per token and resource before 403s, per ``rate_limit_window``
+    rate_limit: int = 5000
+    search_rate_limit: int = 30
+    rate_limit_window: float = 3600.0
+    # Share of requests answered with a secondary-limit 403 or a 502
+    forbidden_rate: float = 0.0
+    bad_gateway_rate: float = 0.0
+    seed: int = 0
+
+
+class FakeGitHubState:
+    def __init__(self, config: FakeGitHubConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.requests: Counter[str] = Counter()
+        self._commits: Dict[str, List[Dict[str, Any]]] = {}
+        self._used: Counter[Tuple[str, str]] = Counter()
+        self._window_start = time.time()
+
+    def commits(self, repo: str) -> List[Dict[str, Any]]:
+        """Synthetic default-branch history, newest first."""
+        if repo in self._commits:
+            return self._commits[repo]
+        commits = []
+        for i in range(self.config.commits_per_repo):
+            date = self.now - self.config.commit_interval * i
+            message = COMMIT_MESSAGES[i % len(COMMIT_MESSAGES)].format(n=i)
+            sha = hashlib.sha1(f"{repo}:{i}".encode()).hexdigest()
+            commits.append(
+                {
+                    "sha": sha,
+                    "commit": {
+                        "message": f"{message}\n\nDetails for change {i}",
+                        "committer": {"date": date.strftime("%Y-%m-%dT%H:%M:%SZ")},
+                    },
+                    "_date": date,
+                }
+            )
+        self._commits[repo] = commits
+        return commits
+
+    def consume(self, token: str, resource: str) -> Tuple[Dict[str, str], bool]:
+        """Charge one request to the token's bucket.
+
+        Returns the rate limit headers and whether the bucket was already empty.
+        """
+        now = time.time()
+        if now - self._window_start >= self.config.rate_limit_window:
+            self._used.clear()
+            self._window_start = now
+        limit = (
+            self.config.search_rate_limit
+            if resource == "search"
+            else self.config.rate_limit
+        )
+        self._used[(token, resource)] += 1
+        used = self._used[(token, resource)]
+        headers = {
+            "x-ratelimit-limit": str(limit),
+            "x-ratelimit-remaining": str(max(0, limit - used)),
+            "x-ratelimit-reset": str(
+                int(self._window_start + self.config.rate_limit_window)
+            ),
+            "x-ratelimit-resource": resource,
+        }
+        return headers, used > limit
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _page(request: Request, items: List[Any], max_per_page: int) -> Tuple[List, str]:
+    """Slice ``items`` for the request's page and build its Link header."""
+    per_page = min(int(request.query_params.get("per_page", 30)), max_per_page)
+    page = int(request.query_params.get("page", 1))
+    start = (page - 1) * per_page
+    links = []
+    if start + per_page < len(items):
+        next_url = request.url.include_query_params(page=page + 1)
+        last = (len(items) + per_page - 1) // per_page
+        links.append(f'<{next_url}>; rel="next"')
+        links.append(f'<{request.url.include_query_params(page=last)}>; rel="last"')
+    return items[start : start + per_page], ", ".join(links)
+
+
+def _search_total(query: str, config: FakeGitHubConfig) -> int:
+    # A range ending before the start qualifies nothing, like the real API
+    match = re.search(r":(\S+)\.\.(\S+)", query)
+    if match and match.group(1) > match.group(2):
+        return 0
+    return config.search_total
+
+
+def create_fake_github(config: Optional[FakeGitHubConfig] = None) -> FastAPI:
+    state = FakeGitHubState(config or FakeGitHubConfig())
+    app = FastAPI(title="Fake GitHub")
+    app.state.fake = state
+
+    @app.middleware("http")
+    async def simulate(request: Request, call_next: Any) -> Response:
+        cfg = state.config
+        path = request.url.path
+        state.requests[path] += 1
+        if cfg.latency or cfg.jitter:
+            await asyncio.sleep(cfg.latency + state.random.uniform(0, cfg.jitter))
+
+        if path.startswith("/search/"):
+            resource = "search"
+        elif path == "/graphql":
+            resource = "graphql"
+        else:
+            resource = "core"
+        token = request.headers.get("authorization", "anonymous")
+        headers, exhausted = state.consume(token, resource)
+        if exhausted:
+            return JSONResponse(
+                {"message": "API rate limit exceeded"}, status_code=403, headers=headers
+            )
+        roll = state.random.random()
+        if roll < cfg.forbidden_rate:
+            return JSONResponse(
+                {"message": "You have exceeded a secondary rate limit."},
+                status_code=403,
+                headers={**headers, "retry-after": "1"},
+            )
+        if roll < cfg.forbidden_rate + cfg.bad_gateway_rate:
+            return JSONResponse({"message": "Server Error"}, status_code=502)
+
+        response: Response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    def json_with_etag(request: Request, body: Any, link: str = "") -> Response:
+        response = JSONResponse(body)
+        etag = '"' + hashlib.sha1(response.body).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"etag": etag})
+        response.headers["etag"] = etag
+        if link:
+            response.headers["link"] = link
+        return response
+
+    @app.get("/repos/{owner}/{repo}")
+    async def get_repo(request: Request, owner: str, repo: str) -> Response:
+        return json_with_etag(
+            request, {"full_name": f"{owner}/{repo}", "private": False}
+        )
+
+    @app.get("/repos/{owner}/{repo}/commits")
+    async def list_commits(request: Request, owner: str, repo: str) -> Response:
+        since = _parse_time(request.query_params.get("since"))
+        until = _parse_time(request.query_params.get("until"))
+        commits = [
+            {k: v for k, v in c.items() if k != "_date"}
+            for c in state.commits(f"{owner}/{repo}")
+            if (since is None or c["_date"] >= since)
+            and (until is None or c["_date"] <= until)
+        ]
+        items, link = _page(request, commits, state.config.max_per_page)
+        return json_with_etag(request, items, link)
+
+    @app.get("/search/issues")
+    async def search_issues(request: Request) -> Response:
+        query = request.query_params.get("q", "")
+        total = _search_total(query, state.config)
+        results = [
+            {"id": i, "number": i, "title": f"Result {i} for {query}"}
+            for i in range(total)
+        ]
+        items, link = _page(request, results, state.config.max_per_page)
+        return json_with_etag(
+            request,
+            {"total_count": total, "incomplete_results": False, "items": items},
+            link,
+        )
+
+    @app.post("/graphql")
+    async def graphql(request: Request) -> Response:
+        payload = await request.json()
+        query = payload.get("query", "")
+        variables = payload.get("variables") or {}
+        since = _parse_time(variables.get("since"))
+        until = _parse_time(variables.get("until"))
+        data: Dict[str, Any] = {}
+        repos = re.findall(
+            r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)', query
+        )
+        if "owner" in variables:
+            # Follow-up history page of one repository
+            repos = [("repository", variables["owner"], variables["name"])]
+        for alias, owner, name in repos:
+            commits = [
+                c
+                for c in state.commits(f"{owner}/{name}")
+                if (since is None or c["_date"] >= since)
+                and (until is None or c["_date"] <= until)
+            ]
+            offset = int(variables.get("after") or 0)
+            page = commits[offset : offset + 100]
+            data[alias] = {
+                "nameWithOwner": f"{owner}/{name}",
+                "isPrivate": False,
+                "defaultBranchRef": {
+                    "target": {
+                        "history": {
+                            "totalCount": len(commits),
+                            "pageInfo": {
+                                "hasNextPage": offset + 100 < len(commits),
+                                "endCursor": str(offset + len(page)),
+                            },
+                            "nodes": [
+                                {
+                                    "oid": c["sha"],
+                                    "message": c["commit"]["message"],
+                                    "committedDate": c["commit"]["committer"]["date"],
+                                }
+                                for c in page
+                            ],
+                        }
+                    }
+                },
+            }
+        for alias, search in re.findall(
+            r'(r\d+_\w+): search\(query: "((?:[^"\\]|\\.)*)"', query
+        ):
+            data[alias] = {"issueCount": _search_total(search, state.config)}
+        data["rateLimit"] = {"cost": 1, "remaining": 4999, "resetAt": None}
+        return JSONResponse({"data": data})
+
+    return app
+
+
+def fake_github_client(app: FastAPI, **kwargs: Any) -> httpx.AsyncClient:
+    """Client that talks to ``app`` over ASGI, without opening sockets."""
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url=FAKE_GITHUB_URL, **kwargs
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--bad-gateway-rate", type=float, default=0.0)
+    parser.add_argument("--forbidden-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_fake_github(
+            FakeGitHubConfig(
+                latency=args.latency_ms / 1000,
+                bad_gateway_rate=args.bad_gateway_rate,
+                forbidden_rate=args.forbidden_rate,
+            )
+        ),
+        port=args.port,
+    )
@@ -0,0 +1,91 @@
+"""
+Local stand-in for a Supabase PostgREST endpoint.
+
+Answers ``GET /rest/v1/{table}`` and ``POST /rest/v1/rpc/{name}`` with fixed
+JSON bodies after ``latency`` seconds, ignoring filters, so the real
+supabase-py clients can be timed without a database. Runs in a child process
+so it does not compete with the client for the GIL:
+
+    with FakePostgrest({"monitors": b'[{"id": 1}]'}, latency=0.02) as server:
+        client = await acreate_client(server.url, BENCH_KEY)
+"""
+
+import asyncio
+import multiprocessing
+import socket
+import time
+from typing import Any, Dict, Optional
+import uvicorn
+from fastapi import FastAPI, Response
+
+# Any JWT-shaped key passes the client's format check; the server ignores it
+BENCH_KEY = "bench.service.key"
+
+
+def create_fake_postgrest(
+    tables: Dict[str, bytes], rpcs: Dict[str, bytes], latency: float
+) -> FastAPI:
+    app = FastAPI()
+
+    def answer(body: Optional[bytes]) -> Response:
+        if body is None:
+            return Response(status_code=404)
+        return Response(body, media_type="application/json")
+
+    @app.get("/rest/v1/{table}")
+    async def select(table: str) -> Response:
+        await asyncio.sleep(latency)
+        return answer(tables.get(table))
+
+    @app.post("/rest/v1/rpc/{name}")
+    async def rpc(name: str) -> Response:
+        await asyncio.sleep(latency)
+        return answer(rpcs.get(name))
+
+    return app
+
+
+def serve(
+    port: int, tables: Dict[str, bytes], rpcs: Dict[str, bytes], latency: float
+) -> None:
+    uvicorn.run(
+        create_fake_postgrest(tables, rpcs, latency),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        backlog=4096,
+    )
+
+
+class FakePostgrest:
+    """Runs the stand-in server in a child process for a ``with`` block."""
+
+    def __init__(
+        self,
+        tables: Dict[str, bytes],
+        rpcs: Optional[Dict[str, bytes]] = None,
+        latency: float = 0.0,
+    ) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = multiprocessing.Process(
+            target=serve, args=(self.port, tables, rpcs or {}, latency), daemon=True
+        )
+
+    def __enter__(self) -> "FakePostgrest":
+        self.process.start()
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), 0.1).close()
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def __exit__(self, *exc: Any) -> None:
+        self.process.terminate()
+        self.process.join()
@@ -61,6 +61,20 @@ OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "400"))
 
 # GitHub
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+# Merges arriving within this many seconds are folded into one on_merge digest
+GITHUB_WEBHOOK_DEBOUNCE_SECONDS = float(
+    os.getenv("GITHUB_WEBHOOK_DEBOUNCE_SECONDS", "30")
+)
+
+# Digests: monitors on the same repo share one fetch + summary within this TTL
+DIGEST_COALESCE_TTL_SECONDS = int(os.getenv("DIGEST_COALESCE_TTL_SECONDS", "300"))
+# Window ends are rounded down to this boundary so concurrent runs share a window
+DIGEST_WINDOW_ALIGN_SECONDS = int(os.getenv("DIGEST_WINDOW_ALIGN_SECONDS", "300"))
+# Overall budget for one digest's outbound calls (GitHub, OpenAI, delivery)
+DIGEST_DEADLINE_SECONDS = float(os.getenv("DIGEST_DEADLINE_SECONDS", "120"))
+# A monitor's cursor never reaches back further than this
+DIGEST_MAX_LOOKBACK_DAYS = int(os.getenv("DIGEST_MAX_LOOKBACK_DAYS", "14"))
 
 # Security Settings
 ALGORITHM = "HS256"
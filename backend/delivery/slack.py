@@ -2,6 +2,7 @@ import httpx
 import logging
 from typing import Any
 import urllib.parse
+from services.resilience import RETRYABLE_STATUS, call_with_resilience
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,14 @@ class SlackService:
             message = self._format_message(summary, repo_name, repo_url)
 
             async with httpx.AsyncClient() as client:
-                response = await client.post(webhook, json=message, timeout=10.0)
+
+                async def post() -> httpx.Response:
+                    response = await client.post(webhook, json=message, timeout=10.0)
+                    if response.status_code in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                    return response
+
+                response = await call_with_resilience("hooks.slack.com", post)
 
                 if response.status_code == 200:
                     logger.info(f"Successfully sent digest to Slack for {repo_name}")
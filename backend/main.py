@@ -15,9 +15,13 @@ from routes.monitor import router as monitor_router
 from routes.auth import router as auth_router
 from routes.org import router as org_router
 from routes.billing import router as billing_router
+from routes.github_webhook import router as github_webhook_router
 
 # Import middleware
 from middleware.security import LoggingMiddleware, ErrorHandlingMiddleware
+from services.http_client import init_github_client, close_github_client
+from services.db import close_async_supabase, shutdown_executor
+from services.digest_writer import digest_log_writer
 
 """
 Infrasync API - A developer tool for monitoring GitHub repositories and sending GPT-generated summaries
@@ -97,26 +101,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                 "Continuing despite dependency check failure (development mode)"
             )
 
+    # Shared, connection-pooled client reused by every GitHubService
+    await init_github_client()
+    # Digest logs are queued on the request path and bulk-inserted here
+    digest_log_writer.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Infrasync API")
+    await close_github_client()
+    # Drain queued digest logs while the database clients are still up
+    await digest_log_writer.close()
+    await close_async_supabase()
+    shutdown_executor()
 
 
 async def check_dependencies() -> None:
     """Check if all required services are available"""
     try:
         # Check Supabase connection
-        from supabase import create_client
-        from config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
+        from services.db import execute, get_supabase
 
-        if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must not be None"
-            )
-        client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        client = get_supabase()
         # Simple query to test connection
-        client.table("monitors").select("id").limit(1).execute()
+        await execute(client.table("monitors").select("id").limit(1))
         logger.info("✅ Supabase connection successful")
 
     except Exception as e:
@@ -216,6 +225,7 @@ app.include_router(
 app.include_router(auth_router, prefix="/api/v1", tags=["auth"])
 app.include_router(org_router, prefix="/api/v1", tags=["org"])
 app.include_router(billing_router, prefix="/api/v1", tags=["billing"])
+app.include_router(github_webhook_router, prefix="/api/v1", tags=["github"])
 
 
 @app.get("/")
@@ -251,14 +261,10 @@ async def health_check() -> dict[str, Any]:
     # Check Supabase
     try:
         logger.info("Health check: Testing Supabase connection...")
-        from supabase import create_client
-        from config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
-
-        if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-            logger.error("Health check: Supabase config missing")
-            raise HTTPException(status_code=500, detail="Supabase config missing")
-        client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-        client.table("monitors").select("id").limit(1).execute()
+        from services.db import execute, get_supabase
+
+        client = get_supabase()
+        await execute(client.table("monitors").select("id").limit(1))
         health_status["checks"]["database"] = "healthy"
         logger.info("Health check: Supabase connection successful")
     except Exception as e:
@@ -280,6 +286,13 @@ async def health_check() -> dict[str, Any]:
         logger.error(f"Health check: OpenAI check failed: {e}")
         health_status["checks"]["openai"] = f"error: {str(e)}"
 
+    # Outbound circuit breakers (GitHub, OpenAI, Slack)
+    from services.resilience import circuit_breakers
+
+    health_status["checks"]["circuit_breakers"] = circuit_breakers.snapshot()
+    if circuit_breakers.any_open():
+        health_status["status"] = "degraded"
+
     logger.info(f"Health check: Returning status: {health_status['status']}")
     return health_status
 
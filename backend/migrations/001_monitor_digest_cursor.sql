@@ -0,0 +1,6 @@
+-- Per-monitor digest cursor: each digest covers [last_digest_until, now)
+-- instead of a fixed 24h window. Both columns are only advanced after a
+-- successful delivery, so failed or retried runs re-read the same window.
+alter table monitors
+  add column if not exists last_digest_until timestamptz,
+  add column if not exists last_commit_sha text;
@@ -0,0 +1,67 @@
+-- Server-side totals for DigestService.aggregate_metrics: one round-trip
+-- returning the nine sums instead of every metrics_json row in the window.
+
+-- A metric stored as a number counts as itself, a list by its length
+create or replace function digest_metric_count(metrics jsonb, key text)
+returns bigint
+language sql
+immutable
+as $$
+  select case jsonb_typeof(metrics -> key)
+    when 'number' then (metrics ->> key)::numeric::bigint
+    when 'array' then jsonb_array_length(metrics -> key)::bigint
+    else 0
+  end
+$$;
+
+-- Org-wide totals over the org's active monitors, or one monitor's totals.
+-- With p_monitor_id set no row comes back unless the monitor belongs to
+-- p_org_id, so callers can tell "not found" from "no activity".
+create or replace function digest_metrics_totals(
+  p_org_id uuid,
+  p_monitor_id uuid default null,
+  p_since timestamptz default null,
+  p_until timestamptz default null
+)
+returns table (
+  prs_opened bigint,
+  prs_closed bigint,
+  issues_opened bigint,
+  issues_closed bigint,
+  bugfixes bigint,
+  docs bigint,
+  features bigint,
+  refactors bigint,
+  perf bigint
+)
+language sql
+stable
+as $$
+  select
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'prs_opened')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'prs_closed')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'issues_opened')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'issues_closed')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'bugfixes')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'docs')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'features')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'refactors')), 0)::bigint,
+    coalesce(sum(digest_metric_count(d.metrics_json::jsonb, 'perf')), 0)::bigint
+  from digests d
+  join monitors m on m.id = d.monitor_id
+  where m.org_id = p_org_id
+    and (
+      (p_monitor_id is null and m.deleted = false)
+      or d.monitor_id = p_monitor_id
+    )
+    and (p_since is null or d.delivered_at >= p_since)
+    and (p_until is null or d.delivered_at < p_until)
+  having p_monitor_id is null
+    or exists (
+      select 1 from monitors
+      where id = p_monitor_id and org_id = p_org_id
+    )
+$$;
+
+create index if not exists digests_monitor_delivered_at_idx
+  on digests (monitor_id, delivered_at);
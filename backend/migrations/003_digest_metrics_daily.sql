@@ -0,0 +1,181 @@
+-- Daily rollup of digest metrics per monitor. Dashboards read at most one row
+-- per monitor and day instead of rescanning every digest in the window.
+create table if not exists digest_metrics_daily (
+  monitor_id uuid not null references monitors (id) on delete cascade,
+  day date not null,
+  digest_count integer not null default 0,
+  prs_opened bigint not null default 0,
+  prs_closed bigint not null default 0,
+  issues_opened bigint not null default 0,
+  issues_closed bigint not null default 0,
+  bugfixes bigint not null default 0,
+  docs bigint not null default 0,
+  features bigint not null default 0,
+  refactors bigint not null default 0,
+  perf bigint not null default 0,
+  updated_at timestamptz not null default now(),
+  primary key (monitor_id, day)
+);
+
+-- Add (sign = 1) or remove (sign = -1) one digest's metrics from its day
+create or replace function digest_metrics_daily_add(
+  p_monitor_id uuid, p_delivered_at timestamptz, p_metrics jsonb, p_sign integer
+)
+returns void
+language sql
+as $$
+  insert into digest_metrics_daily as r (
+    monitor_id, day, digest_count, prs_opened, prs_closed, issues_opened,
+    issues_closed, bugfixes, docs, features, refactors, perf
+  )
+  values (
+    p_monitor_id,
+    (p_delivered_at at time zone 'utc')::date,
+    p_sign,
+    p_sign * digest_metric_count(p_metrics, 'prs_opened'),
+    p_sign * digest_metric_count(p_metrics, 'prs_closed'),
+    p_sign * digest_metric_count(p_metrics, 'issues_opened'),
+    p_sign * digest_metric_count(p_metrics, 'issues_closed'),
+    p_sign * digest_metric_count(p_metrics, 'bugfixes'),
+    p_sign * digest_metric_count(p_metrics, 'docs'),
+    p_sign * digest_metric_count(p_metrics, 'features'),
+    p_sign * digest_metric_count(p_metrics, 'refactors'),
+    p_sign * digest_metric_count(p_metrics, 'perf')
+  )
+  on conflict (monitor_id, day) do update set
+    digest_count = r.digest_count + excluded.digest_count,
+    prs_opened = r.prs_opened + excluded.prs_opened,
+    prs_closed = r.prs_closed + excluded.prs_closed,
+    issues_opened = r.issues_opened + excluded.issues_opened,
+    issues_closed = r.issues_closed + excluded.issues_closed,
+    bugfixes = r.bugfixes + excluded.bugfixes,
+    docs = r.docs + excluded.docs,
+    features = r.features + excluded.features,
+    refactors = r.refactors + excluded.refactors,
+    perf = r.perf + excluded.perf,
+    updated_at = now()
+$$;
+
+-- Incremental maintenance: every digest insert (DigestService.log_digest)
+-- or delete is folded into its day in the same transaction
+create or replace function digest_metrics_daily_sync()
+returns trigger
+language plpgsql
+as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') and old.delivered_at is not null then
+    perform digest_metrics_daily_add(
+      old.monitor_id, old.delivered_at, coalesce(old.metrics_json::jsonb, '{}'), -1
+    );
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') and new.delivered_at is not null then
+    perform digest_metrics_daily_add(
+      new.monitor_id, new.delivered_at, coalesce(new.metrics_json::jsonb, '{}'), 1
+    );
+  end if;
+  return null;
+end
+$$;
+
+drop trigger if exists digests_metrics_daily on digests;
+create trigger digests_metrics_daily
+  after insert or delete or update of monitor_id, delivered_at, metrics_json
+  on digests
+  for each row execute function digest_metrics_daily_sync();
+
+-- Rebuild the rollup from digests for days on or after p_since (all days when
+-- null). Run once below; safe to re-run to repair drift:
+--   select backfill_digest_metrics_daily(now() - interval '7 days');
+create or replace function backfill_digest_metrics_daily(
+  p_since timestamptz default null
+)
+returns integer
+language plpgsql
+as $$
+declare
+  since_day date := (p_since at time zone 'utc')::date;
+  written integer;
+begin
+  -- Concurrent digest inserts wait and are applied on top of the rebuild
+  lock table digest_metrics_daily in share row exclusive mode;
+
+  delete from digest_metrics_daily
+  where since_day is null or day >= since_day;
+
+  insert into digest_metrics_daily (
+    monitor_id, day, digest_count, prs_opened, prs_closed, issues_opened,
+    issues_closed, bugfixes, docs, features, refactors, perf
+  )
+  select
+    d.monitor_id,
+    (d.delivered_at at time zone 'utc')::date,
+    count(*),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'prs_opened')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'prs_closed')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'issues_opened')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'issues_closed')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'bugfixes')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'docs')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'features')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'refactors')),
+    sum(digest_metric_count(d.metrics_json::jsonb, 'perf'))
+  from digests d
+  join monitors m on m.id = d.monitor_id
+  where d.delivered_at is not null
+    and (since_day is null or (d.delivered_at at time zone 'utc')::date >= since_day)
+  group by 1, 2;
+
+  get diagnostics written = row_count;
+  return written;
+end
+$$;
+
+select backfill_digest_metrics_daily();
+
+-- Totals now come from the rollup: whole UTC days from p_since's day up to,
+-- but excluding, p_until's day
+create or replace function digest_metrics_totals(
+  p_org_id uuid,
+  p_monitor_id uuid default null,
+  p_since timestamptz default null,
+  p_until timestamptz default null
+)
+returns table (
+  prs_opened bigint,
+  prs_closed bigint,
+  issues_opened bigint,
+  issues_closed bigint,
+  bugfixes bigint,
+  docs bigint,
+  features bigint,
+  refactors bigint,
+  perf bigint
+)
+language sql
+stable
+as $$
+  select
+    coalesce(sum(r.prs_opened), 0)::bigint,
+    coalesce(sum(r.prs_closed), 0)::bigint,
+    coalesce(sum(r.issues_opened), 0)::bigint,
+    coalesce(sum(r.issues_closed), 0)::bigint,
+    coalesce(sum(r.bugfixes), 0)::bigint,
+    coalesce(sum(r.docs), 0)::bigint,
+    coalesce(sum(r.features), 0)::bigint,
+    coalesce(sum(r.refactors), 0)::bigint,
+    coalesce(sum(r.perf), 0)::bigint
+  from digest_metrics_daily r
+  join monitors m on m.id = r.monitor_id
+  where m.org_id = p_org_id
+    and (
+      (p_monitor_id is null and m.deleted = false)
+      or r.monitor_id = p_monitor_id
+    )
+    and (p_since is null or r.day >= (p_since at time zone 'utc')::date)
+    and (p_until is null or r.day < (p_until at time zone 'utc')::date)
+  having p_monitor_id is null
+    or exists (
+      select 1 from monitors
+      where id = p_monitor_id and org_id = p_org_id
+    )
+$$;
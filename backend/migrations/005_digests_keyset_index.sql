@@ -0,0 +1,8 @@
+-- Digest history pages are read newest first and continued with a
+-- (delivered_at, id) keyset, so each page is an index seek however deep it is.
+-- The id tiebreak keeps digests delivered in the same instant in a stable order.
+create index if not exists digests_monitor_delivered_at_id_idx
+  on digests (monitor_id, delivered_at desc, id desc);
+
+-- Superseded: the new index serves the same range scans (read backwards)
+drop index if exists digests_monitor_delivered_at_idx;
@@ -0,0 +1,44 @@
+-- Content-addressed digest bodies. Monitors on the same repo produce
+-- byte-identical summaries; each body is stored once, zstd-compressed, under
+-- the sha256 of its uncompressed bytes and digest rows keep only the hash.
+create table if not exists digest_contents (
+  hash text primary key,
+  codec text not null default 'zstd',
+  size integer not null,
+  body bytea not null,
+  -- Refreshed by every write, including ones that find the body already
+  -- stored, so pruning never races a digest about to reference it
+  last_written_at timestamptz not null default now()
+);
+
+-- Rows written before this migration keep their inline summary; new rows
+-- leave it null and set summary_hash. raw_payload_hash is only set when raw
+-- payload capture is enabled (DIGEST_STORE_RAW_PAYLOAD).
+alter table digests
+  alter column summary drop not null,
+  add column if not exists summary_hash text references digest_contents (hash),
+  add column if not exists raw_payload_hash text references digest_contents (hash);
+
+create index if not exists digests_summary_hash_idx
+  on digests (summary_hash) where summary_hash is not null;
+create index if not exists digests_raw_payload_hash_idx
+  on digests (raw_payload_hash) where raw_payload_hash is not null;
+
+-- Bodies are shared, so deleting a digest leaves its contents behind. Run
+-- periodically to drop bodies no digest references any more:
+--   select prune_digest_contents();
+create or replace function prune_digest_contents(
+  p_min_age interval default interval '1 day'
+)
+returns integer
+language sql
+as $$
+  with pruned as (
+    delete from digest_contents c
+    where c.last_written_at < now() - p_min_age
+      and not exists (select 1 from digests d where d.summary_hash = c.hash)
+      and not exists (select 1 from digests d where d.raw_payload_hash = c.hash)
+    returning 1
+  )
+  select count(*)::integer from pruned
+$$;
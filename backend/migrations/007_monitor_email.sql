@@ -0,0 +1,4 @@
+-- Delivery address for email monitors. Digests triggered from the server
+-- side (the GitHub webhook) have no request body to take it from.
+alter table monitors
+  add column if not exists email text;
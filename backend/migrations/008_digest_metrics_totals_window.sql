@@ -0,0 +1,49 @@
+-- Whole UTC days after p_since's day, up to and including p_until's day.
+-- 003 counted from p_since's day itself, so a 7 day window ending now
+-- covered 8 days (today plus the 7 before it) while the offset window for
+-- the previous period covered 7.
+create or replace function digest_metrics_totals(
+  p_org_id uuid,
+  p_monitor_id uuid default null,
+  p_since timestamptz default null,
+  p_until timestamptz default null
+)
+returns table (
+  prs_opened bigint,
+  prs_closed bigint,
+  issues_opened bigint,
+  issues_closed bigint,
+  bugfixes bigint,
+  docs bigint,
+  features bigint,
+  refactors bigint,
+  perf bigint
+)
+language sql
+stable
+as $$
+  select
+    coalesce(sum(r.prs_opened), 0)::bigint,
+    coalesce(sum(r.prs_closed), 0)::bigint,
+    coalesce(sum(r.issues_opened), 0)::bigint,
+    coalesce(sum(r.issues_closed), 0)::bigint,
+    coalesce(sum(r.bugfixes), 0)::bigint,
+    coalesce(sum(r.docs), 0)::bigint,
+    coalesce(sum(r.features), 0)::bigint,
+    coalesce(sum(r.refactors), 0)::bigint,
+    coalesce(sum(r.perf), 0)::bigint
+  from digest_metrics_daily r
+  join monitors m on m.id = r.monitor_id
+  where m.org_id = p_org_id
+    and (
+      (p_monitor_id is null and m.deleted = false)
+      or r.monitor_id = p_monitor_id
+    )
+    and (p_since is null or r.day > (p_since at time zone 'utc')::date)
+    and (p_until is null or r.day <= (p_until at time zone 'utc')::date)
+  having p_monitor_id is null
+    or exists (
+      select 1 from monitors
+      where id = p_monitor_id and org_id = p_org_id
+    )
+$$;
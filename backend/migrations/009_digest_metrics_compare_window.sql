@@ -0,0 +1,60 @@
+-- Same windows as digest_metrics_totals (008): 'previous' is the days after
+-- p_since's day up to and including p_split's day, 'current' the days after
+-- p_split's day. 004 put p_split's day in 'current', which then covered
+-- period_days + 1 days (today included) against period_days for 'previous'.
+create or replace function digest_metrics_compare(
+  p_org_id uuid,
+  p_monitor_id uuid,
+  p_since timestamptz,
+  p_split timestamptz
+)
+returns table (
+  period text,
+  prs_opened bigint,
+  prs_closed bigint,
+  issues_opened bigint,
+  issues_closed bigint,
+  bugfixes bigint,
+  docs bigint,
+  features bigint,
+  refactors bigint,
+  perf bigint
+)
+language sql
+stable
+as $$
+  select
+    p.period,
+    coalesce(sum(r.prs_opened), 0)::bigint,
+    coalesce(sum(r.prs_closed), 0)::bigint,
+    coalesce(sum(r.issues_opened), 0)::bigint,
+    coalesce(sum(r.issues_closed), 0)::bigint,
+    coalesce(sum(r.bugfixes), 0)::bigint,
+    coalesce(sum(r.docs), 0)::bigint,
+    coalesce(sum(r.features), 0)::bigint,
+    coalesce(sum(r.refactors), 0)::bigint,
+    coalesce(sum(r.perf), 0)::bigint
+  from (values ('current'), ('previous')) as p (period)
+  left join (
+    select
+      d.*,
+      case
+        when d.day > (p_split at time zone 'utc')::date then 'current'
+        else 'previous'
+      end as period
+    from digest_metrics_daily d
+    join monitors m on m.id = d.monitor_id
+    where m.org_id = p_org_id
+      and (
+        (p_monitor_id is null and m.deleted = false)
+        or d.monitor_id = p_monitor_id
+      )
+      and d.day > (p_since at time zone 'utc')::date
+  ) r on r.period = p.period
+  where p_monitor_id is null
+    or exists (
+      select 1 from monitors
+      where id = p_monitor_id and org_id = p_org_id
+    )
+  group by p.period
+$$;
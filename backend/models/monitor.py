@@ -16,6 +16,11 @@ class Monitor(BaseModel):
     created_by: str
     deleted: Optional[bool] = False
     deleted_at: Optional[datetime] = None
+    # High-water mark of the last delivered digest
+    last_digest_until: Optional[datetime] = None
+    last_commit_sha: Optional[str] = None
+    # Delivery address when delivery_method is "email"
+    email: Optional[str] = None
 
     class Config:
         json_encoders = {
@@ -31,6 +36,7 @@ class MonitorCreate(BaseModel):
     delivery_method: Literal["slack", "discord", "email"]
     webhook_url: HttpUrl
     frequency: Literal["daily", "weekly", "on_merge"]
+    email: Optional[str] = None
 
     @validator("repo")
     def validate_repo_format(cls, v: str) -> str:
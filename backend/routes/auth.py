@@ -181,7 +181,9 @@ def set_jwt_cookie(data: dict[str, Any], response: Response) -> dict[str, str]:
 
 
 @router.get("/me")
-def get_me(request: Request, jwt_token: Optional[str] = Cookie(None)) -> dict[str, Any]:
+async def get_me(
+    request: Request, jwt_token: Optional[str] = Cookie(None)
+) -> dict[str, Any]:
     logger.info("/me endpoint called")
     logger.info(f"Incoming cookies: {request.cookies}")
     logger.info(f"Incoming headers: {request.headers}")
@@ -198,7 +200,7 @@ def get_me(request: Request, jwt_token: Optional[str] = Cookie(None)) -> dict[st
     user_id = payload.get("sub") if payload else None
     logger.info(f"(auth/me): org_id={org_id}, user_id={user_id}")
     if org_id and user_id and payload is not None:
-        is_member = org_service.is_user_in_org(org_id, user_id)
+        is_member = await org_service.is_user_in_org(org_id, user_id)
         logger.info(
             f"(auth/me): org_service.is_user_in_org({org_id}, {user_id}) -> {is_member}"
         )
@@ -240,7 +242,7 @@ def logout(response: Response) -> dict[str, str]:
 
 
 @router.delete("/auth/me")
-def delete_own_account(
+async def delete_own_account(
     response: Response, jwt_token: Optional[str] = Cookie(None)
 ) -> dict[str, str]:
     if jwt_token is None:
@@ -250,7 +252,7 @@ def delete_own_account(
         raise HTTPException(status_code=401, detail="Not authenticated")
     user_id = payload["sub"]
     try:
-        delete_user_and_data(user_id)
+        await delete_user_and_data(user_id)
         response.delete_cookie(key="jwt_token", path="/")
         return {"message": "Account deleted"}
     except Exception as e:
@@ -258,7 +260,7 @@ def delete_own_account(
 
 
 @router.post("/auth/cleanup-users")
-def cleanup_deleted_users(
+async def cleanup_deleted_users(
     days_old: int = Query(30, description="Delete users older than N days"),
     jwt_token: Optional[str] = Cookie(None),
 ) -> dict[str, Any]:
@@ -275,12 +277,12 @@ def cleanup_deleted_users(
 
     from services.user import cleanup_deleted_users as cleanup_users
 
-    deleted_count, message = cleanup_users(days_old)
+    deleted_count, message = await cleanup_users(days_old)
     return {"message": message, "deleted_count": deleted_count, "days_old": days_old}
 
 
 @router.get("/auth/validate-deletion")
-def validate_account_deletion(
+async def validate_account_deletion(
     jwt_token: Optional[str] = Cookie(None),
 ) -> dict[str, Any]:
     """Validate what will happen when user deletes their account"""
@@ -293,7 +295,7 @@ def validate_account_deletion(
 
     from services.user import validate_user_deletion_logic
 
-    is_valid, message = validate_user_deletion_logic(user_id)
+    is_valid, message = await validate_user_deletion_logic(user_id)
 
     return {"valid": is_valid, "message": message, "user_id": user_id}
 
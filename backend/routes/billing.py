@@ -8,6 +8,7 @@ from config import (
 )
 import stripe
 from services.org import OrgService
+from services.db import execute, run_sync
 from utils.jwt import verify_jwt_token
 from typing import Any, Dict
 import os
@@ -52,42 +53,37 @@ def require_org_member(
 
 async def get_org_by_id(org_id: str) -> dict[str, Any]:
     # Fetch org from Supabase by org_id
-    result, error = org_service.get_org_info(org_id)
+    result, error = await org_service.get_org_info(org_id)
     if error or not result:
         raise HTTPException(status_code=404, detail=error or "Org not found")
     # Fetch billing fields and filter out deleted orgs
-    org_data = (
+    org_data = await execute(
         org_service.supabase.table("organizations")
         .select("*", count="exact")
         .eq("id", org_id)
         .eq("deleted", False)
         .single()
-        .execute()
     )
     if not org_data.data:
         raise HTTPException(status_code=404, detail="Org not found")
     org: Dict[str, Any] = org_data.data
     # Add monitor count for enforcement (only non-deleted monitors)
     monitor_count = (
-        org_service.supabase.table("monitors")
-        .select("id", count="exact")
-        .eq("org_id", org_id)
-        .eq("deleted", False)
-        .execute()
-        .count
-        or 0
-    )
+        await execute(
+            org_service.supabase.table("monitors")
+            .select("id", count="exact")
+            .eq("org_id", org_id)
+            .eq("deleted", False)
+        )
+    ).count or 0
     org["monitor_count"] = monitor_count
     return org
 
 
 async def update_org_billing(org_id: str, **fields: Any) -> Any:
     # Update org billing fields in Supabase
-    update = (
-        org_service.supabase.table("organizations")
-        .update(fields)
-        .eq("id", org_id)
-        .execute()
+    update = await execute(
+        org_service.supabase.table("organizations").update(fields).eq("id", org_id)
     )
     if update.error:
         raise HTTPException(
@@ -123,12 +119,15 @@ async def upgrade_subscription(
     # If org has a subscription, update it
     if org.get("stripe_subscription_id"):
         try:
-            subscription = stripe.Subscription.retrieve(org["stripe_subscription_id"])
+            subscription = await run_sync(
+                stripe.Subscription.retrieve, org["stripe_subscription_id"]
+            )
             # Update the subscription to the new price
             price_id = STRIPE_PRICE_IDS[plan]
             if price_id is None:
                 raise HTTPException(400, "Invalid Stripe price ID for plan")
-            stripe.Subscription.modify(
+            await run_sync(
+                stripe.Subscription.modify,
                 subscription.id,
                 cancel_at_period_end=False,
                 proration_behavior="create_prorations",
@@ -148,15 +147,18 @@ async def upgrade_subscription(
         try:
             customer_id = org.get("stripe_customer_id")
             if not customer_id:
-                customer = stripe.Customer.create(
-                    email=payload["email"], metadata={"org_id": org_id}
+                customer = await run_sync(
+                    stripe.Customer.create,
+                    email=payload["email"],
+                    metadata={"org_id": org_id},
                 )
                 customer_id = customer.id
                 await update_org_billing(org_id, stripe_customer_id=customer_id)
             price_id = STRIPE_PRICE_IDS[plan]
             if price_id is None:
                 raise HTTPException(400, "Invalid Stripe price ID for plan")
-            subscription = stripe.Subscription.create(
+            subscription = await run_sync(
+                stripe.Subscription.create,
                 customer=customer_id,
                 items=[{"price": price_id}],
                 trial_period_days=0,
@@ -189,18 +191,19 @@ async def create_checkout_session(
         )
     # Create Stripe customer if needed
     if not org.get("stripe_customer_id"):
-        customer = stripe.Customer.create(
-            email=payload["email"], metadata={"org_id": org_id}
+        customer = await run_sync(
+            stripe.Customer.create, email=payload["email"], metadata={"org_id": org_id}
         )
         await update_org_billing(org_id, stripe_customer_id=customer.id)
     else:
-        customer = stripe.Customer.retrieve(org["stripe_customer_id"])
+        customer = await run_sync(stripe.Customer.retrieve, org["stripe_customer_id"])
 
     # Create checkout session
     price_id = STRIPE_PRICE_IDS[plan]
     if price_id is None:
         raise HTTPException(400, "Invalid Stripe price ID for plan")
-    session = stripe.checkout.Session.create(
+    session = await run_sync(
+        stripe.checkout.Session.create,
         customer=customer.id,
         payment_method_types=["card"],
         line_items=[{"price": price_id, "quantity": 1}],
@@ -227,7 +230,8 @@ async def create_portal_session(
         logger.error(f"(billing/create): No Stripe customer for org {org_id}")
         raise HTTPException(400, "No Stripe customer for org")
     try:
-        session = stripe.billing_portal.Session.create(
+        session = await run_sync(
+            stripe.billing_portal.Session.create,
             customer=org["stripe_customer_id"],
             return_url=f"{FRONTEND_URL}/billing?billing=portal_return",
         )
@@ -264,19 +268,20 @@ async def stripe_webhook(request: Request) -> dict[str, str]:
         session = event["data"]["object"]
         customer_id = session["customer"]
         print(f"Customer ID: {customer_id}")
-        orgs = (
+        orgs = await execute(
             org_service.supabase.table("organizations")
             .select("id")
             .eq("stripe_customer_id", customer_id)
             .eq("deleted", False)
-            .execute()
         )
         if orgs.data and len(orgs.data) > 0:
             org_id = orgs.data[0]["id"]
             print(f"Found org ID: {org_id}")
             subscription_id = session.get("subscription")
             if subscription_id:
-                subscription = stripe.Subscription.retrieve(subscription_id)
+                subscription = await run_sync(
+                    stripe.Subscription.retrieve, subscription_id
+                )
                 price_id = subscription["items"]["data"][0]["price"]["id"]
                 plan = next(
                     (k for k, v in STRIPE_PRICE_IDS.items() if v == price_id), "free"
@@ -295,12 +300,11 @@ async def stripe_webhook(request: Request) -> dict[str, str]:
         subscription = event["data"]["object"]
         customer_id = subscription["customer"]
         print(f"Customer ID: {customer_id}")
-        orgs = (
+        orgs = await execute(
             org_service.supabase.table("organizations")
             .select("id")
             .eq("stripe_customer_id", customer_id)
             .eq("deleted", False)
-            .execute()
         )
         if orgs.data and len(orgs.data) > 0:
             org_id = orgs.data[0]["id"]
@@ -323,12 +327,11 @@ async def stripe_webhook(request: Request) -> dict[str, str]:
         subscription = event["data"]["object"]
         customer_id = subscription["customer"]
         print(f"Customer ID: {customer_id}")
-        orgs = (
+        orgs = await execute(
             org_service.supabase.table("organizations")
             .select("id")
             .eq("stripe_customer_id", customer_id)
             .eq("deleted", False)
-            .execute()
         )
         if orgs.data and len(orgs.data) > 0:
             org_id = orgs.data[0]["id"]
@@ -368,8 +371,10 @@ async def refresh_billing_status(
 
     try:
         # Get customer's active subscriptions
-        customer = stripe.Customer.retrieve(org["stripe_customer_id"])
-        subscriptions = stripe.Subscription.list(customer=customer.id, status="active")
+        customer = await run_sync(stripe.Customer.retrieve, org["stripe_customer_id"])
+        subscriptions = await run_sync(
+            stripe.Subscription.list, customer=customer.id, status="active"
+        )
 
         if subscriptions.data:
             # Get the first active subscription
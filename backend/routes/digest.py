@@ -1,26 +1,303 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from models.schemas import DigestRequest, DigestResponse
-from services.github import GitHubService
+from services.github import (
+    GitHubService,
+    RepositoryNotFoundError,
+    format_timestamp,
+)
 from services.gpt import GPTService
 from delivery.slack import SlackService
 from delivery.discord import DiscordService
 from delivery.email import EmailService
-from config import limiter
+from config import (
+    limiter,
+    DIGEST_COALESCE_TTL_SECONDS,
+    DIGEST_DEADLINE_SECONDS,
+    DIGEST_MAX_LOOKBACK_DAYS,
+    DIGEST_WINDOW_ALIGN_SECONDS,
+)
+from models.monitor import Monitor
+from services.db import get_async_supabase
 from services.digest import DigestService
 from services.monitor import MonitorService
-from datetime import datetime
+from supabase import AsyncClient
+from services.singleflight import SingleFlight
+from services.resilience import deadline
+from services.github_ratelimit import token_fingerprint
+from services.github_app import get_github_app
+from datetime import datetime, timedelta, timezone
 import logging
 import uuid
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Look-back of a monitor's first digest, before it has a cursor
+FREQUENCY_WINDOWS: Dict[str, timedelta] = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(days=7),
+    "on_merge": timedelta(days=1),
+}
+
+# Monitors watching the same repo share one GitHub fetch and GPT summary
+digest_flight: SingleFlight[Tuple[Dict[str, Any], str]] = SingleFlight(
+    ttl=DIGEST_COALESCE_TTL_SECONDS
+)
+
+
+def digest_window(
+    monitor: Optional[Monitor] = None,
+    now: Optional[datetime] = None,
+    aligned: bool = True,
+) -> Tuple[datetime, datetime]:
+    """
+    Return the ``(since, until)`` window the next digest should cover.
+
+    ``until`` is now, rounded down to DIGEST_WINDOW_ALIGN_SECONDS (whole
+    seconds if not ``aligned``) so monitors run together agree on it.
+    ``since`` is the monitor's cursor, or one frequency period back for new
+    monitors, capped at DIGEST_MAX_LOOKBACK_DAYS.
+    """
+    now = now or datetime.now(timezone.utc)
+    align = max(DIGEST_WINDOW_ALIGN_SECONDS, 1) if aligned else 1
+    until = datetime.fromtimestamp(
+        int(now.timestamp()) // align * align, tz=timezone.utc
+    )
+    cursor = monitor.last_digest_until if monitor else None
+    if cursor is not None:
+        since = cursor if cursor.tzinfo else cursor.replace(tzinfo=timezone.utc)
+    else:
+        frequency = monitor.frequency if monitor else "daily"
+        since = until - FREQUENCY_WINDOWS.get(frequency, timedelta(days=1))
+    since = max(since, until - timedelta(days=DIGEST_MAX_LOOKBACK_DAYS))
+    return min(since, until), until
+
+
+async def fetch_and_summarize(
+    github_service: GitHubService,
+    gpt_service: GPTService,
+    repo: str,
+    github_token: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    last_commit_sha: Optional[str] = None,
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Fetch repository activity and summarize it, coalesced per
+    (repo, window, token visibility). Public fetches are shared by every
+    monitor on the same window; private ones only by callers using the same
+    token. The shared fetch ignores ``last_commit_sha``: each caller's commits
+    are trimmed afterwards, and only a trimmed result needs its own summary.
+    """
+    if since is None or until is None:
+        since, until = digest_window()
+    visibility = token_fingerprint(github_token) if github_token else "public"
+    key = (
+        repo.strip().lower(),
+        format_timestamp(since),
+        format_timestamp(until),
+        visibility,
+    )
+
+    async def summarize(repo_data: Dict[str, Any]) -> str:
+        logger.info("Generating GPT summary")
+        return await gpt_service.generate_digest_summary(
+            summary_counts=repo_data["summary_counts"],
+            grouped_commits=repo_data["grouped_commits"],
+            repo_name=repo_data["repository"]["full_name"],
+            since=since,
+            until=until,
+        )
+
+    async def run() -> Tuple[Dict[str, Any], str]:
+        logger.info(
+            f"Fetching data for repository: {repo} "
+            f"({format_timestamp(since)}..{format_timestamp(until)})"
+        )
+        repo_data = await github_service.fetch_repository_data(
+            repo, github_token=github_token, since=since, until=until
+        )
+        return repo_data, await summarize(repo_data)
+
+    repo_data, summary = await digest_flight.do(key, run)
+    trimmed = github_service.since_commit(repo_data, last_commit_sha)
+    if trimmed is repo_data:
+        return repo_data, summary
+
+    async def run_trimmed() -> Tuple[Dict[str, Any], str]:
+        return trimmed, await summarize(trimmed)
+
+    # This caller already reported part of the window
+    return await digest_flight.do(key + (last_commit_sha,), run_trimmed)
+
+
+async def run_monitor_digest(
+    monitor: Monitor,
+    delivery_method: str,
+    webhook_url: Optional[str],
+    email: Optional[str] = None,
+    monitor_service: Optional[MonitorService] = None,
+    now: Optional[datetime] = None,
+) -> DigestResponse:
+    """
+    Generate, deliver and log one digest for ``monitor``.
+
+    Shared by the scheduled ``/digest`` endpoint and the GitHub webhook.
+    ``now`` pins the end of the window (e.g. to when a merge was received);
+    otherwise it is the current, aligned time.
+    """
+    method = getattr(delivery_method, "value", str(delivery_method))
+    monitor_service = monitor_service or MonitorService()
+
+    # Initialize services
+    github_service: GitHubService = GitHubService()
+    gpt_service: GPTService = GPTService()
+    digest_service: DigestService = DigestService(monitor_service.client)
+
+    # For private repos, prefer the GitHub App installation token and fall
+    # back to the org user's OAuth token
+    github_token = None
+    if getattr(monitor, "is_private", False):
+        github_app = get_github_app()
+        if github_app is not None:
+            try:
+                github_token = await github_app.token_for_repo(monitor.repo)
+            except Exception as e:
+                logger.warning(f"GitHub App token unavailable for {monitor.repo}: {e}")
+        if github_token:
+            logger.info(f"Using GitHub App installation token for: {monitor.repo}")
+        else:
+            from services.user import get_user_github_token
+
+            github_token = await get_user_github_token(monitor.created_by)
+            if github_token:
+                logger.info(f"Using org user's GitHub token for: {monitor.repo}")
+        if not github_token:
+            logger.error(f"No GitHub token found for private repo: {monitor.repo}")
+            raise HTTPException(
+                status_code=403, detail="No GitHub token found for private repo."
+            )
+        github_service = GitHubService(github_token=github_token)
+    else:
+        github_token = None  # Use default token in GitHubService
+
+    # Only fetch what is new since the monitor's last delivered digest
+    since, until = digest_window(monitor, now=now, aligned=now is None)
+
+    # Fetch repository data and generate summary (shared across monitors)
+    repo_data, summary = await fetch_and_summarize(
+        github_service,
+        gpt_service,
+        monitor.repo,
+        github_token=github_token,
+        since=since,
+        until=until,
+        last_commit_sha=monitor.last_commit_sha,
+    )
+
+    # Deliver via specified method
+    delivery_status = "pending"
+    error_message = None
+    success = False
+    if method == "slack":
+        slack_service = SlackService()
+        if webhook_url is None:
+            raise HTTPException(status_code=400, detail="Slack webhook URL required")
+        success = await slack_service.send_digest(
+            summary=summary,
+            repo_name=repo_data["repository"]["full_name"],
+            repo_url=f"https://github.com/{monitor.repo}",
+            webhook_url=str(webhook_url),
+        )
+        delivery_status = "success" if success else "failure"
+        if not success:
+            error_message = "Failed to deliver to Slack"
+    elif method == "discord":
+        discord_service = DiscordService()
+        if webhook_url is None:
+            raise HTTPException(status_code=400, detail="Discord webhook URL required")
+        success = await discord_service.send_digest(
+            summary=summary,
+            repo_name=repo_data["repository"]["full_name"],
+            repo_url=monitor.repo,
+            webhook_url=str(webhook_url),
+        )
+        delivery_status = "success" if success else "failure"
+        if not success:
+            error_message = "Failed to deliver to Discord"
+    elif method == "email":
+        if not email:
+            raise HTTPException(
+                status_code=400, detail="Email address required for email delivery"
+            )
+        email_service = EmailService()
+        success = await email_service.send_digest(
+            summary=summary,
+            repo_name=repo_data["repository"]["full_name"],
+            repo_url=monitor.repo,
+            email=email,
+        )
+        delivery_status = "success" if success else "failure"
+        if not success:
+            error_message = "Failed to deliver to Email"
+
+    # Defensive: ensure monitor_id is a valid UUID for logging digests
+    monitor_id_str = (
+        str(monitor.id) if monitor and getattr(monitor, "id", None) else None
+    )
+    try:
+        if monitor_id_str:
+            uuid.UUID(monitor_id_str)
+        else:
+            monitor_id_str = None
+    except Exception:
+        logger.error(f"Invalid monitor_id for digest log: {monitor_id_str}")
+        monitor_id_str = None
+
+    metrics = extract_metrics(repo_data["summary_counts"], repo_data["grouped_commits"])
+    # Log the digest only if monitor_id is valid
+    if monitor_id_str:
+        await digest_service.log_digest(
+            monitor_id=monitor_id_str,
+            summary=summary,
+            status=delivery_status,
+            delivered_at=datetime.utcnow().isoformat(),
+            delivery_method=method,
+            error_message=error_message or "",
+            created_by=monitor.created_by if monitor else "",
+            # Kept compressed when DIGEST_STORE_RAW_PAYLOAD is enabled
+            raw_payload=repo_data,
+            metrics_json=metrics,
+        )
+    else:
+        logger.error(f"Skipping digest log due to invalid monitor_id: {monitor_id_str}")
+
+    # Advance the cursor only once delivered and logged (log_digest raises if
+    # the row could not be queued or written); failed runs retry the window
+    if success and monitor_id_str:
+        await monitor_service.advance_digest_cursor(
+            monitor_id_str, until, repo_data.get("head_sha")
+        )
+
+    return DigestResponse(
+        success=True,
+        message=f"Digest generated and delivered via {method}",
+        summary=summary,
+        repo_name=repo_data["repository"]["full_name"],
+        delivery_status=delivery_status,
+        metrics_json=metrics,
+    )
+
 
 @router.post("/digest", response_model=DigestResponse)
 @limiter.limit("50/minute")
-async def create_digest(request: Request, body: DigestRequest) -> DigestResponse:
+async def create_digest(
+    request: Request,
+    body: DigestRequest,
+    client: AsyncClient = Depends(get_async_supabase),
+) -> DigestResponse:
     """
     Generate and deliver a digest of recent repository activity.
     """
@@ -37,11 +314,7 @@ async def create_digest(request: Request, body: DigestRequest) -> DigestResponse
                 status_code=400, detail="repo must be in the format 'owner/repo'"
             )
 
-        # Initialize services
-        github_service: GitHubService = GitHubService()
-        gpt_service: GPTService = GPTService()
-        digest_service: DigestService = DigestService()
-        monitor_service: MonitorService = MonitorService()
+        monitor_service: MonitorService = MonitorService(client)
 
         # Fetch monitor to get org_id and user token for private repos
         logger.info(
@@ -59,133 +332,17 @@ async def create_digest(request: Request, body: DigestRequest) -> DigestResponse
                 detail="No active monitor found for this repo and webhook.",
             )
 
-        # For private repos, use org user's GitHub token
-        github_token = None
-        if getattr(monitor, "is_private", False):
-            from services.user import get_user_github_token
-
-            github_token = await get_user_github_token(monitor.created_by)
-            if not github_token:
-                logger.error(f"No GitHub token found for private repo: {body.repo}")
-                raise HTTPException(
-                    status_code=403, detail="No GitHub token found for private repo."
-                )
-            logger.info(f"Using org user's GitHub token for private repo: {body.repo}")
-            github_service = GitHubService(github_token=github_token)
-        else:
-            github_token = None  # Use default token in GitHubService
-
-        # Fetch repository data
-        logger.info(f"Fetching data for repository: {body.repo}")
-        repo_data = await github_service.fetch_repository_data(
-            str(body.repo), github_token=github_token
-        )
-
-        # Generate summary
-        logger.info("Generating GPT summary")
-        summary = await gpt_service.generate_digest_summary(
-            summary_counts=repo_data["summary_counts"],
-            grouped_commits=repo_data["grouped_commits"],
-            repo_name=repo_data["repository"]["full_name"],
-        )
-
-        # Deliver via specified method
-        delivery_status = "pending"
-        error_message = None
-        success = False
-        if body.delivery_method == "slack":
-            slack_service = SlackService()
-            if body.webhook_url is None:
-                raise HTTPException(
-                    status_code=400, detail="Slack webhook URL required"
-                )
-            success = await slack_service.send_digest(
-                summary=summary,
-                repo_name=repo_data["repository"]["full_name"],
-                repo_url=f"https://github.com/{body.repo}",
-                webhook_url=str(body.webhook_url),
-            )
-            delivery_status = "success" if success else "failure"
-            if not success:
-                error_message = "Failed to deliver to Slack"
-        elif body.delivery_method == "discord":
-            discord_service = DiscordService()
-            if body.webhook_url is None:
-                raise HTTPException(
-                    status_code=400, detail="Discord webhook URL required"
-                )
-            success = await discord_service.send_digest(
-                summary=summary,
-                repo_name=repo_data["repository"]["full_name"],
-                repo_url=str(body.repo),
-                webhook_url=str(body.webhook_url),
-            )
-            delivery_status = "success" if success else "failure"
-            if not success:
-                error_message = "Failed to deliver to Discord"
-        elif body.delivery_method == "email":
-            if not body.email:
-                raise HTTPException(
-                    status_code=400, detail="Email address required for email delivery"
-                )
-            email_service = EmailService()
-            success = await email_service.send_digest(
-                summary=summary,
-                repo_name=repo_data["repository"]["full_name"],
-                repo_url=str(body.repo),
+        with deadline(DIGEST_DEADLINE_SECONDS):
+            return await run_monitor_digest(
+                monitor,
+                delivery_method=body.delivery_method,
+                webhook_url=str(body.webhook_url) if body.webhook_url else None,
                 email=body.email,
-            )
-            delivery_status = "success" if success else "failure"
-            if not success:
-                error_message = "Failed to deliver to Email"
-
-        # Defensive: ensure monitor_id is a valid UUID for logging digests
-        monitor_id_str = (
-            str(monitor.id) if monitor and getattr(monitor, "id", None) else None
-        )
-        try:
-            if monitor_id_str:
-                uuid.UUID(monitor_id_str)
-            else:
-                monitor_id_str = None
-        except Exception:
-            logger.error(f"Invalid monitor_id for digest log: {monitor_id_str}")
-            monitor_id_str = None
-
-        metrics = extract_metrics(
-            repo_data["summary_counts"], repo_data["grouped_commits"]
-        )
-        # Log the digest only if monitor_id is valid
-        if monitor_id_str:
-            digest_service.log_digest(
-                monitor_id=monitor_id_str,
-                summary=summary,
-                status=delivery_status,
-                delivered_at=datetime.utcnow().isoformat(),
-                delivery_method=(
-                    body.delivery_method.value
-                    if hasattr(body.delivery_method, "value")
-                    else str(body.delivery_method)
-                ),
-                error_message=error_message or "",
-                created_by=monitor.created_by if monitor else "",
-                raw_payload=None,  # Optionally log raw data
-                metrics_json=metrics,
-            )
-        else:
-            logger.error(
-                f"Skipping digest log due to invalid monitor_id: {monitor_id_str}"
+                monitor_service=monitor_service,
             )
 
-        return DigestResponse(
-            success=True,
-            message=f"Digest generated and delivered via {body.delivery_method.value}",
-            summary=summary,
-            repo_name=repo_data["repository"]["full_name"],
-            delivery_status=delivery_status,
-            metrics_json=metrics,
-        )
-
+    except RepositoryNotFoundError:
+        raise HTTPException(status_code=404, detail="Repository not found")
     except Exception as e:
         # Improved error logging
         logger.error(f"Error creating digest: {str(e)}", exc_info=True)
@@ -238,17 +395,12 @@ async def try_digest(request: Request, body: DigestRequest) -> DigestResponse:
         github_service: GitHubService = GitHubService()
         gpt_service: GPTService = GPTService()
 
-        # Fetch repository data
+        # Fetch repository data and generate summary
         logger.info(f"[DEMO] Fetching data for repository: {body.repo}")
-        repo_data = await github_service.fetch_repository_data(str(body.repo))
-
-        # Generate summary
-        logger.info("[DEMO] Generating GPT summary")
-        summary = await gpt_service.generate_digest_summary(
-            summary_counts=repo_data["summary_counts"],
-            grouped_commits=repo_data["grouped_commits"],
-            repo_name=repo_data["repository"]["full_name"],
-        )
+        with deadline(DIGEST_DEADLINE_SECONDS):
+            repo_data, summary = await fetch_and_summarize(
+                github_service, gpt_service, str(body.repo)
+            )
 
         # Add demo indicator to summary
         demo_summary = f"🎯 **DEMO DIGEST** - This is a one-time demo digest from Infrasync\n\n{summary}"
@@ -281,6 +433,9 @@ async def try_digest(request: Request, body: DigestRequest) -> DigestResponse:
             delivery_status=delivery_status,
         )
 
+    except RepositoryNotFoundError:
+        # Demo fetches use the shared public pool: private repos are never served
+        raise HTTPException(status_code=404, detail="Repository not found")
     except Exception as e:
         logger.error(f"[DEMO] Error creating demo digest: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
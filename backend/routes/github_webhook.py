@@ -0,0 +1,156 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from config import (
+    DIGEST_DEADLINE_SECONDS,
+    FEATURE_FLAGS,
+    GITHUB_WEBHOOK_DEBOUNCE_SECONDS,
+    GITHUB_WEBHOOK_SECRET,
+)
+from routes.digest import run_monitor_digest
+from services.db import get_async_supabase, run_sync
+from services.github_events import (
+    SUPPORTED_EVENTS,
+    GitHubEvent,
+    event_from_payload,
+    get_event_store,
+    is_merge_event,
+    verify_signature,
+)
+from services.monitor import MonitorService
+from services.resilience import deadline
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Set
+import asyncio
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/github", tags=["github"])
+
+# Monitors with an on_merge digest already queued; later merges fold into it
+_pending_monitors: Set[str] = set()
+
+
+async def _send_digest(monitor_id: str, monitor_service: MonitorService) -> None:
+    try:
+        # Reload so the window starts at the latest cursor
+        current = await monitor_service.get_monitor(monitor_id)
+        if not current:
+            logger.info(f"(github_webhook): Monitor {monitor_id} no longer active")
+            return
+        cursor = current.last_digest_until
+        if cursor is not None:
+            if cursor.tzinfo is None:
+                cursor = cursor.replace(tzinfo=timezone.utc)
+            # A digest sent since (scheduled or manual) may already cover them
+            if not await run_sync(_merges_since, current.repo, cursor.timestamp()):
+                logger.info(
+                    f"(github_webhook): No merges into {current.repo} since "
+                    f"monitor {monitor_id}'s last digest, skipping"
+                )
+                return
+        with deadline(DIGEST_DEADLINE_SECONDS):
+            await run_monitor_digest(
+                current,
+                delivery_method=current.delivery_method,
+                webhook_url=str(current.webhook_url) if current.webhook_url else None,
+                email=current.email,
+                monitor_service=monitor_service,
+                now=datetime.now(timezone.utc).replace(microsecond=0),
+            )
+    except Exception as e:
+        logger.error(
+            f"(github_webhook): on_merge digest failed for monitor {monitor_id}: {e}"
+        )
+
+
+async def _debounced_digests(monitor_ids: List[str]) -> None:
+    """Wait out the debounce window once, then send one digest per monitor."""
+    try:
+        await asyncio.sleep(GITHUB_WEBHOOK_DEBOUNCE_SECONDS)
+    finally:
+        _pending_monitors.difference_update(monitor_ids)
+    monitor_service = MonitorService(await get_async_supabase())
+    await asyncio.gather(
+        *(_send_digest(monitor_id, monitor_service) for monitor_id in monitor_ids)
+    )
+
+
+def _append_event(event: GitHubEvent) -> bool:
+    return get_event_store().append(event)
+
+
+def _merges_since(repo: str, since: float) -> List[GitHubEvent]:
+    return [
+        event
+        for event in get_event_store().events_since(repo, since)
+        if is_merge_event(event.event_type, event.payload)
+    ]
+
+
+@router.post("/webhook")
+async def github_webhook(
+    request: Request, background_tasks: BackgroundTasks
+) -> Dict[str, Any]:
+    """
+    Receive signed GitHub push/pull_request events.
+
+    Events are appended to the local event store; merges into the default
+    branch trigger digests for the on_merge monitors watching that repo.
+    """
+    if not GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="GitHub webhook not configured")
+
+    body = await request.body()
+    if not verify_signature(
+        GITHUB_WEBHOOK_SECRET, body, request.headers.get("X-Hub-Signature-256")
+    ):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    event_type = request.headers.get("X-GitHub-Event", "")
+    if event_type == "ping":
+        return {"status": "pong"}
+    if event_type not in SUPPORTED_EVENTS:
+        return {"status": "ignored", "event": event_type}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    delivery_id = (
+        request.headers.get("X-GitHub-Delivery") or hashlib.sha256(body).hexdigest()
+    )
+    event = event_from_payload(delivery_id, event_type, payload)
+    if not event.repo:
+        raise HTTPException(status_code=400, detail="Missing repository")
+
+    # Redeliveries are acknowledged but never trigger a second digest
+    if not await run_sync(_append_event, event):
+        return {"status": "duplicate"}
+
+    if not is_merge_event(event_type, payload):
+        return {"status": "stored"}
+    if not FEATURE_FLAGS["enable_on_merge_digests"]:
+        logger.info(f"(github_webhook): on_merge digests disabled, {event.repo}")
+        return {"status": "stored"}
+
+    monitors = await MonitorService().list_by_repo(event.repo, frequency="on_merge")
+    monitor_ids = [
+        str(monitor.id)
+        for monitor in monitors
+        if str(monitor.id) not in _pending_monitors
+    ]
+    scheduled = len(monitor_ids)
+    if monitor_ids:
+        _pending_monitors.update(monitor_ids)
+        # One task for the whole merge: background tasks run one after
+        # another, so a task per monitor would repeat the debounce for each
+        background_tasks.add_task(_debounced_digests, monitor_ids)
+
+    logger.info(
+        f"(github_webhook): {event_type} on {event.repo}, "
+        f"scheduled {scheduled}/{len(monitors)} on_merge digests"
+    )
+    return {"status": "accepted", "scheduled": scheduled}
@@ -1,23 +1,22 @@
-from fastapi import APIRouter, HTTPException, status, Request, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Request, Response, Depends, Query
 from models.monitor import Monitor, MonitorCreate
 from services.monitor import MonitorService
-from config import limiter, SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL
+from config import limiter
 import logging
 from utils.jwt import verify_jwt_token
 from fastapi import Cookie
 from services.user import get_user_github_token
 from services.audit import AuditLogService
-from supabase import create_client
-from services.digest import DigestService
+from services.digest import DigestService, MonitorNotFoundError
 from services.org import OrgService
-from typing import Any
-from typing import List
-from typing import cast, Dict
+from services.db import execute, get_async_supabase
+from services.dashboard_cache import cached_json
+from supabase import AsyncClient
+from typing import Any, Optional
 
 router: APIRouter = APIRouter()
 service: MonitorService = MonitorService()
 audit_service: AuditLogService = AuditLogService()
-digest_service: DigestService = DigestService()
 org_service: OrgService = OrgService()
 
 logger = logging.getLogger(__name__)
@@ -31,6 +30,13 @@ async def get_org_context(jwt_token: str = Cookie(None)) -> dict[str, Any]:
     return {"org_id": payload["org_id"], "role": payload.get("role")}
 
 
+# Dependency for the digest history and metrics routes
+def get_digest_service(
+    client: AsyncClient = Depends(get_async_supabase),
+) -> DigestService:
+    return DigestService(client)
+
+
 @router.get("/monitor")
 @limiter.limit("100/minute")
 async def list_monitors(
@@ -63,30 +69,28 @@ async def create_monitor(
     if not user_id:
         raise HTTPException(status_code=401, detail="User not authenticated")
     # Fetch org and monitor count for plan enforcement
-    org_obj = (
+    org_obj = await execute(
         org_service.supabase.table("organizations")
         .select("*")
         .eq("id", org["org_id"])
         .single()
-        .execute()
     )
     if not org_obj.data:
         raise HTTPException(status_code=404, detail="Org not found")
     monitor_count = (
-        org_service.supabase.table("monitors")
-        .select("id", count="exact")
-        .eq("org_id", org["org_id"])
-        .eq("deleted", False)
-        .execute()
-        .count
-        or 0
-    )
+        await execute(
+            org_service.supabase.table("monitors")
+            .select("id", count="exact")
+            .eq("org_id", org["org_id"])
+            .eq("deleted", False)
+        )
+    ).count or 0
     org_service.enforce_plan_limits(org_obj.data, "repo", monitor_count)
     # Enforce unique Slack webhook per org (and globally for free plan)
     if config.delivery_method == "slack" and config.webhook_url:
         # Allow multiple monitors in the same org to use the same webhook
         # Block if another org (not deleted) is using this webhook
-        if org_service.is_webhook_used_by_other_org(
+        if await org_service.is_webhook_used_by_other_org(
             str(config.webhook_url), org["org_id"]
         ):
             raise HTTPException(
@@ -102,7 +106,7 @@ async def create_monitor(
             config, created_by=user_id, github_token=github_token
         )
         # Audit log
-        audit_service.log_action(
+        await audit_service.log_action(
             org_id=org["org_id"],
             actor_id=user_id,
             action="monitor_created",
@@ -138,7 +142,7 @@ async def delete_monitor(
     repo_value = (
         monitor["repo"] if isinstance(monitor, dict) and "repo" in monitor else None
     )
-    audit_service.log_action(
+    await audit_service.log_action(
         org_id=org["org_id"],
         actor_id=str(user_id) if user_id is not None else "",
         action="monitor_deleted",
@@ -174,108 +178,84 @@ async def update_monitor_frequency(
 async def get_monitor_digests(
     monitor_id: str,
     org: dict[str, Any] = Depends(get_org_context),
-    limit: int = Query(5, le=20),
+    digest_service: DigestService = Depends(get_digest_service),
+    limit: int = Query(5, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
 ) -> dict[str, Any]:
-    if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-        raise HTTPException(status_code=500, detail="Supabase config missing")
-    client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-    # Only allow access to monitors in this org
-    monitor_result = (
-        client.table("monitors")
-        .select("id, org_id")
-        .eq("id", monitor_id)
-        .maybe_single()
-        .execute()
-    )
-    if (
-        not monitor_result
-        or not monitor_result.data
-        or not isinstance(monitor_result.data, dict)
-        or "org_id" not in monitor_result.data
-        or str(monitor_result.data["org_id"]) != str(org["org_id"])
-    ):
+    # Only monitors in this org; checked in the same query as the digests
+    try:
+        digests, next_cursor = await digest_service.page_monitor_digests(
+            monitor_id,
+            limit,
+            org_id=str(org["org_id"]),
+            cursor=cursor,
+            fields=fields,
+        )
+    except MonitorNotFoundError:
         raise HTTPException(status_code=404, detail="Monitor not found")
-    digests: List = digest_service.get_monitor_digests(monitor_id, limit)  # type: ignore
-    return {"digests": digests}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"digests": digests, "next_cursor": next_cursor}
 
 
 @router.get("/monitor/{monitor_id}/metrics")
 async def get_monitor_metrics(
+    request: Request,
     monitor_id: str,
     org: dict[str, Any] = Depends(get_org_context),
+    digest_service: DigestService = Depends(get_digest_service),
     period_days: int = Query(7, ge=1, le=90),
     compare_to_previous: bool = Query(False),
-) -> dict[str, Any]:
-    if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-        raise HTTPException(status_code=500, detail="Supabase config missing")
-    # Only allow access to monitors in this org
-    client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-    monitor_result = (
-        client.table("monitors")
-        .select("id, org_id")
-        .eq("id", monitor_id)
-        .maybe_single()
-        .execute()
-    )
-    if (
-        not monitor_result
-        or not monitor_result.data
-        or not isinstance(monitor_result.data, dict)
-        or "org_id" not in monitor_result.data
-        or str(monitor_result.data["org_id"]) != str(org["org_id"])
-    ):
-        raise HTTPException(status_code=404, detail="Monitor not found")
-    digest_service: DigestService = DigestService()
-    metrics = (
-        digest_service.aggregate_metrics(monitor_id=monitor_id, period_days=period_days)
-        if digest_service is not None
-        else {}
-    )
-    metrics = cast(Dict[str, Any], metrics)
-    if compare_to_previous:
-        previous_metrics = (
-            digest_service.aggregate_metrics(
-                monitor_id=monitor_id, period_days=period_days, offset_days=period_days
+) -> Response:
+    org_id = str(org["org_id"])
+
+    async def compute() -> dict[str, Any]:
+        # Only monitors in this org; checked in the same query as the metrics
+        try:
+            if compare_to_previous:
+                # Both periods in one query over twice the window
+                compared = await digest_service.compare_metrics(
+                    org_id, monitor_id=monitor_id, period_days=period_days
+                )
+                return {**compared, "period_days": period_days}
+            metrics = await digest_service.aggregate_metrics(
+                org_id, monitor_id=monitor_id, period_days=period_days
             )
-            if digest_service is not None
-            else {}
-        )
-        previous_metrics = cast(Dict[str, Any], previous_metrics)
-        return {
-            "metrics": metrics,
-            "previous_metrics": previous_metrics,
-            "period_days": period_days,
-        }
-    return {"metrics": metrics, "period_days": period_days}
+        except MonitorNotFoundError:
+            raise HTTPException(status_code=404, detail="Monitor not found")
+        return {"metrics": metrics, "period_days": period_days}
+
+    key = ("metrics", org_id, monitor_id, period_days, compare_to_previous)
+    return await cached_json(request, key, compute)
 
 
 @router.get("/monitor/{monitor_id}/metrics/timeseries")
 async def get_monitor_metrics_timeseries(
+    request: Request,
     monitor_id: str,
     org: dict[str, Any] = Depends(get_org_context),
+    digest_service: DigestService = Depends(get_digest_service),
     period_days: int = Query(30, ge=1, le=90),
-) -> dict[str, Any]:
-    if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-        raise HTTPException(status_code=500, detail="Supabase config missing")
-    # Only allow access to monitors in this org
-    client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-    monitor_result = (
-        client.table("monitors")
-        .select("id, org_id")
-        .eq("id", monitor_id)
-        .maybe_single()
-        .execute()
-    )
-    if (
-        not monitor_result
-        or not monitor_result.data
-        or not isinstance(monitor_result.data, dict)
-        or "org_id" not in monitor_result.data
-        or str(monitor_result.data["org_id"]) != str(org["org_id"])
-    ):
-        raise HTTPException(status_code=404, detail="Monitor not found")
-    digest_service: DigestService = DigestService()
-    timeseries = digest_service.timeseries_metrics(
-        monitor_id=monitor_id, period_days=period_days
-    )
-    return {"timeseries": timeseries, "period_days": period_days}
+    granularity: Optional[str] = Query(None, pattern="^(hour|day|week)$"),
+) -> Response:
+    org_id = str(org["org_id"])
+
+    async def compute() -> dict[str, Any]:
+        # Only monitors in this org; checked in the same query as the digests
+        try:
+            timeseries = await digest_service.timeseries_metrics(
+                monitor_id=monitor_id,
+                period_days=period_days,
+                org_id=org_id,
+                granularity=granularity,
+            )
+        except MonitorNotFoundError:
+            raise HTTPException(status_code=404, detail="Monitor not found")
+        result: dict[str, Any] = {"timeseries": timeseries, "period_days": period_days}
+        if granularity:
+            result["granularity"] = granularity
+        return result
+
+    key = ("timeseries", org_id, monitor_id, period_days, granularity)
+    return await cached_json(request, key, compute)
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, HTTPException, Cookie, Path, Query
+from fastapi import APIRouter, HTTPException, Cookie, Path, Query, Request, Response
 from pydantic import BaseModel
 from services.org import OrgService
 from utils.jwt import verify_jwt_token, create_jwt_token
 from services.audit import AuditLogService
 from services.digest import DigestService
+from services.dashboard_cache import cached_json
 from typing import Any, Optional
 
 router = APIRouter(prefix="/org")
 org_service = OrgService()
 audit_service = AuditLogService()
+digest_service = DigestService()
 
 
 class CreateOrgRequest(BaseModel):
@@ -40,32 +42,32 @@ class OrgMember(BaseModel):
 
 
 @router.get("")
-def get_org_info(jwt_token: str = Cookie(None)) -> dict[str, Any]:
+async def get_org_info(jwt_token: str = Cookie(None)) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
     if not payload or not payload.get("org_id"):
         raise HTTPException(status_code=401, detail="Invalid or missing org context")
     org_id = payload["org_id"]
     user_id = payload["sub"]
-    result, error = org_service.get_org_info(org_id, user_id)
+    result, error = await org_service.get_org_info(org_id, user_id)
     if error:
         raise HTTPException(status_code=401, detail=error)
     return result
 
 
 @router.get("/members")
-def get_org_members(jwt_token: str = Cookie(None)) -> dict[str, Any]:
+async def get_org_members(jwt_token: str = Cookie(None)) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
     if not payload or not payload.get("org_id"):
         raise HTTPException(status_code=401, detail="Invalid or missing org context")
     org_id = payload["org_id"]
-    result, error = org_service.get_org_members(org_id)
+    result, error = await org_service.get_org_members(org_id)
     if error:
         raise HTTPException(status_code=404, detail=error)
     return {"members": result}
 
 
 @router.post("/invite")
-def invite_member(
+async def invite_member(
     body: InviteMemberRequest, jwt_token: str = Cookie(None)
 ) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
@@ -74,11 +76,11 @@ def invite_member(
     if payload.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Only admins can invite members")
     org_id = payload["org_id"]
-    result, error = org_service.invite_member(org_id, body.email, body.role)
+    result, error = await org_service.invite_member(org_id, body.email, body.role)
     if error:
         raise HTTPException(status_code=400, detail=error)
     # Audit log
-    audit_service.log_action(
+    await audit_service.log_action(
         org_id=org_id,
         actor_id=payload["sub"],
         action="member_invited",
@@ -90,7 +92,7 @@ def invite_member(
 
 
 @router.patch("/members/{user_id}/role")
-def update_member_role(
+async def update_member_role(
     user_id: str = Path(...),
     body: Optional[UpdateMemberRoleRequest] = None,
     jwt_token: str = Cookie(None),
@@ -105,11 +107,11 @@ def update_member_role(
     org_id = payload["org_id"]
     if body is None:
         raise HTTPException(status_code=400, detail="Missing request body")
-    result, error = org_service.update_member_role(org_id, user_id, body.role)
+    result, error = await org_service.update_member_role(org_id, user_id, body.role)
     if error:
         raise HTTPException(status_code=400, detail=error)
     # Audit log
-    audit_service.log_action(
+    await audit_service.log_action(
         org_id=org_id,
         actor_id=payload["sub"],
         action="member_role_changed",
@@ -121,7 +123,7 @@ def update_member_role(
 
 
 @router.delete("/members/{user_id}")
-def remove_member(
+async def remove_member(
     user_id: str = Path(...), jwt_token: str = Cookie(None)
 ) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
@@ -134,11 +136,11 @@ def remove_member(
             status_code=400, detail="Cannot remove yourself from the organization"
         )
     org_id = payload["org_id"]
-    result, error = org_service.remove_member(org_id, user_id)
+    result, error = await org_service.remove_member(org_id, user_id)
     if error:
         raise HTTPException(status_code=400, detail=error)
     # Audit log
-    audit_service.log_action(
+    await audit_service.log_action(
         org_id=org_id,
         actor_id=payload["sub"],
         action="member_removed",
@@ -150,7 +152,9 @@ def remove_member(
 
 
 @router.patch("")
-def update_org(body: UpdateOrgRequest, jwt_token: str = Cookie(None)) -> dict[str, Any]:
+async def update_org(
+    body: UpdateOrgRequest, jwt_token: str = Cookie(None)
+) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
     if not payload or not payload.get("org_id"):
         raise HTTPException(status_code=401, detail="Invalid or missing org context")
@@ -159,20 +163,22 @@ def update_org(body: UpdateOrgRequest, jwt_token: str = Cookie(None)) -> dict[st
             status_code=403, detail="Only admins can update organization"
         )
     org_id = payload["org_id"]
-    result, error = org_service.update_org_name(org_id, body.name)
+    result, error = await org_service.update_org_name(org_id, body.name)
     if error:
         raise HTTPException(status_code=400, detail=error)
     return result
 
 
 @router.post("")
-def create_org(body: CreateOrgRequest, jwt_token: str = Cookie(None)) -> dict[str, Any]:
+async def create_org(
+    body: CreateOrgRequest, jwt_token: str = Cookie(None)
+) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
     if not payload:
         raise HTTPException(status_code=401, detail="Not authenticated")
     user_id = payload["sub"]
     user_email = payload.get("email") or ""
-    result, error = org_service.create_org(body.name, user_id, user_email)
+    result, error = await org_service.create_org(body.name, user_id, user_email)
     if error:
         raise HTTPException(status_code=400, detail=error)
     # Issue new JWT
@@ -189,12 +195,14 @@ def create_org(body: CreateOrgRequest, jwt_token: str = Cookie(None)) -> dict[st
 
 
 @router.post("/join")
-def join_org(body: JoinOrgRequest, jwt_token: str = Cookie(None)) -> dict[str, Any]:
+async def join_org(
+    body: JoinOrgRequest, jwt_token: str = Cookie(None)
+) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
     if not payload:
         raise HTTPException(status_code=401, detail="Not authenticated")
     user_id = payload["sub"]
-    result, error = org_service.join_org(body.invite_code, user_id)
+    result, error = await org_service.join_org(body.invite_code, user_id)
     if error:
         raise HTTPException(status_code=400, detail=error)
     # Issue new JWT
@@ -211,7 +219,7 @@ def join_org(body: JoinOrgRequest, jwt_token: str = Cookie(None)) -> dict[str, A
 
 
 @router.get("/audit-logs")
-def get_audit_logs(
+async def get_audit_logs(
     jwt_token: str = Cookie(None), limit: int = Query(50, le=100)
 ) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
@@ -220,12 +228,12 @@ def get_audit_logs(
     if payload.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view audit logs")
     org_id = payload["org_id"]
-    logs = audit_service.get_org_logs(org_id, limit=limit)  # type: ignore
+    logs = await audit_service.get_org_logs(org_id, limit=limit)  # type: ignore
     return {"logs": [log.dict() for log in logs]}
 
 
 @router.delete("")
-def disband_org(jwt_token: str = Cookie(None)) -> dict[str, Any]:
+async def disband_org(jwt_token: str = Cookie(None)) -> dict[str, Any]:
     payload = verify_jwt_token(jwt_token)
     if not payload or not payload.get("org_id"):
         raise HTTPException(status_code=401, detail="Invalid or missing org context")
@@ -234,14 +242,14 @@ def disband_org(jwt_token: str = Cookie(None)) -> dict[str, Any]:
             status_code=403, detail="Only admins can disband the organization"
         )
     org_id = payload["org_id"]
-    result, error = org_service.disband_org(org_id)
+    result, error = await org_service.disband_org(org_id)
     if error:
         raise HTTPException(status_code=500, detail=error)
     return result
 
 
 @router.post("/cleanup")
-def cleanup_deleted_orgs(
+async def cleanup_deleted_orgs(
     days_old: int = Query(30, description="Delete orgs older than N days"),
     jwt_token: str = Cookie(None),
 ) -> dict[str, Any]:
@@ -252,17 +260,30 @@ def cleanup_deleted_orgs(
     if payload.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Only admins can trigger cleanup")
 
-    deleted_count, message = org_service.cleanup_deleted_orgs(days_old)
+    deleted_count, message = await org_service.cleanup_deleted_orgs(days_old)
     return {"message": message, "deleted_count": deleted_count, "days_old": days_old}
 
 
 @router.get("/metrics")
-def get_org_metrics(
-    jwt_token: str = Cookie(None), period_days: int = Query(7, ge=1, le=90)
-) -> dict[str, Any]:
+async def get_org_metrics(
+    request: Request,
+    jwt_token: str = Cookie(None),
+    period_days: int = Query(7, ge=1, le=90),
+    compare_to_previous: bool = Query(False),
+) -> Response:
     payload = verify_jwt_token(jwt_token)
     if not payload or not payload.get("org_id"):
         raise HTTPException(status_code=401, detail="Invalid or missing org context")
-    org_id = payload["org_id"]
-    metrics = DigestService().aggregate_metrics(org_id=org_id, period_days=period_days)  # type: ignore
-    return {"metrics": metrics, "period_days": period_days}
+    org_id = str(payload["org_id"])
+
+    async def compute() -> dict[str, Any]:
+        if compare_to_previous:
+            compared = await digest_service.compare_metrics(
+                org_id, period_days=period_days
+            )
+            return {**compared, "period_days": period_days}
+        metrics = await digest_service.aggregate_metrics(org_id=org_id, period_days=period_days)  # type: ignore
+        return {"metrics": metrics, "period_days": period_days}
+
+    key = ("metrics", org_id, None, period_days, compare_to_previous)
+    return await cached_json(request, key, compute)
@@ -1,18 +1,16 @@
 from models.audit_log import AuditLog
 from uuid import uuid4
 from datetime import datetime
-from supabase import create_client, Client
-from config import SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL
+from supabase import Client
+from services.db import execute, get_supabase
 from typing import Optional, Dict, Any
 
 
 class AuditLogService:
-    def __init__(self) -> None:
-        if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-            raise ValueError("Supabase environment variables not set")
-        self.client: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    def __init__(self, client: Optional[Client] = None) -> None:
+        self.client: Client = client or get_supabase()
 
-    def log_action(
+    async def log_action(
         self,
         org_id: str,
         actor_id: str,
@@ -32,16 +30,15 @@ class AuditLogService:
             "details": details,
             "created_at": datetime.utcnow().isoformat(),
         }
-        self.client.table("audit_logs").insert(log).execute()
+        await execute(self.client.table("audit_logs").insert(log))
 
-    def get_org_logs(self, org_id: str, limit: int = 50) -> list[AuditLog]:
-        result = (
+    async def get_org_logs(self, org_id: str, limit: int = 50) -> list[AuditLog]:
+        result = await execute(
             self.client.table("audit_logs")
             .select("*")
             .eq("org_id", str(org_id))
             .order("created_at", desc=True)
             .limit(limit)
-            .execute()
         )
         if not result or not result.data:
             return []
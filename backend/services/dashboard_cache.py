@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import Request, Response
+from services.metrics import metrics_service
+
+# (endpoint, org_id, monitor_id or None for org-wide, period_days, variant)
+# where variant is the compare flag or the timeseries granularity
+CacheKey = Tuple[str, str, Optional[str], int, Any]
+
+
+@dataclass
+class CachedBody:
+    expires_at: float
+    etag: str
+    body: bytes
+
+
+def encode_body(payload: Dict[str, Any]) -> bytes:
+    """Serialize like FastAPI's JSONResponse so cached and fresh bodies match."""
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def etag_for(body: bytes) -> str:
+    return f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class DashboardCache:
+    """Bounded TTL + LRU cache of dashboard metrics response bodies.
+
+    Metrics only change when a digest is logged, so ``log_digest`` drops the
+    monitor's entries and its org-wide ones. The cache is per process: other
+    workers serve their copy until it expires after ``ttl`` seconds.
+    """
+
+    def __init__(
+        self, ttl: Optional[float] = None, max_entries: Optional[int] = None
+    ) -> None:
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else float(os.getenv("DASHBOARD_CACHE_SECONDS", "60"))
+        )
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "5000"))
+        )
+        self._entries: "OrderedDict[CacheKey, CachedBody]" = OrderedDict()
+        # Bumped on every invalidation so a body computed across one is not stored
+        self.generation = 0
+
+    def get(self, key: CacheKey) -> Optional[CachedBody]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self, key: CacheKey, body: bytes, generation: Optional[int] = None
+    ) -> CachedBody:
+        entry = CachedBody(time.monotonic() + self.ttl, etag_for(body), body)
+        if self.ttl <= 0 or (generation is not None and generation != self.generation):
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_monitor(self, monitor_id: str, org_id: Optional[str] = None) -> None:
+        """Drop a monitor's entries and the org-wide ones it contributes to.
+
+        Without ``org_id`` every org-wide entry is dropped.
+        """
+        self.generation += 1
+        monitor_id = str(monitor_id)
+        for key in [
+            k
+            for k in self._entries
+            if k[2] == monitor_id
+            or (k[2] is None and (org_id is None or k[1] == str(org_id)))
+        ]:
+            del self._entries[key]
+
+    def invalidate_org(self, org_id: str) -> None:
+        self.generation += 1
+        org_id = str(org_id)
+        for key in [k for k in self._entries if k[1] == org_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by the monitor and org metrics routes; invalidated by DigestService
+dashboard_cache = DashboardCache()
+
+
+async def cached_json(
+    request: Request,
+    key: CacheKey,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Response:
+    """Serve ``compute()``'s payload from the cache, or 304 if the ETag matches.
+
+    Exceptions from ``compute`` (e.g. a 404) propagate and nothing is cached.
+    """
+    entry = dashboard_cache.get(key)
+    if entry is None:
+        generation = dashboard_cache.generation
+        body = encode_body(await compute())
+        entry = dashboard_cache.set(key, body, generation)
+        metrics_service.record_dashboard_cache("miss")
+    else:
+        metrics_service.record_dashboard_cache("hit")
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        metrics_service.record_dashboard_cache("not_modified")
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
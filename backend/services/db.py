@@ -0,0 +1,109 @@
+import os
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar, Union
+from supabase import AsyncClient, Client, acreate_client, create_client
+from config import SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# One client per process: its HTTP session and connection pool are shared by
+# every service and request instead of being rebuilt per call
+_supabase: Optional[Client] = None
+
+# Async client for the hot digest and metrics paths; its queries are awaited
+# on the event loop directly instead of occupying a pool thread
+_async_supabase: Optional[AsyncClient] = None
+
+# Services take either client; ``execute`` awaits both the same way
+SupabaseClient = Union[Client, AsyncClient]
+
+# supabase-py's sync client blocks on every PostgREST round-trip; its queries
+# run on this bounded pool so the event loop keeps serving other tenants
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_supabase() -> Client:
+    """Shared Supabase client, created on first use.
+
+    Also a FastAPI dependency: ``client: Client = Depends(get_supabase)``.
+    """
+    global _supabase
+    if _supabase is None:
+        if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
+            raise ValueError("Supabase environment variables not set")
+        _supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        logger.info("(db): Supabase client initialized")
+    return _supabase
+
+
+async def get_async_supabase() -> AsyncClient:
+    """Shared async Supabase client, created on first use.
+
+    Also a FastAPI dependency: ``client: AsyncClient = Depends(get_async_supabase)``.
+    """
+    global _async_supabase
+    if _async_supabase is None:
+        if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
+            raise ValueError("Supabase environment variables not set")
+        client = await acreate_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        # Concurrent first callers may both create one; keep the first
+        if _async_supabase is None:
+            _async_supabase = client
+            logger.info("(db): Async Supabase client initialized")
+    return _async_supabase
+
+
+async def close_async_supabase() -> None:
+    global _async_supabase
+    if _async_supabase is not None:
+        await _async_supabase.postgrest.aclose()
+        logger.info("(db): Async Supabase client closed")
+    _async_supabase = None
+
+
+def _max_workers() -> int:
+    return int(os.getenv("SUPABASE_MAX_WORKERS", "16"))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_max_workers(), thread_name_prefix="supabase"
+        )
+    return _executor
+
+
+async def run_sync(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the database pool and await its result.
+
+    For the sync client and other blocking SDKs (e.g. Stripe) only; queries
+    built on the async client are awaited directly by ``execute``.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+
+
+async def execute(query: Any) -> Any:
+    """Await a built PostgREST query (``table(...).select(...)...``).
+
+    Queries from the async client are awaited on the loop; sync ones run on
+    the database pool.
+    """
+    if inspect.iscoroutinefunction(query.execute):
+        return await query.execute()
+    return await run_sync(query.execute)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        logger.info("(db): Supabase query pool shut down")
+    _executor = None
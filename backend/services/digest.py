@@ -1,32 +1,211 @@
-from supabase import create_client
-from config import SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL
-from typing import List, Any, Optional, Dict
+import json
+import uuid
+import base64
+import binascii
+from datetime import datetime
+from services.db import SupabaseClient, execute, get_supabase
+from services.digest_contents import insert_digests, load_contents
+from services.digest_writer import digest_log_writer
+from services.dashboard_cache import dashboard_cache
+from services.ownership import monitor_owners
+from services.timeseries import GRANULARITIES, bucket_rows
+from typing import List, Any, Optional, Dict, Tuple
+
+# Counters stored in digests.metrics_json (see routes.digest.extract_metrics)
+METRIC_FIELDS = (
+    "prs_opened",
+    "prs_closed",
+    "issues_opened",
+    "issues_closed",
+    "bugfixes",
+    "docs",
+    "features",
+    "refactors",
+    "perf",
+)
+
+DIGEST_FIELDS = (
+    "id",
+    "summary",
+    "status",
+    "delivered_at",
+    "error_message",
+    "delivery_method",
+    "metrics_json",
+)
+
+# summary_hash points at the stored summary of rows without an inline one
+DIGEST_LIST_COLUMNS = ", ".join(DIGEST_FIELDS) + ", summary_hash"
+
+
+class MonitorNotFoundError(LookupError):
+    """The monitor does not exist or belongs to another org."""
+
+
+def encode_cursor(digest: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past ``digest`` in (delivered_at, id) order."""
+    raw = json.dumps([digest["delivered_at"], str(digest["id"])])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(delivered_at, id) from ``encode_cursor``; ValueError if malformed.
+
+    Both values end up in a PostgREST filter string, so they are parsed and
+    re-serialised rather than passed through as given.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        delivered_at, digest_id = json.loads(raw)
+        return (
+            datetime.fromisoformat(delivered_at).isoformat(),
+            str(uuid.UUID(digest_id)),
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def digest_columns(fields: Optional[str] = None) -> str:
+    """Select list for a comma-separated ``fields`` projection.
+
+    id and delivered_at are always included since cursors are built from them.
+    """
+    if not fields:
+        return DIGEST_LIST_COLUMNS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(DIGEST_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown digest fields: {', '.join(unknown)}")
+    columns = dict.fromkeys(["id", "delivered_at", *requested])
+    if "summary" in columns:
+        columns["summary_hash"] = None
+    return ", ".join(columns)
 
 
 class DigestService:
-    def __init__(self) -> None:
-        if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-            raise ValueError("Supabase environment variables not set")
-        self.client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    def __init__(self, client: Optional[SupabaseClient] = None) -> None:
+        self.client: SupabaseClient = client or get_supabase()
 
-    def get_monitor_digests(
-        self, monitor_id: str, limit: int = 5
+    async def _monitor_rows(
+        self,
+        monitor_id: str,
+        org_id: Optional[str],
+        columns: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+        table: str = "digests",
+        time_column: str = "delivered_at",
+        tiebreak: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
     ) -> List[Dict[str, Any]]:
-        digests_result = (
-            self.client.table("digests")
-            .select(
-                "id, summary, status, delivered_at, error_message, delivery_method, metrics_json"
+        """Rows of ``table`` for ``monitor_id`` ordered by ``time_column``.
+
+        With ``org_id`` the monitor must belong to that org or
+        MonitorNotFoundError is raised. The check rides in the same request:
+        the rows are embedded under the org-filtered monitor row. Once the
+        owner is cached the rows are read directly.
+
+        ``tiebreak`` orders rows sharing a timestamp; ``after`` is a
+        (time_column, tiebreak) keyset to continue from, so deep pages seek
+        the index instead of skipping rows.
+        """
+        owner = monitor_owners.get(monitor_id) if org_id else None
+        if owner is not None and owner != str(org_id):
+            raise MonitorNotFoundError(monitor_id)
+        if org_id is None or owner is not None:
+            query = (
+                self.client.table(table).select(columns).eq("monitor_id", monitor_id)
+            )
+            prefix, embedded = "", None
+        else:
+            query = (
+                self.client.table("monitors")
+                .select(f"org_id, {table}({columns})")
+                .eq("id", monitor_id)
+                .eq("org_id", org_id)
+            )
+            prefix, embedded = f"{table}.", table
+        if since:
+            query = query.gte(f"{prefix}{time_column}", since)
+        if until:
+            query = query.lt(f"{prefix}{time_column}", until)
+        if after is not None and tiebreak:
+            op = "lt" if desc else "gt"
+            # The plain bound gives the planner an index range to seek into;
+            # the OR only resolves rows sharing the cursor's timestamp
+            bound = query.lte if desc else query.gte
+            query = bound(f"{prefix}{time_column}", after[0])
+            at, key = (f'"{value}"' for value in after)
+            query = query.or_(
+                f"{time_column}.{op}.{at},"
+                f"and({time_column}.eq.{at},{tiebreak}.{op}.{key})",
+                reference_table=embedded,
             )
-            .eq("monitor_id", monitor_id)
-            .order("delivered_at", desc=True)
-            .limit(limit)
-            .execute()
+        query = query.order(time_column, desc=desc, foreign_table=embedded)
+        if tiebreak:
+            query = query.order(tiebreak, desc=desc, foreign_table=embedded)
+        if limit is not None:
+            query = query.limit(limit, foreign_table=embedded)
+
+        if embedded is None:
+            resp = await execute(query)
+            return list(resp.data) if resp and resp.data else []
+        resp = await execute(query.maybe_single())
+        if not resp or not resp.data:
+            raise MonitorNotFoundError(monitor_id)
+        monitor_owners.set(monitor_id, str(org_id))
+        return list(resp.data.get(table) or [])
+
+    async def get_monitor_digests(
+        self, monitor_id: str, limit: int = 5, org_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        rows = await self._monitor_rows(
+            monitor_id, org_id, DIGEST_LIST_COLUMNS, desc=True, limit=limit
+        )
+        return await self._with_summaries(rows)
+
+    async def page_monitor_digests(
+        self,
+        monitor_id: str,
+        limit: int = 5,
+        org_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """A page of digests, newest first, and the cursor of the next page.
+
+        Pages are keyed on (delivered_at, id) so each one costs the same at
+        any depth. Raises ValueError for a bad cursor or unknown field.
+        """
+        rows = await self._monitor_rows(
+            monitor_id,
+            org_id,
+            digest_columns(fields),
+            desc=True,
+            limit=limit + 1,
+            tiebreak="id",
+            after=decode_cursor(cursor) if cursor else None,
         )
-        if digests_result and digests_result.data:
-            return list(digests_result.data)
-        return []
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return await self._with_summaries(rows[:limit]), next_cursor
 
-    def log_digest(
+    async def _with_summaries(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill ``summary`` from digest_contents for rows that store a hash."""
+        hashes = {
+            row["summary_hash"]
+            for row in rows
+            if row.get("summary") is None and row.get("summary_hash")
+        }
+        contents = await load_contents(self.client, hashes)
+        for row in rows:
+            summary_hash = row.pop("summary_hash", None)
+            if row.get("summary") is None and summary_hash in contents:
+                row["summary"] = contents[summary_hash].decode()
+        return rows
+
+    async def log_digest(
         self,
         monitor_id: str,
         summary: str,
@@ -49,15 +228,25 @@ class DigestService:
             "raw_payload": raw_payload,
             "metrics_json": metrics_json or {},
         }
-        self.client.table("digests").insert(digest).execute()
+        if digest_log_writer.running:
+            # Written with the next batch; the cache is invalidated on flush
+            await digest_log_writer.put(digest)
+            return
+        await insert_digests(self.client, [digest])
+        dashboard_cache.invalidate_monitor(monitor_id, monitor_owners.get(monitor_id))
 
-    def aggregate_metrics(
+    async def aggregate_metrics(
         self,
         org_id: str,
         monitor_id: Optional[str] = None,
         period_days: int = 7,
         offset_days: int = 0,
     ) -> Dict[str, int]:
+        """Metric totals over the window, summed by the database.
+
+        Org-wide totals cover the org's active monitors. With ``monitor_id``
+        the monitor must belong to ``org_id``, else MonitorNotFoundError.
+        """
         from datetime import datetime, timedelta
 
         since = (
@@ -68,152 +257,146 @@ class DigestService:
             if offset_days > 0
             else None
         )
-        # Always fetch all monitor IDs for the org that are not deleted
-        monitor_ids = []
-        if not monitor_id:
-            from services.monitor import MonitorService
-
-            monitor_service = MonitorService()
-            monitors = (
-                monitor_service.client.table("monitors")
-                .select("id")
-                .eq("org_id", org_id)
-                .eq("deleted", False)
-                .execute()
+        if monitor_id:
+            owner = monitor_owners.get(monitor_id)
+            if owner is not None and owner != str(org_id):
+                raise MonitorNotFoundError(monitor_id)
+        resp = await execute(
+            self.client.rpc(
+                "digest_metrics_totals",
+                {
+                    "p_org_id": str(org_id),
+                    "p_monitor_id": monitor_id,
+                    "p_since": since,
+                    "p_until": until,
+                },
             )
-            monitor_ids = [m["id"] for m in (monitors.data or [])]
-        query = self.client.table("digests").select("metrics_json,monitor_id")
+        )
+        rows = resp.data if resp and resp.data else []
+        if not rows:
+            # The function returns no row for a monitor outside the org
+            if monitor_id:
+                raise MonitorNotFoundError(monitor_id)
+            return {field: 0 for field in METRIC_FIELDS}
         if monitor_id:
-            query = query.eq("monitor_id", monitor_id)
-        elif monitor_ids:
-            query = query.in_("monitor_id", monitor_ids)
-        query = query.gte("delivered_at", since)
-        if until:
-            query = query.lt("delivered_at", until)
-        resp = query.execute()
-        digests = resp.data if resp and resp.data else []
-        # If org_id, filter out digests whose monitor_id is not in the active list (defensive)
-        digests = [d for d in digests if d.get("monitor_id") in monitor_ids]
-        # Aggregate metrics
-        totals: Dict[str, int] = {
-            "prs_opened": 0,
-            "prs_closed": 0,
-            "issues_opened": 0,
-            "issues_closed": 0,
-            "bugfixes": 0,
-            "docs": 0,
-            "features": 0,
-            "refactors": 0,
-            "perf": 0,
+            monitor_owners.set(monitor_id, str(org_id))
+        return {field: int(rows[0].get(field) or 0) for field in METRIC_FIELDS}
+
+    async def compare_metrics(
+        self,
+        org_id: str,
+        monitor_id: Optional[str] = None,
+        period_days: int = 7,
+    ) -> Dict[str, Dict[str, int]]:
+        """Totals for the last ``period_days`` and the period before it.
+
+        Both periods come from one scan over twice the window. Returns
+        ``{"metrics": ..., "previous_metrics": ...}``; a ``monitor_id``
+        outside ``org_id`` raises MonitorNotFoundError.
+        """
+        from datetime import datetime, timedelta
+
+        now = datetime.utcnow()
+        if monitor_id:
+            owner = monitor_owners.get(monitor_id)
+            if owner is not None and owner != str(org_id):
+                raise MonitorNotFoundError(monitor_id)
+        resp = await execute(
+            self.client.rpc(
+                "digest_metrics_compare",
+                {
+                    "p_org_id": str(org_id),
+                    "p_monitor_id": monitor_id,
+                    "p_since": (now - timedelta(days=2 * period_days)).isoformat(),
+                    "p_split": (now - timedelta(days=period_days)).isoformat(),
+                },
+            )
+        )
+        rows = resp.data if resp and resp.data else []
+        if not rows and monitor_id:
+            raise MonitorNotFoundError(monitor_id)
+        if monitor_id:
+            monitor_owners.set(monitor_id, str(org_id))
+        periods = {row.get("period"): row for row in rows}
+        return {
+            key: {
+                field: int(periods.get(period, {}).get(field) or 0)
+                for field in METRIC_FIELDS
+            }
+            for key, period in (
+                ("metrics", "current"),
+                ("previous_metrics", "previous"),
+            )
         }
-        for d in digests:
-            m = d.get("metrics_json") or {}
-            totals["prs_opened"] += int(m.get("prs_opened", 0) or 0)
-            totals["prs_closed"] += int(m.get("prs_closed", 0) or 0)
-            totals["issues_opened"] += int(m.get("issues_opened", 0) or 0)
-            totals["issues_closed"] += int(m.get("issues_closed", 0) or 0)
-            totals["bugfixes"] += len(list(m.get("bugfixes", []) or []))
-            totals["docs"] += len(list(m.get("docs", []) or []))
-            totals["features"] += len(list(m.get("features", []) or []))
-            totals["refactors"] += len(list(m.get("refactors", []) or []))
-            totals["perf"] += len(list(m.get("perf", []) or []))
-        return totals
 
     def _days_ago_iso(self, days: int) -> str:
         from datetime import datetime, timedelta
 
         return (datetime.utcnow() - timedelta(days=days)).isoformat()
 
-    def timeseries_metrics(
-        self, monitor_id: str, period_days: int = 30
+    async def timeseries_metrics(
+        self,
+        monitor_id: str,
+        period_days: int = 30,
+        org_id: Optional[str] = None,
+        granularity: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
+        """Per-bucket totals for the period, oldest first.
+
+        Without a granularity the 24 hour view is one bucket summed from that
+        day's digests and longer periods are daily. Hourly buckets read raw
+        digests; daily and weekly ones read the digest_metrics_daily rollup.
+        """
         from datetime import datetime, timedelta
-        import collections
 
         now = datetime.utcnow()
-        if period_days == 1:
+        if granularity is None and period_days == 1:
             since = now - timedelta(days=1)
-            # Fetch all digests in the last 24 hours
-            resp = (
-                self.client.table("digests")
-                .select("delivered_at, metrics_json")
-                .eq("monitor_id", monitor_id)
-                .gte("delivered_at", since.isoformat())
-                .order("delivered_at")
-                .execute()
+            digests = await self._monitor_rows(
+                monitor_id, org_id, "delivered_at, metrics_json", since.isoformat()
             )
-            digests = resp.data if resp and resp.data else []
-            # Aggregate all into a single bucket
-            totals = {
-                "date": now.date().isoformat(),
-                "prs_opened": 0,
-                "prs_closed": 0,
-                "issues_opened": 0,
-                "issues_closed": 0,
-                "bugfixes": 0,
-                "docs": 0,
-                "features": 0,
-                "refactors": 0,
-                "perf": 0,
-            }
-            for d in digests:
-                m = d.get("metrics_json") or {}
-                totals["prs_opened"] += int(m.get("prs_opened", 0) or 0)
-                totals["prs_closed"] += int(m.get("prs_closed", 0) or 0)
-                totals["issues_opened"] += int(m.get("issues_opened", 0) or 0)
-                totals["issues_closed"] += int(m.get("issues_closed", 0) or 0)
-                totals["bugfixes"] += int(m.get("bugfixes", 0) or 0)
-                totals["docs"] += int(m.get("docs", 0) or 0)
-                totals["features"] += int(m.get("features", 0) or 0)
-                totals["refactors"] += int(m.get("refactors", 0) or 0)
-                totals["perf"] += int(m.get("perf", 0) or 0)
-            return [totals]
+            (totals,) = bucket_rows(
+                digests,
+                "delivered_at",
+                METRIC_FIELDS,
+                since,
+                timedelta(days=1),
+                1,
+                nested="metrics_json",
+            )
+            return [{**totals, "date": now.date().isoformat()}]
+
+        step = GRANULARITIES[granularity or "day"]
+        if step < timedelta(days=1):
+            count = period_days * 24 * 3600 // int(step.total_seconds())
+            end = now.replace(minute=0, second=0, microsecond=0) + step
         else:
-            # Ensure the range includes today (from midnight period_days-1 days ago to now)
-            since = (now - timedelta(days=period_days - 1)).replace(
-                hour=0, minute=0, second=0, microsecond=0
+            count = -(-period_days // step.days)
+            end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+                days=1
             )
-            # Fetch all digests for this monitor in the period
-            resp = (
-                self.client.table("digests")
-                .select("delivered_at, metrics_json")
-                .eq("monitor_id", monitor_id)
-                .gte("delivered_at", since.isoformat())
-                .order("delivered_at")
-                .execute()
+        since = end - step * count
+
+        if step < timedelta(days=1):
+            digests = await self._monitor_rows(
+                monitor_id, org_id, "delivered_at, metrics_json", since.isoformat()
+            )
+            return bucket_rows(
+                digests,
+                "delivered_at",
+                METRIC_FIELDS,
+                since,
+                step,
+                count,
+                nested="metrics_json",
             )
-            digests = resp.data if resp and resp.data else []
-            # Group by day
-            day_buckets = collections.defaultdict(list)
-            for d in digests:
-                dt = d["delivered_at"][:10]  # YYYY-MM-DD
-                day_buckets[dt].append(d["metrics_json"] or {})
-            # For each day, aggregate metrics
-            results = []
-            for i in range(period_days):
-                day = (since + timedelta(days=i)).date().isoformat()
-                metrics_list = day_buckets.get(day, [])
-                totals: Dict[str, Any] = {
-                    "date": day,
-                    "prs_opened": 0,
-                    "prs_closed": 0,
-                    "issues_opened": 0,
-                    "issues_closed": 0,
-                    "bugfixes": 0,
-                    "docs": 0,
-                    "features": 0,
-                    "refactors": 0,
-                    "perf": 0,
-                }
-                for m in metrics_list:
-                    totals["prs_opened"] += int(m.get("prs_opened", 0) or 0)
-                    totals["prs_closed"] += int(m.get("prs_closed", 0) or 0)
-                    totals["issues_opened"] += int(m.get("issues_opened", 0) or 0)
-                    totals["issues_closed"] += int(m.get("issues_closed", 0) or 0)
-                    totals["bugfixes"] += int(m.get("bugfixes", 0) or 0)
-                    totals["docs"] += int(m.get("docs", 0) or 0)
-                    totals["features"] += int(m.get("features", 0) or 0)
-                    totals["refactors"] += int(m.get("refactors", 0) or 0)
-                    totals["perf"] += int(m.get("perf", 0) or 0)
-                results.append(totals)
-            return results
+        # One rollup row per day with activity (digest_metrics_daily)
+        days = await self._monitor_rows(
+            monitor_id,
+            org_id,
+            "day, " + ", ".join(METRIC_FIELDS),
+            since.date().isoformat(),
+            table="digest_metrics_daily",
+            time_column="day",
+        )
+        return bucket_rows(days, "day", METRIC_FIELDS, since, step, count)
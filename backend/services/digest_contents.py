@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import zstandard
+from services.db import SupabaseClient, execute
+
+logger = logging.getLogger(__name__)
+
+CODEC = "zstd"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress(data: bytes) -> bytes:
+    level = int(os.getenv("DIGEST_CONTENT_ZSTD_LEVEL", "3"))
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def decompress(body: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(body)
+
+
+def to_bytea(data: bytes) -> str:
+    """PostgREST reads and writes bytea as a ``\\x`` hex string."""
+    return "\\x" + data.hex()
+
+
+def from_bytea(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+
+
+def content_row(data: bytes) -> Dict[str, Any]:
+    return {
+        "hash": content_hash(data),
+        "codec": CODEC,
+        "size": len(data),
+        "body": to_bytea(compress(data)),
+        "last_written_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def raw_payload_bytes(payload: Any) -> Optional[bytes]:
+    """Serialized raw payload to keep, or None if capture is off or it is too big."""
+    if payload is None:
+        return None
+    if os.getenv("DIGEST_STORE_RAW_PAYLOAD", "false").lower() != "true":
+        return None
+    data = json.dumps(payload, default=str, separators=(",", ":")).encode()
+    cap = int(os.getenv("DIGEST_RAW_PAYLOAD_MAX_BYTES", "1048576"))
+    if len(data) > cap:
+        logger.warning(f"Not storing {len(data)} byte raw payload (cap {cap})")
+        return None
+    return data
+
+
+def pack_digest(row: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Move a digest row's summary and raw payload out into content rows.
+
+    Every packed row has the same keys, as PostgREST bulk inserts expect.
+    """
+    digest = dict(row)
+    contents = []
+    for field in ("summary", "raw_payload"):
+        value = digest.get(field)
+        if field == "summary":
+            data = value.encode() if value is not None else None
+        else:
+            data = raw_payload_bytes(value)
+        digest[field] = None
+        digest[f"{field}_hash"] = None
+        if data is not None:
+            content = content_row(data)
+            contents.append(content)
+            digest[f"{field}_hash"] = content["hash"]
+    return digest, contents
+
+
+async def insert_digests(client: SupabaseClient, rows: List[Dict[str, Any]]) -> None:
+    """Insert digest rows, storing each distinct body once."""
+    packed = [pack_digest(row) for row in rows]
+    contents = {c["hash"]: c for _, cs in packed for c in cs}
+    if contents:
+        # New bodies are inserted; stored ones are left as they are and only
+        # get last_written_at refreshed, so pruning spares them
+        await execute(
+            client.table("digest_contents").upsert(
+                list(contents.values()), on_conflict="hash", ignore_duplicates=True
+            )
+        )
+        await execute(
+            client.table("digest_contents")
+            .update({"last_written_at": datetime.now(timezone.utc).isoformat()})
+            .in_("hash", sorted(contents))
+        )
+    # A trigger folds each row into digest_metrics_daily in the same insert
+    await execute(client.table("digests").insert([digest for digest, _ in packed]))
+
+
+async def load_contents(
+    client: SupabaseClient, hashes: Iterable[str]
+) -> Dict[str, bytes]:
+    """Decompressed bodies by hash; unknown hashes are left out."""
+    keys = sorted(set(hashes))
+    if not keys:
+        return {}
+    resp = await execute(
+        client.table("digest_contents").select("hash, codec, body").in_("hash", keys)
+    )
+    contents = {}
+    for row in resp.data if resp and resp.data else []:
+        if row.get("codec") != CODEC:
+            logger.error(f"Unknown codec {row.get('codec')} for {row['hash']}")
+            continue
+        contents[row["hash"]] = decompress(from_bytea(row["body"]))
+    return contents
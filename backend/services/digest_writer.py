@@ -0,0 +1,152 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from services.dashboard_cache import dashboard_cache
+from services.db import SupabaseClient, get_async_supabase
+from services.digest_contents import insert_digests
+from services.metrics import metrics_service
+from services.ownership import monitor_owners
+
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = "digest_log"
+
+
+class DigestLogWriter:
+    """Bounded in-process buffer that inserts digest rows in batches.
+
+    Rows are flushed as one bulk insert once ``batch_size`` are waiting or
+    ``flush_ms`` after the first one was queued, whichever comes first. A
+    full queue makes ``put`` wait, so a burst slows callers down instead of
+    growing memory. Only runs between ``start`` and ``close`` (the app
+    lifespan); callers fall back to inserting directly otherwise.
+    """
+
+    def __init__(
+        self,
+        client: Optional[SupabaseClient] = None,
+        batch_size: Optional[int] = None,
+        flush_ms: Optional[float] = None,
+        max_queue: Optional[int] = None,
+    ) -> None:
+        self.client = client
+        self.batch_size = batch_size or int(os.getenv("DIGEST_LOG_BATCH_SIZE", "100"))
+        self.flush_ms = (
+            flush_ms
+            if flush_ms is not None
+            else float(os.getenv("DIGEST_LOG_FLUSH_MS", "200"))
+        )
+        self.max_queue = max_queue or int(os.getenv("DIGEST_LOG_MAX_QUEUE", "10000"))
+        # None is the shutdown sentinel
+        self._queue: Optional["asyncio.Queue[Optional[Dict[str, Any]]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        # False once close() starts, so late writes go straight to the table
+        return (
+            self._queue is not None
+            and self._worker is not None
+            and not self._worker.done()
+        )
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run(self._queue))
+
+    async def put(self, row: Dict[str, Any]) -> None:
+        """Queue a digest row; returns once queued, before it is written."""
+        if not self.running or self._queue is None:
+            raise RuntimeError("DigestLogWriter is not running")
+        await self._queue.put(row)
+        metrics_service.set_queue_size(QUEUE_NAME, self._queue.qsize())
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """Write everything queued, then stop the worker."""
+        queue, worker = self._queue, self._worker
+        if queue is None or worker is None:
+            return
+        self._queue = None
+        if timeout is None:
+            timeout = float(os.getenv("DIGEST_LOG_DRAIN_SECONDS", "10"))
+        try:
+            # The sentinel flushes the partial batch at once instead of
+            # waiting out the interval
+            await asyncio.wait_for(self._drain(queue, worker), timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Dropping {queue.qsize()} queued digest logs: "
+                f"not drained within {timeout}s"
+            )
+            worker.cancel()
+        except Exception as e:
+            logger.error(f"Digest log writer failed: {e}")
+        self._worker = None
+        metrics_service.set_queue_size(QUEUE_NAME, 0)
+
+    @staticmethod
+    async def _drain(
+        queue: "asyncio.Queue[Optional[Dict[str, Any]]]", worker: "asyncio.Task[None]"
+    ) -> None:
+        await queue.put(None)
+        await asyncio.shield(worker)
+
+    async def _run(self, queue: "asyncio.Queue[Optional[Dict[str, Any]]]") -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            first = await queue.get()
+            if first is None:
+                return
+            batch = [first]
+            flush_at = loop.time() + self.flush_ms / 1000
+            while len(batch) < self.batch_size:
+                remaining = flush_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            metrics_service.set_queue_size(QUEUE_NAME, queue.qsize())
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        client = self.client or await get_async_supabase()
+        started = time.perf_counter()
+        try:
+            await insert_digests(client, batch)
+            written = batch
+        except Exception as e:
+            # One bad row (e.g. its monitor was just deleted) must not take
+            # the rest of the batch down with it
+            logger.warning(f"Bulk insert of {len(batch)} digest logs failed: {e}")
+            written = []
+            for row in batch:
+                try:
+                    await insert_digests(client, [row])
+                    written.append(row)
+                except Exception as row_error:
+                    logger.error(
+                        f"Dropping digest log for monitor {row.get('monitor_id')}: "
+                        f"{row_error}"
+                    )
+        metrics_service.record_queue_processing_time(
+            QUEUE_NAME, time.perf_counter() - started
+        )
+        for monitor_id in {str(row["monitor_id"]) for row in written}:
+            dashboard_cache.invalidate_monitor(
+                monitor_id, monitor_owners.get(monitor_id)
+            )
+
+
+# Started and drained by the app lifespan (main.py)
+digest_log_writer = DigestLogWriter()
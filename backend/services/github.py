@@ -1,27 +1,307 @@
+import asyncio
 import httpx
 import os
-from typing import Dict, List, Any
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from datetime import datetime, timedelta, timezone
 import logging
+from services.http_client import get_github_client, github_api_url
+from services.github_graphql import (
+    HISTORY_QUERY,
+    build_activity_query,
+    parse_activity_response,
+    parse_history,
+    split_repo,
+)
+from services.github_cache import (
+    CACHED_HEADERS,
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    get_response_cache,
+)
+from services.metrics import metrics_service
+from utils.commit_classifier import CommitClassifier, get_commit_classifier
+from services.github_ratelimit import (
+    RateLimitScheduler,
+    github_rate_limiter,
+    is_throttled,
+    resource_for,
+    token_fingerprint,
+)
+from services.github_app import GitHubApp, get_github_app
+from services.resilience import RETRYABLE_STATUS, call_with_resilience
+from services.github_tokens import (
+    GitHubTokenPool,
+    authorization_header,
+    get_token_pool,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Summaries too generic to be worth reporting
+TRIVIAL_SUMMARIES = frozenset([".", "!", "?", "...", "update", "fix", "wip"])
+
+ONE_SECOND = timedelta(seconds=1)
+
+
+class RepositoryNotFoundError(Exception):
+    """The repository does not exist, or is private and was fetched without
+    the caller's own token (pooled tokens and anonymous access only serve
+    public repositories)."""
+
+
+def is_public_repo(response: httpx.Response) -> bool:
+    """Whether a ``/repos/{owner}/{repo}`` response is for a public repository."""
+    return response.json().get("private") is False
+
+
+async def _resolved(value: T) -> T:
+    return value
+
+
+def format_timestamp(moment: datetime) -> str:
+    """UTC ISO 8601 with a Z suffix, as search qualifiers and commit filters expect."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
 
 class GitHubService:
-    def __init__(self, github_token: str = None) -> None:
-        self.github_token = github_token or os.getenv("GITHUB_TOKEN")
-        self.base_url = "https://api.github.com"
+    def __init__(
+        self,
+        github_token: str = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        classifier: Optional[CommitClassifier] = None,
+        token_pool: Optional[GitHubTokenPool] = None,
+        github_app: Optional[GitHubApp] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
+        self.github_token = github_token
+        # Without an explicit token, each request borrows one from the pool
+        # (GITHUB_TOKENS + GITHUB_TOKEN); an empty pool means anonymous access
+        self.token_pool = (
+            None
+            if github_token
+            else (token_pool if token_pool is not None else get_token_pool())
+        )
+        # Installations listed in GITHUB_APP_POOL_INSTALLATIONS join the pool
+        self.github_app = github_app or get_github_app()
+        self.base_url = (base_url or github_api_url()).rstrip("/")
+        self.graphql_url = f"{self.base_url}/graphql"
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "Infrasync/1.0",
         }
         if self.github_token:
             self.headers["Authorization"] = f"token {self.github_token}"
+        self._client = client
+        # ETag / Last-Modified store; 304s don't count against the rate limit
+        self.cache = cache if cache is not None else get_response_cache()
+        self.scheduler = scheduler or github_rate_limiter
+        self.classifier = classifier or get_commit_classifier()
+        # Run the independent per-repo requests concurrently, capped per repo
+        self.concurrent_fetch = os.getenv(
+            "GITHUB_CONCURRENT_FETCH", "true"
+        ).lower() in ("1", "true", "yes", "y")
+        self.max_concurrency = int(os.getenv("GITHUB_PER_REPO_CONCURRENCY", "6"))
+        # "rest" fans out per repo; "graphql" fetches everything in one query
+        self.fetch_backend = os.getenv("GITHUB_FETCH_BACKEND", "rest").lower()
+        self.graphql_batch_size = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "10"))
+        # Upper bound on commits streamed per digest (0 = unlimited)
+        self.max_commits = int(os.getenv("GITHUB_MAX_COMMITS", "1000")) or None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client; defaults to the application-scoped shared client."""
+        return self._client or get_github_client()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        params: dict = None,
+        json: Any = None,
+    ) -> httpx.Response:
+        """One logical request; 5xx and network errors are retried per host."""
+
+        async def attempt() -> httpx.Response:
+            response = await self.client.request(
+                method, url, headers=headers, params=params, json=json
+            )
+            if response.status_code in RETRYABLE_STATUS:
+                response.raise_for_status()
+            return response
+
+        return await call_with_resilience(httpx.URL(url).host, attempt)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        params: dict = None,
+        json: Any = None,
+        prepare: Optional[Callable[[Dict[str, str]], Dict[str, str]]] = None,
+    ) -> httpx.Response:
+        """Issue a request through the rate limit scheduler, retrying throttles.
+
+        Unauthenticated requests take the best token from the pool per
+        attempt, so a throttled token is swapped out instead of waited on.
+        A 401 quarantines the token; a 403 is retried on another token once
+        and only quarantines the first if the second one succeeds.
+        ``prepare`` sees each attempt's final headers, token included.
+        """
+        resource = resource_for(url)
+        pool = self.token_pool if "Authorization" not in headers else None
+        if pool is not None and self.github_app and self.github_app.pool_installations:
+            await self.github_app.refresh_pool(pool)
+        forbidden: Optional[str] = None
+        attempt = 0
+        while True:
+            token = None
+            request_headers = headers
+            if pool:
+                token = pool.choose(resource, exclude=[forbidden] if forbidden else ())
+                if token:
+                    request_headers = {
+                        **headers,
+                        "Authorization": authorization_header(token),
+                    }
+            token_id = token_fingerprint(request_headers.get("Authorization"))
+            if prepare is not None:
+                request_headers = prepare(request_headers)
+            await self.scheduler.acquire(token_id, resource)
+            response = await self._request(
+                method, url, request_headers, params=params, json=json
+            )
+            self.scheduler.update(token_id, resource, response)
+            if pool and token:
+                pool.record(token, response.status_code)
+                status = response.status_code
+                if status == 401 or (status == 403 and not is_throttled(response)):
+                    if status == 401:
+                        pool.quarantine(token, status)
+                    others = [t for t in pool.available() if t != token]
+                    if forbidden is None and others:
+                        if status == 403:
+                            forbidden = token
+                        continue
+                    return response
+                if forbidden is not None:
+                    # Another token got through, so the 403 was the token's fault
+                    pool.quarantine(forbidden, 403)
+                    forbidden = None
+            if not self.scheduler.should_retry(token_id, resource, response, attempt):
+                return response
+            attempt += 1
+
+    async def _get(
+        self,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        cache_if: Optional[Callable[[httpx.Response], bool]] = None,
+    ) -> httpx.Response:
+        """GET with conditional-request caching; a 304 replays the cached body.
+
+        Entries are keyed on the token the request was actually sent with,
+        so pooled requests never share an entry across tokens. Responses
+        ``cache_if`` rejects are not stored.
+        """
+        headers = dict(headers or self.headers)
+        key: Optional[str] = None
+        cached: Optional[CachedResponse] = None
+
+        def conditional(request_headers: Dict[str, str]) -> Dict[str, str]:
+            nonlocal key, cached
+            if self.cache is None:
+                return request_headers
+            key = cache_key(url, params, request_headers.get("Authorization"))
+            cached = self.cache.get(key)
+            if cached is None:
+                return request_headers
+            return {**request_headers, **cached.conditional_headers()}
+
+        response = await self._send(
+            "GET", url, headers, params=params, prepare=conditional
+        )
+
+        if response.status_code == 304 and cached is not None:
+            metrics_service.record_github_cache("hit")
+            return httpx.Response(
+                200,
+                headers=cached.headers,
+                content=cached.body,
+                request=response.request,
+            )
+        response.raise_for_status()
+        if self.cache is not None and key is not None:
+            metrics_service.record_github_cache("miss")
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if (etag or last_modified) and (cache_if is None or cache_if(response)):
+                self.cache.set(
+                    key,
+                    CachedResponse(
+                        body=response.content,
+                        etag=etag,
+                        last_modified=last_modified,
+                        headers={
+                            name: response.headers[name]
+                            for name in CACHED_HEADERS
+                            if name in response.headers
+                        },
+                    ),
+                )
+        return response
+
+    async def _post(
+        self, url: str, headers: dict = None, json: Any = None
+    ) -> httpx.Response:
+        response = await self._send("POST", url, headers or self.headers, json=json)
+        response.raise_for_status()
+        return response
 
     async def fetch_repository_data(
-        self, repo: str, github_token: str = None
+        self,
+        repo: str,
+        github_token: str = None,
+        concurrent: Optional[bool] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        last_commit_sha: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Fetch recent activity data from a GitHub repository."""
+        """Fetch activity data for the window ``[since, until)`` of a repository.
+
+        ``until`` defaults to now and ``since`` to one day before it. Commit
+        streaming also stops at ``last_commit_sha``, the head recorded by the
+        previous digest, so consecutive windows never report a commit twice.
+        The result carries the window and the newest commit seen
+        (``head_sha``) so the caller can advance its cursor, plus the streamed
+        commits (``commits``) for ``since_commit`` to trim.
+
+        When ``concurrent`` is true (default from GITHUB_CONCURRENT_FETCH) the
+        repo, search and commit requests are issued together, at most
+        ``max_concurrency`` at a time; otherwise they run one after another.
+        With GITHUB_FETCH_BACKEND=graphql and a token available, a single
+        GraphQL query is used instead.
+        """
         try:
             try:
                 owner, repo_name = repo.strip().split("/")
@@ -33,67 +313,139 @@ class GitHubService:
             headers = self.headers.copy()
             if github_token:
                 headers["Authorization"] = f"token {github_token}"
+            # Pooled and anonymous results are shared between callers
+            pooled = "Authorization" not in headers
 
-            async with httpx.AsyncClient() as client:
-                # Fetch repository info
-                repo_response = await client.get(
-                    f"{self.base_url}/repos/{owner}/{repo_name}", headers=headers
-                )
-                repo_response.raise_for_status()
-                repo_data = repo_response.json()
-
-                # Calculate date range (last 7 days)
-                since_date = datetime.now(timezone.utc) - timedelta(days=1)
-                since_date_str = since_date.isoformat()
-                pr_opened = await self.fetch_search_results(
-                    f"repo:{owner}/{repo_name} type:pr created:>{since_date_str}",
-                    headers=headers,
-                )
-                pr_closed = await self.fetch_search_results(
-                    f"repo:{owner}/{repo_name} type:pr closed:>{since_date_str}",
-                    headers=headers,
-                )
-                issues_opened = await self.fetch_search_results(
-                    f"repo:{owner}/{repo_name} type:issue created:>{since_date_str}",
-                    headers=headers,
-                )
-                issues_closed = await self.fetch_search_results(
-                    f"repo:{owner}/{repo_name} type:issue closed:>{since_date_str}",
-                    headers=headers,
-                )
+            until = until or datetime.now(timezone.utc)
+            since = since or until - timedelta(days=1)
 
-                # Fetch recent commits
-                commits_response = await client.get(
-                    f"{self.base_url}/repos/{owner}/{repo_name}/commits",
-                    headers=headers,
-                    params={"since": since_date_str, "per_page": 100},
+            # GraphQL requires authentication; anonymous fetches stay on REST
+            authenticated = "Authorization" in headers or bool(self.token_pool)
+            if self.fetch_backend == "graphql" and authenticated:
+                full_name = f"{owner}/{repo_name}"
+                results = await self.fetch_repositories_graphql(
+                    [full_name],
+                    github_token=github_token,
+                    since=since,
+                    until=until,
+                    last_commit_shas=(
+                        {full_name: last_commit_sha} if last_commit_sha else None
+                    ),
                 )
-                commits_response.raise_for_status()
-                all_commits = commits_response.json()
+                if full_name not in results:
+                    raise RepositoryNotFoundError(full_name)
+                return results[full_name]
+
+            if concurrent is None:
+                concurrent = self.concurrent_fetch
+            semaphore = asyncio.Semaphore(self.max_concurrency if concurrent else 1)
 
-                grouped_commits = self.group_commit_messages(all_commits)
+            async def limited(coro: Awaitable[T]) -> T:
+                async with semaphore:
+                    return await coro
 
-                logger.info(
-                    f"Fetched repo data for {repo_name}: "
-                    f"{len(all_commits)} commits, "
-                    f"{len(pr_opened) + len(pr_closed)} PRs, "
-                    f"{len(issues_opened) + len(issues_closed)} issues."
+            since_str, until_str = format_timestamp(since), format_timestamp(until)
+            # Search ranges are inclusive, so end one second early to tile windows
+            date_range = f"{since_str}..{format_timestamp(until - ONE_SECOND)}"
+            seen: List[Dict[str, str]] = []
+
+            full_name = f"{owner}/{repo_name}"
+            repo_info: Awaitable[httpx.Response]
+            if pooled:
+                # Check visibility before anything else is fetched or cached
+                repo_response = await self._get(
+                    f"{self.base_url}/repos/{full_name}",
+                    headers=headers,
+                    cache_if=is_public_repo,
                 )
+                if not is_public_repo(repo_response):
+                    raise RepositoryNotFoundError(full_name)
+                repo_info = _resolved(repo_response)
+            else:
+                repo_info = self._get(
+                    f"{self.base_url}/repos/{full_name}", headers=headers
+                )
+            (
+                repo_response,
+                pr_opened,
+                pr_closed,
+                issues_opened,
+                issues_closed,
+                (grouped_commits, commit_count),
+            ) = await asyncio.gather(
+                # Fetch repository info
+                limited(repo_info),
+                # Counts come from total_count, so result pages are never fetched
+                limited(
+                    self.count_search_results(
+                        f"repo:{full_name} type:pr created:{date_range}",
+                        headers=headers,
+                    )
+                ),
+                limited(
+                    self.count_search_results(
+                        f"repo:{full_name} type:pr closed:{date_range}",
+                        headers=headers,
+                    )
+                ),
+                limited(
+                    self.count_search_results(
+                        f"repo:{full_name} type:issue created:{date_range}",
+                        headers=headers,
+                    )
+                ),
+                limited(
+                    self.count_search_results(
+                        f"repo:{full_name} type:issue closed:{date_range}",
+                        headers=headers,
+                    )
+                ),
+                # Stream new commits across pages, up to the commit budget
+                limited(
+                    self.group_commit_stream(
+                        self._new_commits(
+                            self.iter_commits(
+                                full_name,
+                                since_str,
+                                headers=headers,
+                                max_items=self.max_commits,
+                                until=until_str,
+                            ),
+                            last_commit_sha,
+                            seen,
+                        )
+                    )
+                ),
+            )
+            repo_data = repo_response.json()
 
-                return {
-                    "repository": {
-                        "full_name": repo_data["full_name"],
-                    },
-                    "summary_counts": {
-                        "commits": len(all_commits),
-                        "prs_opened": len(pr_opened),
-                        "prs_closed": len(pr_closed),
-                        "issues_opened": len(issues_opened),
-                        "issues_closed": len(issues_closed),
-                    },
-                    "grouped_commits": grouped_commits,
-                }
+            logger.info(
+                f"Fetched repo data for {repo_name}: "
+                f"{commit_count} commits, "
+                f"{pr_opened + pr_closed} PRs, "
+                f"{issues_opened + issues_closed} issues."
+            )
+
+            return {
+                "repository": {
+                    "full_name": repo_data["full_name"],
+                    "private": bool(repo_data.get("private", False)),
+                },
+                "summary_counts": {
+                    "commits": commit_count,
+                    "prs_opened": pr_opened,
+                    "prs_closed": pr_closed,
+                    "issues_opened": issues_opened,
+                    "issues_closed": issues_closed,
+                },
+                "grouped_commits": grouped_commits,
+                "window": {"since": since_str, "until": until_str},
+                "head_sha": seen[0]["sha"] if seen else None,
+                "commits": seen,
+            }
 
+        except RepositoryNotFoundError:
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"GitHub API error: {e.response.status_code} - {e.response.text}"
@@ -105,73 +457,271 @@ class GitHubService:
             logger.error(f"Error fetching repository data: {str(e)}")
             raise Exception(f"Failed to fetch repository data: {str(e)}")
 
-    async def fetch_search_results(
-        self, query: str, headers: dict = None
+    async def fetch_repositories_graphql(
+        self,
+        repos: List[str],
+        github_token: str = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        last_commit_shas: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch activity for several repos, one aliased GraphQL query per batch.
+
+        Returns a mapping of ``owner/repo`` to the same payload as
+        ``fetch_repository_data``. Repos GitHub cannot resolve are omitted,
+        as are private ones when fetched with a pooled token. As on REST, each
+        repo's history stops at its entry in ``last_commit_shas`` or after
+        ``max_commits`` commits, paging past the first 100 as needed.
+        """
+        headers = self.headers.copy()
+        if github_token:
+            headers["Authorization"] = f"token {github_token}"
+        pooled = "Authorization" not in headers
+
+        until = until or datetime.now(timezone.utc)
+        since = since or until - timedelta(days=1)
+        since_str, until_str = format_timestamp(since), format_timestamp(until)
+        last_second = format_timestamp(until - ONE_SECOND)
+        results: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(repos), self.graphql_batch_size):
+            batch = repos[start : start + self.graphql_batch_size]
+            data = await self._graphql(
+                build_activity_query(batch, since_str, last_second),
+                {"since": since_str, "until": last_second},
+                headers,
+            )
+
+            parsed = parse_activity_response(data, batch)
+            for repo, item in list(parsed.items()):
+                if pooled and item["repository"]["private"]:
+                    logger.warning(f"(github/graphql): Skipping private {repo}")
+                    del parsed[repo]
+            # Windows longer than one page continue concurrently, per repo
+            histories = await asyncio.gather(
+                *(
+                    self._graphql_history(
+                        repo,
+                        item.pop("commits"),
+                        item.pop("history_cursor"),
+                        {"since": since_str, "until": last_second},
+                        headers,
+                        (last_commit_shas or {}).get(repo),
+                    )
+                    for repo, item in parsed.items()
+                )
+            )
+            for (repo, item), commits in zip(parsed.items(), histories):
+                # Counted like REST: the commits loaded, within the budget
+                item["summary_counts"]["commits"] = len(commits)
+                item["grouped_commits"] = self.group_commit_messages(commits)
+                item["window"] = {"since": since_str, "until": until_str}
+                item["head_sha"] = commits[0]["sha"] if commits else None
+                item["commits"] = [self._commit_ref(c) for c in commits if c["sha"]]
+                results[repo] = self.since_commit(
+                    item, (last_commit_shas or {}).get(repo)
+                )
+
+            cost = data.get("rateLimit") or {}
+            logger.info(
+                f"(github/graphql): Fetched {len(parsed)}/{len(batch)} repos, "
+                f"cost={cost.get('cost')}, remaining={cost.get('remaining')}"
+            )
+        return results
+
+    async def _graphql(
+        self, query: str, variables: Dict[str, Any], headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """``data`` of a GraphQL response; partial errors are only logged."""
+        response = await self._post(
+            self.graphql_url,
+            headers=headers,
+            json={"query": query, "variables": variables},
+        )
+        payload = response.json()
+        errors = payload.get("errors") or []
+        if errors and not payload.get("data"):
+            raise Exception(f"GitHub GraphQL error: {errors[0].get('message')}")
+        for error in errors:
+            logger.warning(f"(github/graphql): {error.get('message')}")
+        return payload.get("data") or {}
+
+    async def _graphql_history(
+        self,
+        repo: str,
+        commits: List[Dict[str, Any]],
+        cursor: Optional[str],
+        window: Dict[str, str],
+        headers: Dict[str, str],
+        last_commit_sha: Optional[str],
     ) -> List[Dict[str, Any]]:
-        url = f"{self.base_url}/search/issues"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=headers or self.headers,
-                params={"q": query, "per_page": 100},
+        """``commits`` followed by the rest of the history after ``cursor``.
+
+        Stops once ``last_commit_sha`` or ``max_commits`` is reached.
+        """
+        owner, name = split_repo(repo)
+        commits = list(commits)
+        page = commits
+        while (
+            cursor
+            and (self.max_commits is None or len(commits) < self.max_commits)
+            and not (last_commit_sha and any(c["sha"] == last_commit_sha for c in page))
+        ):
+            data = await self._graphql(
+                HISTORY_QUERY,
+                {**window, "owner": owner, "name": name, "after": cursor},
+                headers,
             )
-            response.raise_for_status()
-            items = response.json()["items"]
-            return list(items) if isinstance(items, list) else []
+            page, _, cursor = parse_history(data.get("repository"))
+            commits.extend(page)
+        return commits[: self.max_commits] if self.max_commits else commits
 
-    def group_commit_messages(self, commits: List[Any]) -> Dict[str, List[str]]:
-        grouped: Dict[str, List[str]] = {
-            "bugfix": [],
-            "feature": [],
-            "perf": [],
-            "docs": [],
-            "refactor": [],
-            "other": [],
+    async def _paginate(
+        self,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        items_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield items page by page, following ``Link: rel=next`` headers."""
+        yielded = 0
+        next_url: Optional[str] = url
+        while next_url:
+            response = await self._get(next_url, headers=headers, params=params)
+            page = response.json()
+            items = page.get(items_key, []) if items_key else page
+            for item in items if isinstance(items, list) else []:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+            # The next link already carries the query string
+            next_url = response.links.get("next", {}).get("url")
+            params = None
+
+    def iter_commits(
+        self,
+        repo: str,
+        since: str,
+        headers: dict = None,
+        max_items: Optional[int] = None,
+        until: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream commits on the default branch, newest first, since ``since``.
+
+        ``since`` and ``until`` are ISO 8601 timestamps.
+        """
+        params: Dict[str, Any] = {"since": since, "per_page": 100}
+        if until:
+            params["until"] = until
+        return self._paginate(
+            f"{self.base_url}/repos/{repo}/commits",
+            headers=headers,
+            params=params,
+            max_items=max_items,
+        )
+
+    async def _new_commits(
+        self,
+        commits: AsyncIterator[Dict[str, Any]],
+        last_commit_sha: Optional[str],
+        seen: List[Dict[str, str]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield commits until ``last_commit_sha``, recording each in ``seen``."""
+        async for commit in commits:
+            sha = commit.get("sha")
+            if last_commit_sha and sha == last_commit_sha:
+                return
+            if sha:
+                seen.append(self._commit_ref(commit))
+            yield commit
+
+    @staticmethod
+    def _commit_ref(commit: Dict[str, Any]) -> Dict[str, str]:
+        """Sha and first message line, enough to regroup a trimmed window."""
+        message = (commit.get("commit") or {}).get("message") or ""
+        return {"sha": commit["sha"], "message": message.partition("\n")[0][:100]}
+
+    def since_commit(
+        self, repo_data: Dict[str, Any], last_commit_sha: Optional[str]
+    ) -> Dict[str, Any]:
+        """``repo_data`` without the commits up to and including ``last_commit_sha``.
+
+        Lets callers share one fetch of a window and still skip what each
+        one already reported. Returns ``repo_data`` itself when nothing is cut.
+        """
+        commits = repo_data.get("commits") or []
+        shas = [commit["sha"] for commit in commits]
+        if not last_commit_sha or last_commit_sha not in shas:
+            return repo_data
+        kept = commits[: shas.index(last_commit_sha)]
+        grouped = self.group_commit_messages(
+            [{"commit": {"message": commit["message"]}} for commit in kept]
+        )
+        return {
+            **repo_data,
+            "summary_counts": {**repo_data["summary_counts"], "commits": len(kept)},
+            "grouped_commits": grouped,
+            "head_sha": kept[0]["sha"] if kept else None,
+            "commits": kept,
         }
 
+    def iter_search_results(
+        self, query: str, headers: dict = None, max_items: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream issue/PR search results for ``query``."""
+        return self._paginate(
+            f"{self.base_url}/search/issues",
+            headers=headers,
+            params={"q": query, "per_page": 100},
+            items_key="items",
+            max_items=max_items,
+        )
+
+    async def count_search_results(self, query: str, headers: dict = None) -> int:
+        """Return the search ``total_count`` without fetching the result pages."""
+        response = await self._get(
+            f"{self.base_url}/search/issues",
+            headers=headers,
+            params={"q": query, "per_page": 1},
+        )
+        return int(response.json().get("total_count", 0) or 0)
+
+    async def fetch_search_results(
+        self, query: str, headers: dict = None, max_items: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return [
+            item
+            async for item in self.iter_search_results(
+                query, headers=headers, max_items=max_items
+            )
+        ]
+
+    def _commit_summaries(self, commits: Iterable[Any]) -> List[str]:
+        """The reportable one-line summary of each commit."""
+        summaries: List[str] = []
         for i, commit in enumerate(commits):
             try:
                 msg = commit["commit"]["message"]
-                # Skip empty or very short commit messages
-                if not msg or len(msg.strip()) < 3:
+                if not msg:
                     continue
 
-                summary = msg.split("\n")[0][:100].strip()
-
-                # Skip commits that are just punctuation or very short
-                if len(summary) < 5 or summary in [
-                    ".",
-                    "!",
-                    "?",
-                    "...",
-                    "update",
-                    "fix",
-                    "wip",
-                ]:
+                # Only the first line is needed; don't split the whole body
+                summary = msg.partition("\n")[0][:100].strip()
+
+                # Skip empty, very short or punctuation-only summaries
+                if len(summary) < 5 or summary in TRIVIAL_SUMMARIES:
                     continue
 
-                matched = False
-                if "fix" in summary.lower() or "bug" in summary.lower():
-                    grouped["bugfix"].append(summary)
-                    matched = True
-                if "feat" in summary.lower() or "feature" in summary.lower():
-                    grouped["feature"].append(summary)
-                    matched = True
-                if "perf" in summary.lower() or "speed" in summary.lower():
-                    grouped["perf"].append(summary)
-                    matched = True
-                if "doc" in summary.lower():
-                    grouped["docs"].append(summary)
-                    matched = True
-                if "refactor" in summary.lower():
-                    grouped["refactor"].append(summary)
-                    matched = True
-                if not matched:
-                    grouped["other"].append(summary)
+                summaries.append(summary)
 
             except Exception as e:
                 logger.warning(f"[commit {i}] Skipped due to error: {e}")
+        return summaries
 
+    def _filter_commit_groups(
+        self, grouped: Dict[str, List[str]]
+    ) -> Dict[str, List[str]]:
         # Filter out empty categories
         filtered_grouped: Dict[str, List[str]] = {}
         for category, commits in grouped.items():
@@ -183,6 +733,21 @@ class GitHubService:
         )
         return filtered_grouped
 
+    def group_commit_messages(self, commits: List[Any]) -> Dict[str, List[str]]:
+        grouped = self.classifier.group(self._commit_summaries(commits))
+        return self._filter_commit_groups(grouped)
+
+    async def group_commit_stream(
+        self, commits: AsyncIterator[Any]
+    ) -> Tuple[Dict[str, List[str]], int]:
+        """Group commits as they stream in; returns (groups, commits consumed)."""
+        grouped = self.classifier.group([])
+        count = 0
+        async for commit in commits:
+            self.classifier.group(self._commit_summaries([commit]), into=grouped)
+            count += 1
+        return self._filter_commit_groups(grouped), count
+
     async def is_repo_private(self, repo: str, github_token: str) -> bool:
         owner, repo_name = repo.strip().split("/")
         headers = {
@@ -190,10 +755,8 @@ class GitHubService:
             "User-Agent": "Infrasync/1.0",
             "Authorization": f"token {github_token}",
         }
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"https://api.github.com/repos/{owner}/{repo_name}", headers=headers
-            )
-            resp.raise_for_status()
-            repo_data = resp.json()
-            return bool(repo_data.get("private", False))
+        resp = await self._get(
+            f"{self.base_url}/repos/{owner}/{repo_name}", headers=headers
+        )
+        repo_data = resp.json()
+        return bool(repo_data.get("private", False))
@@ -0,0 +1,259 @@
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import httpx
+from jose import jwt  # type: ignore
+from services.http_client import get_github_client, github_api_url
+from services.github_tokens import GitHubTokenPool, authorization_header
+from services.resilience import RETRYABLE_STATUS, call_with_resilience
+
+logger = logging.getLogger(__name__)
+
+# App JWTs may live at most 10 minutes; iat is backdated for clock drift
+APP_JWT_TTL_SECONDS = 540
+APP_JWT_CLOCK_DRIFT_SECONDS = 60
+
+
+@dataclass
+class InstallationToken:
+    token: str
+    expires_at: float
+
+
+class GitHubApp:
+    """Mints and caches GitHub App installation access tokens.
+
+    Installation tokens last an hour; each is reused by every monitor in the
+    installation until ``refresh_margin`` seconds before it expires. Minting
+    is serialised per installation so concurrent digests share one request.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        private_key: str,
+        client: Optional[httpx.AsyncClient] = None,
+        base_url: Optional[str] = None,
+        refresh_margin: Optional[float] = None,
+        installation_cache_seconds: Optional[float] = None,
+        pool_installations: Sequence[str] = (),
+    ) -> None:
+        self.app_id = app_id
+        self.private_key = private_key
+        self.base_url = (base_url or github_api_url()).rstrip("/")
+        self._client = client
+        self.refresh_margin = (
+            refresh_margin
+            if refresh_margin is not None
+            else float(os.getenv("GITHUB_APP_TOKEN_REFRESH_MARGIN", "300"))
+        )
+        self.installation_cache_seconds = (
+            installation_cache_seconds
+            if installation_cache_seconds is not None
+            else float(os.getenv("GITHUB_APP_INSTALLATION_CACHE_SECONDS", "3600"))
+        )
+        # Installations whose tokens also serve public-repo fetches
+        self.pool_installations: List[str] = [i for i in pool_installations if i]
+        self._jwt: Optional[str] = None
+        self._jwt_expires_at = 0.0
+        self._tokens: Dict[str, InstallationToken] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._repo_installations: Dict[str, Tuple[float, Optional[str]]] = {}
+        # Pooled installation -> (token checked, covers only public repos)
+        self._pool_checked: Dict[str, Tuple[str, bool]] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_github_client()
+
+    def app_jwt(self) -> str:
+        """RS256 JWT authenticating as the app itself, reused until near expiry."""
+        now = time.time()
+        if self._jwt is None or self._jwt_expires_at - 60 <= now:
+            expires_at = int(now) + APP_JWT_TTL_SECONDS
+            self._jwt = str(
+                jwt.encode(
+                    {
+                        "iat": int(now) - APP_JWT_CLOCK_DRIFT_SECONDS,
+                        "exp": expires_at,
+                        "iss": str(self.app_id),
+                    },
+                    self.private_key,
+                    algorithm="RS256",
+                )
+            )
+            self._jwt_expires_at = expires_at
+        return self._jwt
+
+    def _app_headers(self) -> Dict[str, str]:
+        return {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "Infrasync/1.0",
+            "Authorization": f"Bearer {self.app_jwt()}",
+        }
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """App-authenticated request (unless ``headers`` are given); 5xx and
+        network errors are retried per host."""
+
+        async def attempt() -> httpx.Response:
+            # Fresh headers per attempt: the app JWT may be renewed in between
+            response = await self.client.request(
+                method, url, headers=headers or self._app_headers(), params=params
+            )
+            if response.status_code in RETRYABLE_STATUS:
+                response.raise_for_status()
+            return response
+
+        return await call_with_resilience(httpx.URL(url).host, attempt)
+
+    def _cached_token(self, installation_id: str) -> Optional[str]:
+        cached = self._tokens.get(installation_id)
+        if cached and cached.expires_at - self.refresh_margin > time.time():
+            return cached.token
+        return None
+
+    async def installation_token(self, installation_id: str) -> str:
+        installation_id = str(installation_id)
+        token = self._cached_token(installation_id)
+        if token:
+            return token
+        lock = self._locks.setdefault(installation_id, asyncio.Lock())
+        async with lock:
+            # Another caller may have minted it while we waited
+            token = self._cached_token(installation_id)
+            if token:
+                return token
+            response = await self._request(
+                "POST",
+                f"{self.base_url}/app/installations/{installation_id}/access_tokens",
+            )
+            response.raise_for_status()
+            data = response.json()
+            expires_at = datetime.fromisoformat(
+                data["expires_at"].replace("Z", "+00:00")
+            ).timestamp()
+            self._tokens[installation_id] = InstallationToken(data["token"], expires_at)
+            logger.info(
+                f"(github_app): Minted token for installation {installation_id}"
+            )
+            return str(data["token"])
+
+    async def installation_for_repo(self, repo: str) -> Optional[str]:
+        """Installation id covering ``repo``, or None if the app isn't installed."""
+        key = repo.strip().lower()
+        now = time.time()
+        cached = self._repo_installations.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        response = await self._request(
+            "GET", f"{self.base_url}/repos/{key}/installation"
+        )
+        installation_id: Optional[str] = None
+        if response.status_code != 404:
+            response.raise_for_status()
+            installation_id = str(response.json()["id"])
+        # Misses are remembered briefly so a new installation is picked up soon
+        ttl = self.installation_cache_seconds if installation_id else 300
+        self._repo_installations[key] = (now + ttl, installation_id)
+        return installation_id
+
+    async def token_for_repo(self, repo: str) -> Optional[str]:
+        installation_id = await self.installation_for_repo(repo)
+        if installation_id is None:
+            return None
+        return await self.installation_token(installation_id)
+
+    async def covers_private_repos(self, token: str) -> bool:
+        """Whether the installation behind ``token`` can read any private repo."""
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "Infrasync/1.0",
+            "Authorization": authorization_header(token),
+        }
+        page = 1
+        while True:
+            response = await self._request(
+                "GET",
+                f"{self.base_url}/installation/repositories",
+                headers=headers,
+                params={"per_page": 100, "page": page},
+            )
+            response.raise_for_status()
+            repos = response.json().get("repositories") or []
+            if any(repo.get("private", True) for repo in repos):
+                return True
+            if len(repos) < 100:
+                return False
+            page += 1
+
+    async def refresh_pool(self, pool: GitHubTokenPool) -> None:
+        """Put current tokens of the pooled installations into ``pool``.
+
+        The pool serves token-less fetches, including the public demo, so an
+        installation only joins while every repository it covers is public.
+        Each minted token is checked once.
+        """
+        for installation_id in self.pool_installations:
+            try:
+                token = await self.installation_token(installation_id)
+                checked = self._pool_checked.get(installation_id)
+                if checked is None or checked[0] != token:
+                    checked = (token, not await self.covers_private_repos(token))
+                    self._pool_checked[installation_id] = checked
+                    if not checked[1]:
+                        logger.error(
+                            f"(github_app): Installation {installation_id} covers "
+                            f"private repositories; not pooling its token"
+                        )
+                public = checked[1]
+            except Exception as e:
+                logger.error(
+                    f"(github_app): Cannot mint token for installation "
+                    f"{installation_id}: {e}"
+                )
+                continue
+            if public:
+                pool.set_installation_token(installation_id, token)
+            else:
+                pool.remove_installation_token(installation_id)
+
+
+def github_app_from_env() -> Optional[GitHubApp]:
+    """GitHub App from GITHUB_APP_ID and GITHUB_APP_PRIVATE_KEY(_PATH), if set."""
+    app_id = os.getenv("GITHUB_APP_ID")
+    private_key = os.getenv("GITHUB_APP_PRIVATE_KEY", "").replace("\\n", "\n")
+    key_path = os.getenv("GITHUB_APP_PRIVATE_KEY_PATH")
+    if not private_key and key_path:
+        with open(key_path) as f:
+            private_key = f.read()
+    if not app_id or not private_key:
+        return None
+    pool_installations = os.getenv("GITHUB_APP_POOL_INSTALLATIONS", "")
+    return GitHubApp(
+        app_id,
+        private_key,
+        pool_installations=[i.strip() for i in pool_installations.split(",")],
+    )
+
+
+_github_app: Optional[GitHubApp] = None
+_github_app_loaded = False
+
+
+def get_github_app() -> Optional[GitHubApp]:
+    global _github_app, _github_app_loaded
+    if not _github_app_loaded:
+        _github_app = github_app_from_env()
+        _github_app_loaded = True
+    return _github_app
@@ -0,0 +1,166 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept alongside the body so a 304 can be replayed faithfully
+CACHED_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]], token: Optional[str]) -> str:
+    """Key a response by URL, query params and the (hashed) auth token."""
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    raw = f"{url}?{query}|{token or ''}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Bounded LRU store of validator-bearing GitHub responses."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class InMemoryResponseCache(ResponseCache):
+    def __init__(self, max_entries: int = 1000) -> None:
+        super().__init__(max_entries)
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk cache that survives between warm invocations of the same container."""
+
+    def __init__(self, path: str, max_entries: int = 1000) -> None:
+        super().__init__(max_entries)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, "
+            "last_modified TEXT, headers TEXT NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, headers FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+        return CachedResponse(
+            body=row[0], etag=row[1], last_modified=row[2], headers=json.loads(row[3])
+        )
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, etag, last_modified, headers, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.body,
+                    entry.etag,
+                    entry.last_modified,
+                    json.dumps(entry.headers),
+                    time.time(),
+                ),
+            )
+            # Evict least recently used rows beyond the bound
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            )
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_loaded = False
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Create the cache selected by GITHUB_CACHE_BACKEND (memory, sqlite or none)."""
+    backend = os.getenv("GITHUB_CACHE_BACKEND", "memory").lower()
+    max_entries = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "1000"))
+    if backend == "memory":
+        return InMemoryResponseCache(max_entries)
+    if backend == "sqlite":
+        path = os.getenv("GITHUB_CACHE_PATH", "/tmp/infrasync-github-cache.sqlite3")
+        return SQLiteResponseCache(path, max_entries)
+    if backend not in ("none", "off", "false", ""):
+        logger.warning(f"Unknown GITHUB_CACHE_BACKEND '{backend}', caching disabled")
+    return None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    global _response_cache, _response_cache_loaded
+    if not _response_cache_loaded:
+        _response_cache = build_response_cache()
+        _response_cache_loaded = True
+    return _response_cache
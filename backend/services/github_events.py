@@ -0,0 +1,150 @@
+import os
+import hmac
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Webhook events that can change what a digest reports
+SUPPORTED_EVENTS = frozenset(["push", "pull_request"])
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check an ``X-Hub-Signature-256`` header against the raw request body."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+def is_merge_event(event_type: str, payload: Dict[str, Any]) -> bool:
+    """True for merged pull requests and pushes to the default branch."""
+    if event_type == "pull_request":
+        pull_request = payload.get("pull_request") or {}
+        return payload.get("action") == "closed" and bool(pull_request.get("merged"))
+    if event_type == "push":
+        default_branch = (payload.get("repository") or {}).get("default_branch")
+        return bool(default_branch) and payload.get("ref") == (
+            f"refs/heads/{default_branch}"
+        )
+    return False
+
+
+@dataclass
+class GitHubEvent:
+    delivery_id: str
+    event_type: str
+    repo: str
+    action: Optional[str]
+    received_at: float
+    payload: Dict[str, Any]
+
+
+class GitHubEventStore:
+    """Append-only, bounded SQLite log of received webhook events.
+
+    Deliveries are keyed by ``X-GitHub-Delivery`` so redeliveries are
+    recognised and not acted on twice. Debounced on_merge digests read it
+    back to skip monitors whose last digest already covers every merge.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "delivery_id TEXT PRIMARY KEY, event_type TEXT NOT NULL, "
+            "repo TEXT NOT NULL, action TEXT, received_at REAL NOT NULL, "
+            "payload TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS events_repo_received_at "
+            "ON events(repo, received_at)"
+        )
+        self._conn.commit()
+
+    def append(self, event: GitHubEvent) -> bool:
+        """Store ``event``; returns False if the delivery was already recorded."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO events "
+                "(delivery_id, event_type, repo, action, received_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    event.delivery_id,
+                    event.event_type,
+                    event.repo.lower(),
+                    event.action,
+                    event.received_at,
+                    json.dumps(event.payload),
+                ),
+            )
+            inserted = cursor.rowcount > 0
+            if inserted:
+                self._conn.execute(
+                    "DELETE FROM events WHERE delivery_id IN ("
+                    "SELECT delivery_id FROM events ORDER BY rowid DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+        return inserted
+
+    def events_since(self, repo: str, since: float) -> List[GitHubEvent]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT delivery_id, event_type, repo, action, received_at, payload "
+                "FROM events WHERE repo = ? AND received_at >= ? "
+                "ORDER BY received_at, rowid",
+                (repo.lower(), since),
+            ).fetchall()
+        return [
+            GitHubEvent(
+                delivery_id=row[0],
+                event_type=row[1],
+                repo=row[2],
+                action=row[3],
+                received_at=row[4],
+                payload=json.loads(row[5]),
+            )
+            for row in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0])
+
+
+def event_from_payload(
+    delivery_id: str, event_type: str, payload: Dict[str, Any]
+) -> GitHubEvent:
+    return GitHubEvent(
+        delivery_id=delivery_id,
+        event_type=event_type,
+        repo=(payload.get("repository") or {}).get("full_name", ""),
+        action=payload.get("action"),
+        received_at=time.time(),
+        payload=payload,
+    )
+
+
+_event_store: Optional[GitHubEventStore] = None
+
+
+def get_event_store() -> GitHubEventStore:
+    global _event_store
+    if _event_store is None:
+        _event_store = GitHubEventStore(
+            os.getenv(
+                "GITHUB_EVENT_STORE_PATH", "/tmp/infrasync-github-events.sqlite3"
+            ),
+            int(os.getenv("GITHUB_EVENT_STORE_MAX_ENTRIES", "10000")),
+        )
+    return _event_store
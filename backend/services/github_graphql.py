@@ -0,0 +1,154 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# One page of default-branch history; endCursor continues it
+HISTORY_PAGE_FRAGMENT = """
+fragment HistoryPage on CommitHistoryConnection {
+  totalCount
+  pageInfo {
+    hasNextPage
+    endCursor
+  }
+  nodes {
+    oid
+    message
+    committedDate
+  }
+}
+"""
+
+# Activity fields fetched for every repository in a batched query
+REPO_ACTIVITY_FRAGMENT = (
+    """
+fragment RepoActivity on Repository {
+  nameWithOwner
+  isPrivate
+  defaultBranchRef {
+    target {
+      ... on Commit {
+        history(since: $since, until: $until, first: 100) {
+          ...HistoryPage
+        }
+      }
+    }
+  }
+}
+"""
+    + HISTORY_PAGE_FRAGMENT
+)
+
+# Further history of one repository, for windows with more than a page
+HISTORY_QUERY = (
+    """
+query History(
+  $owner: String!
+  $name: String!
+  $since: GitTimestamp!
+  $until: GitTimestamp!
+  $after: String!
+) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(since: $since, until: $until, first: 100, after: $after) {
+            ...HistoryPage
+          }
+        }
+      }
+    }
+  }
+  rateLimit { cost remaining resetAt }
+}
+"""
+    + HISTORY_PAGE_FRAGMENT
+)
+
+# Search alias suffix -> (issue type, date qualifier), mirroring the REST queries
+SEARCH_COUNTS: Dict[str, Tuple[str, str]] = {
+    "prs_opened": ("pr", "created"),
+    "prs_closed": ("pr", "closed"),
+    "issues_opened": ("issue", "created"),
+    "issues_closed": ("issue", "closed"),
+}
+
+
+def split_repo(repo: str) -> Tuple[str, str]:
+    try:
+        owner, repo_name = repo.strip().split("/")
+    except ValueError:
+        raise ValueError(
+            f"Invalid repo format: '{repo}'. Expected format: 'owner/repo'"
+        )
+    return owner, repo_name
+
+
+def build_activity_query(repos: List[str], since: str, until: str) -> str:
+    """Build one aliased query covering metadata, counts and commits of ``repos``.
+
+    Activity is limited to ``since..until``, both ends inclusive.
+    """
+    selections: List[str] = []
+    for i, repo in enumerate(repos):
+        owner, repo_name = split_repo(repo)
+        selections.append(
+            f"r{i}: repository(owner: {json.dumps(owner)}, "
+            f"name: {json.dumps(repo_name)}) {{ ...RepoActivity }}"
+        )
+        for suffix, (kind, qualifier) in SEARCH_COUNTS.items():
+            search = (
+                f"repo:{owner}/{repo_name} type:{kind} {qualifier}:{since}..{until}"
+            )
+            selections.append(
+                f"r{i}_{suffix}: search(query: {json.dumps(search)}, type: ISSUE) "
+                "{ issueCount }"
+            )
+    body = "\n  ".join(selections)
+    return (
+        "query RepoActivity($since: GitTimestamp!, $until: GitTimestamp!) {\n  "
+        f"{body}\n  rateLimit {{ cost remaining resetAt }}\n}}\n"
+        f"{REPO_ACTIVITY_FRAGMENT}"
+    )
+
+
+def parse_history(
+    repository: Optional[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+    """REST-shaped commits, total count and next-page cursor of ``repository``."""
+    target = ((repository or {}).get("defaultBranchRef") or {}).get("target") or {}
+    history = target.get("history") or {}
+    commits = [
+        {"sha": node.get("oid"), "commit": {"message": node.get("message", "")}}
+        for node in history.get("nodes") or []
+    ]
+    page_info = history.get("pageInfo") or {}
+    cursor = page_info.get("endCursor") if page_info.get("hasNextPage") else None
+    return commits, int(history.get("totalCount", 0) or 0), cursor
+
+
+def parse_activity_response(data: Dict[str, Any], repos: List[str]) -> Dict[str, Any]:
+    """Map a batched query response to the REST-shaped per-repo payload.
+
+    Repositories that GitHub could not resolve are left out of the result.
+    ``history_cursor`` is set when the window has more commits than the page.
+    """
+    results: Dict[str, Any] = {}
+    for i, repo in enumerate(repos):
+        repository = data.get(f"r{i}")
+        if not repository:
+            continue
+        commits, total, cursor = parse_history(repository)
+        counts: Dict[str, int] = {"commits": total}
+        for suffix in SEARCH_COUNTS:
+            search = data.get(f"r{i}_{suffix}") or {}
+            counts[suffix] = int(search.get("issueCount", 0) or 0)
+        results[repo] = {
+            "repository": {
+                "full_name": repository["nameWithOwner"],
+                "private": bool(repository.get("isPrivate", False)),
+            },
+            "summary_counts": counts,
+            "commits": commits,
+            "history_cursor": cursor,
+        }
+    return results
@@ -0,0 +1,196 @@
+import os
+import time
+import random
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import httpx
+from services.metrics import metrics_service
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when a bucket will not refill within the configured max wait."""
+
+
+def token_fingerprint(authorization: Optional[str]) -> str:
+    """Stable, non-reversible label for a token (safe for logs and metrics)."""
+    if not authorization:
+        return "anonymous"
+    return hashlib.sha256(authorization.encode()).hexdigest()[:8]
+
+
+def resource_for(url: str) -> str:
+    """Map a GitHub API URL to the rate limit bucket it draws from."""
+    path = httpx.URL(url).path
+    if path.startswith("/search/"):
+        return "search"
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def is_throttled(response: httpx.Response) -> bool:
+    """True if a 403/429 is a rate limit rather than a permissions error."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    headers = response.headers
+    return (
+        "retry-after" in headers
+        or headers.get("x-ratelimit-remaining") == "0"
+        or "rate limit" in response.text.lower()
+    )
+
+
+@dataclass
+class RateLimitBucket:
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    # Set from Retry-After / secondary limits, independent of the counters
+    blocked_until: float = 0.0
+
+    def wait_time(self, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        if self.remaining is not None and self.remaining <= 0:
+            if now < self.reset_at:
+                wait = max(wait, self.reset_at - now)
+            else:
+                # Window rolled over; counters are unknown until the next response
+                self.remaining = None
+        return wait
+
+
+class RateLimitScheduler:
+    """Tracks core/search/graphql budgets per token and paces requests.
+
+    Requests on an exhausted bucket queue behind a per-bucket lock until the
+    bucket resets (plus jitter). Throttled responses are retried with jittered
+    exponential backoff, honouring Retry-After when GitHub sends it.
+    """
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_backoff: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        jitter: Optional[float] = None,
+    ) -> None:
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else int(os.getenv("GITHUB_RATE_LIMIT_MAX_RETRIES", "3"))
+        )
+        self.base_backoff = (
+            base_backoff
+            if base_backoff is not None
+            else float(os.getenv("GITHUB_RATE_LIMIT_BASE_BACKOFF", "1.0"))
+        )
+        self.max_wait = (
+            max_wait
+            if max_wait is not None
+            else float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+        )
+        self.jitter = (
+            jitter
+            if jitter is not None
+            else float(os.getenv("GITHUB_RATE_LIMIT_JITTER", "1.0"))
+        )
+        self._buckets: Dict[Tuple[str, str], RateLimitBucket] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def bucket(self, token_id: str, resource: str) -> RateLimitBucket:
+        key = (token_id, resource)
+        if key not in self._buckets:
+            self._buckets[key] = RateLimitBucket()
+        return self._buckets[key]
+
+    def remaining(self, token_id: str, resource: str) -> Optional[int]:
+        bucket = self.bucket(token_id, resource)
+        bucket.wait_time(time.time())
+        return bucket.remaining
+
+    async def acquire(self, token_id: str, resource: str) -> None:
+        """Wait until ``resource`` has budget for ``token_id``, then reserve one call."""
+        key = (token_id, resource)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        bucket = self.bucket(token_id, resource)
+        async with lock:
+            wait = bucket.wait_time(time.time())
+            if wait > 0:
+                if wait > self.max_wait:
+                    raise GitHubRateLimitError(
+                        f"GitHub {resource} rate limit exhausted for token "
+                        f"{token_id}; resets in {int(wait)}s"
+                    )
+                wait += random.uniform(0, self.jitter)
+                logger.warning(
+                    f"(github_ratelimit): {resource} bucket empty for {token_id}, "
+                    f"waiting {wait:.1f}s"
+                )
+                await asyncio.sleep(wait)
+                bucket.wait_time(time.time())
+            if bucket.remaining is not None:
+                bucket.remaining -= 1
+
+    def update(self, token_id: str, resource: str, response: httpx.Response) -> None:
+        """Refresh the bucket from X-RateLimit-* headers on any response."""
+        headers = response.headers
+        resource = headers.get("x-ratelimit-resource", resource)
+        bucket = self.bucket(token_id, resource)
+        try:
+            if "x-ratelimit-limit" in headers:
+                bucket.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-remaining" in headers:
+                bucket.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-reset" in headers:
+                bucket.reset_at = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            logger.warning(
+                f"(github_ratelimit): Malformed rate limit headers: {headers}"
+            )
+            return
+        if bucket.remaining is not None:
+            metrics_service.set_github_rate_limit(
+                token_id, resource, bucket.remaining, bucket.limit, bucket.reset_at
+            )
+
+    def should_retry(
+        self, token_id: str, resource: str, response: httpx.Response, attempt: int
+    ) -> bool:
+        """Block the bucket after a throttled response; True if worth retrying.
+
+        The next ``acquire`` on the bucket then waits out the backoff.
+        """
+        # A plain 403 (permissions) is not worth retrying
+        if not is_throttled(response) or attempt >= self.max_retries:
+            return False
+        headers = response.headers
+        now = time.time()
+        if "retry-after" in headers:
+            try:
+                delay = float(headers["retry-after"])
+            except ValueError:
+                delay = self.base_backoff
+        elif headers.get("x-ratelimit-remaining") == "0":
+            delay = max(0.0, float(headers.get("x-ratelimit-reset", now)) - now)
+        else:
+            # Secondary rate limit without guidance: exponential backoff
+            delay = self.base_backoff * (2**attempt)
+        if delay > self.max_wait:
+            return False
+        logger.warning(
+            f"(github_ratelimit): {response.status_code} on {resource} for "
+            f"{token_id}, retrying in {delay:.1f}s (attempt {attempt + 1})"
+        )
+        self.bucket(token_id, resource).blocked_until = now + delay
+        return True
+
+
+# Global scheduler shared by every GitHubService instance
+github_rate_limiter = RateLimitScheduler()
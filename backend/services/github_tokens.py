@@ -0,0 +1,141 @@
+import os
+import re
+import time
+import logging
+from typing import Collection, Dict, List, Optional, Sequence
+from services.metrics import metrics_service
+from services.github_ratelimit import (
+    RateLimitScheduler,
+    github_rate_limiter,
+    token_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def authorization_header(token: str) -> str:
+    return f"token {token}"
+
+
+class GitHubTokenPool:
+    """Rotates public-repo requests across several GitHub tokens.
+
+    Each request goes to the usable token with the most remaining budget for
+    its resource, as tracked by the rate limit scheduler; tokens not seen yet
+    count as full and ties rotate round-robin. Tokens that fail
+    authentication are quarantined for ``quarantine_seconds``. GitHub App
+    installation tokens can join the pool and are replaced as they rotate.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[str],
+        scheduler: Optional[RateLimitScheduler] = None,
+        quarantine_seconds: Optional[float] = None,
+    ) -> None:
+        self._static: List[str] = list(dict.fromkeys(t for t in tokens if t))
+        self._installations: Dict[str, str] = {}
+        self.scheduler = scheduler or github_rate_limiter
+        self.quarantine_seconds = (
+            quarantine_seconds
+            if quarantine_seconds is not None
+            else float(os.getenv("GITHUB_TOKEN_QUARANTINE_SECONDS", "900"))
+        )
+        self._quarantined_until: Dict[str, float] = {}
+        self._next = 0
+
+    @property
+    def tokens(self) -> List[str]:
+        return self._static + [
+            t for t in self._installations.values() if t not in self._static
+        ]
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def set_installation_token(self, installation_id: str, token: str) -> None:
+        """Add or replace the current token of a GitHub App installation."""
+        previous = self._installations.get(installation_id)
+        if previous and previous != token:
+            self._quarantined_until.pop(previous, None)
+        self._installations[installation_id] = token
+
+    def remove_installation_token(self, installation_id: str) -> None:
+        token = self._installations.pop(installation_id, None)
+        if token:
+            self._quarantined_until.pop(token, None)
+
+    def token_id(self, token: str) -> str:
+        """Fingerprint used by the scheduler and metrics for ``token``."""
+        return token_fingerprint(authorization_header(token))
+
+    def is_quarantined(self, token: str, now: Optional[float] = None) -> bool:
+        until = self._quarantined_until.get(token)
+        if until is None:
+            return False
+        if until <= (now if now is not None else time.time()):
+            del self._quarantined_until[token]
+            metrics_service.set_github_token_quarantined(self.token_id(token), False)
+            logger.info(f"(github_tokens): Token {self.token_id(token)} back in pool")
+            return False
+        return True
+
+    def available(self) -> List[str]:
+        now = time.time()
+        return [t for t in self.tokens if not self.is_quarantined(t, now)]
+
+    def choose(self, resource: str, exclude: Collection[str] = ()) -> Optional[str]:
+        """Pick the usable token with the most ``resource`` budget left."""
+        now = time.time()
+        best: Optional[str] = None
+        best_score = 0.0
+        tokens = self.tokens
+        count = len(tokens)
+        for offset in range(count):
+            token = tokens[(self._next + offset) % count]
+            if token in exclude or self.is_quarantined(token, now):
+                continue
+            bucket = self.scheduler.bucket(self.token_id(token), resource)
+            wait = bucket.wait_time(now)
+            if wait > 0:
+                # Exhausted or backing off: only if nothing else is usable
+                score = -wait
+            elif bucket.remaining is None:
+                score = float("inf")
+            else:
+                score = float(bucket.remaining)
+            if best is None or score > best_score:
+                best, best_score = token, score
+        if count:
+            self._next = (self._next + 1) % count
+        return best
+
+    def record(self, token: str, status_code: int) -> None:
+        metrics_service.record_github_token_request(self.token_id(token), status_code)
+
+    def quarantine(self, token: str, status_code: int) -> None:
+        token_id = self.token_id(token)
+        self._quarantined_until[token] = time.time() + self.quarantine_seconds
+        metrics_service.set_github_token_quarantined(token_id, True)
+        logger.warning(
+            f"(github_tokens): Token {token_id} returned {status_code}, "
+            f"quarantined for {int(self.quarantine_seconds)}s"
+        )
+
+
+def token_pool_from_env() -> GitHubTokenPool:
+    """Pool of GITHUB_TOKENS (comma or whitespace separated) plus GITHUB_TOKEN."""
+    tokens = re.split(r"[\s,]+", os.getenv("GITHUB_TOKENS", "").strip())
+    tokens.append(os.getenv("GITHUB_TOKEN", ""))
+    return GitHubTokenPool(tokens)
+
+
+_token_pool: Optional[GitHubTokenPool] = None
+
+
+def get_token_pool() -> GitHubTokenPool:
+    global _token_pool
+    if _token_pool is None:
+        _token_pool = token_pool_from_env()
+        logger.info(f"(github_tokens): {len(_token_pool)} tokens in pool")
+    return _token_pool
@@ -1,8 +1,18 @@
 import os
 import logging
+import openai
 from openai import AsyncOpenAI
-from typing import Dict, Any
-from utils.prompts import build_summary_prompt
+from datetime import datetime
+from typing import Dict, Any, Optional
+from utils.prompts import build_summary_prompt, describe_window
+from services.resilience import call_with_resilience
+
+# OpenAI errors worth retrying; retries are left to the resilience layer
+OPENAI_TRANSIENT_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +34,7 @@ class GPTService:
                 raise ValueError(
                     "OPENAI_API_KEY environment variable is required when OPENAI_ENABLED is true."
                 )
-            self.client = AsyncOpenAI(api_key=api_key)
+            self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
         else:
             logger.info("OPENAI_ENABLED is false — GPT summaries will be skipped.")
 
@@ -33,8 +43,15 @@ class GPTService:
         summary_counts: Dict[str, Any],
         grouped_commits: Dict[str, list[str]],
         repo_name: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
     ) -> str:
-        """Generate a concise summary of repository activity using GPT."""
+        """Generate a concise summary of repository activity using GPT.
+
+        ``since``/``until`` is the digest window, worded into the prompt and
+        the no-activity message (the last 24 hours if not given).
+        """
+        window = describe_window(since, until)
         try:
             # Check if there's any meaningful activity to summarize
             total_activity = (
@@ -69,7 +86,7 @@ class GPTService:
 
 *🔥 Highlights:*
 
-    📭 No activity detected in the last 24 hours
+    📭 No activity detected in {window}
 """
 
             # Build commit highlights only if there are meaningful commits
@@ -82,6 +99,12 @@ class GPTService:
                 "perf": "_⚡️ Performance:_",
                 "other": "_📦 Other Changes:_",
             }
+            # Categories added through COMMIT_CATEGORIES get a plain header
+            for category in grouped_commits:
+                if category not in commit_categories:
+                    commit_categories[category] = (
+                        f"_{category.replace('_', ' ').title()}:_"
+                    )
 
             meaningful_categories = 0
             for category, header in commit_categories.items():
@@ -105,7 +128,7 @@ class GPTService:
 
 *🔥 Highlights:*
 
-    📭 No activity detected in the last 24 hours
+    📭 No activity detected in {window}
 """
 
             grouped_highlights = "\n".join(lines)
@@ -114,22 +137,26 @@ class GPTService:
                 logger.info(
                     f"Calling OpenAI API for {repo_name} with {meaningful_categories} meaningful categories"
                 )
-                prompt = build_summary_prompt(grouped_highlights)
+                prompt = build_summary_prompt(grouped_highlights, window)
                 logger.info(
                     f"Generated prompt for {repo_name} (first 100 chars): {prompt[:100]}"
                 )
 
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that creates concise summaries of GitHub repository activity.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    max_tokens=self.max_tokens,
-                    temperature=0.7,
+                response = await call_with_resilience(
+                    "api.openai.com",
+                    lambda: self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are a helpful assistant that creates concise summaries of GitHub repository activity.",
+                            },
+                            {"role": "user", "content": prompt},
+                        ],
+                        max_tokens=self.max_tokens,
+                        temperature=0.7,
+                    ),
+                    retry_on=OPENAI_TRANSIENT_ERRORS,
                 )
                 content = response.choices[0].message.content
                 raw_summary: str = content.strip() if content is not None else ""
@@ -0,0 +1,60 @@
+import os
+import logging
+from typing import Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Application-scoped client shared by every GitHubService instance
+_github_client: Optional[httpx.AsyncClient] = None
+
+
+def github_api_url() -> str:
+    """REST base URL; GITHUB_API_URL points at GitHub Enterprise or a stand-in."""
+    return os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("GITHUB_HTTP2", "true").lower() not in ("1", "true", "yes", "y"):
+        return False
+    try:
+        import h2  # type: ignore # noqa: F401
+    except ImportError:
+        logger.warning(
+            "GITHUB_HTTP2 is enabled but 'h2' is not installed; using HTTP/1.1"
+        )
+        return False
+    return True
+
+
+def build_github_client() -> httpx.AsyncClient:
+    """Create a connection-pooled client configured from the environment."""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("GITHUB_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("GITHUB_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("GITHUB_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+    timeout = httpx.Timeout(float(os.getenv("GITHUB_HTTP_TIMEOUT", "10")))
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=_http2_enabled())
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """Return the shared GitHub client, creating it lazily outside the lifespan."""
+    global _github_client
+    if _github_client is None or _github_client.is_closed:
+        _github_client = build_github_client()
+    return _github_client
+
+
+async def init_github_client() -> httpx.AsyncClient:
+    client = get_github_client()
+    logger.info("(http_client): GitHub HTTP client initialized")
+    return client
+
+
+async def close_github_client() -> None:
+    global _github_client
+    if _github_client is not None and not _github_client.is_closed:
+        await _github_client.aclose()
+        logger.info("(http_client): GitHub HTTP client closed")
+    _github_client = None
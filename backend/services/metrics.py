@@ -8,7 +8,7 @@ from prometheus_client import (  # type: ignore
     CollectorRegistry,
 )
 from functools import wraps
-from typing import Any, Callable, TypeVar, Awaitable
+from typing import Any, Callable, Optional, TypeVar, Awaitable
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +81,62 @@ github_api_errors_total = Counter(
     registry=registry,
 )
 
+github_cache_requests_total = Counter(
+    "github_cache_requests_total",
+    "GitHub conditional request cache lookups",
+    ["result"],
+    registry=registry,
+)
+
+dashboard_cache_requests_total = Counter(
+    "dashboard_cache_requests_total",
+    "Dashboard metrics response cache lookups",
+    ["result"],
+    registry=registry,
+)
+
+github_rate_limit_remaining = Gauge(
+    "github_rate_limit_remaining",
+    "Remaining GitHub API budget per token and resource",
+    ["token", "resource"],
+    registry=registry,
+)
+
+github_rate_limit_limit = Gauge(
+    "github_rate_limit_limit",
+    "GitHub API budget per window per token and resource",
+    ["token", "resource"],
+    registry=registry,
+)
+
+github_rate_limit_reset_timestamp = Gauge(
+    "github_rate_limit_reset_timestamp",
+    "Unix time at which the GitHub API budget resets",
+    ["token", "resource"],
+    registry=registry,
+)
+
+github_token_requests_total = Counter(
+    "github_token_requests_total",
+    "GitHub API requests per pooled token and status class",
+    ["token", "status"],
+    registry=registry,
+)
+
+github_token_quarantined = Gauge(
+    "github_token_quarantined",
+    "Whether a pooled GitHub token is currently quarantined (1) or usable (0)",
+    ["token"],
+    registry=registry,
+)
+
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state",
+    "Outbound circuit breaker state per host (0 closed, 1 half-open, 2 open)",
+    ["host"],
+    registry=registry,
+)
+
 # Rate limiting metrics
 rate_limit_exceeded_total = Counter(
     "rate_limit_exceeded_total",
@@ -165,6 +221,47 @@ class MetricsService:
         """Record GitHub API error metrics"""
         github_api_errors_total.labels(error_type=error_type).inc()
 
+    def record_github_cache(self, result: str) -> None:
+        """Record a GitHub response cache hit (304) or miss"""
+        github_cache_requests_total.labels(result=result).inc()
+
+    def record_dashboard_cache(self, result: str) -> None:
+        """Record a dashboard metrics cache hit, miss or 304"""
+        dashboard_cache_requests_total.labels(result=result).inc()
+
+    def set_github_rate_limit(
+        self,
+        token: str,
+        resource: str,
+        remaining: int,
+        limit: Optional[int],
+        reset_at: float,
+    ) -> None:
+        """Set the current GitHub rate limit budget for a token"""
+        github_rate_limit_remaining.labels(token=token, resource=resource).set(
+            remaining
+        )
+        if limit is not None:
+            github_rate_limit_limit.labels(token=token, resource=resource).set(limit)
+        github_rate_limit_reset_timestamp.labels(token=token, resource=resource).set(
+            reset_at
+        )
+
+    def record_github_token_request(self, token: str, status_code: int) -> None:
+        """Record a GitHub request made with a pooled token"""
+        github_token_requests_total.labels(
+            token=token, status=f"{status_code // 100}xx"
+        ).inc()
+
+    def set_github_token_quarantined(self, token: str, quarantined: bool) -> None:
+        """Mark a pooled GitHub token as quarantined or usable"""
+        github_token_quarantined.labels(token=token).set(1 if quarantined else 0)
+
+    def set_circuit_breaker_state(self, host: str, state: str) -> None:
+        """Set the circuit breaker state for an outbound host"""
+        value = {"closed": 0, "half_open": 1, "open": 2}.get(state, 0)
+        circuit_breaker_state.labels(host=host).set(value)
+
     def record_rate_limit_violation(self, endpoint: str, ip: str) -> None:
         """Record rate limit violation metrics"""
         rate_limit_exceeded_total.labels(endpoint=endpoint, ip=ip).inc()
@@ -1,10 +1,11 @@
 from models.monitor import Monitor, MonitorCreate
 from uuid import uuid4
 from datetime import datetime
-from supabase import create_client, Client
 import logging
-from config import SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL
-from services.github import GitHubService
+from services.db import SupabaseClient, execute, get_supabase
+from services.dashboard_cache import dashboard_cache
+from services.ownership import monitor_owners
+from services.github import GitHubService, format_timestamp
 from typing import Optional, List, Any, Dict, cast
 from pydantic import HttpUrl
 
@@ -13,24 +14,21 @@ logger = logging.getLogger(__name__)
 
 
 class MonitorService:
-    def __init__(self) -> None:
-        if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-            raise ValueError("Supabase environment variables not set")
-        self.client: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    def __init__(self, client: Optional[SupabaseClient] = None) -> None:
+        self.client: SupabaseClient = client or get_supabase()
         self.github_service = GitHubService()
 
     async def get_by_repo_and_webhook(
         self, repo: str, webhook_url: str
     ) -> Optional[Monitor]:
         try:
-            result = (
+            result = await execute(
                 self.client.table("monitors")
                 .select("*")
                 .eq("repo", repo)
                 .eq("webhook_url", webhook_url)
                 .eq("deleted", False)
                 .maybe_single()
-                .execute()
             )
             if result is not None and result.data:
                 return Monitor(**result.data)
@@ -39,6 +37,38 @@ class MonitorService:
             logger.error(f"Error in get_by_repo_and_webhook: {e}")
             return None
 
+    async def get_monitor(self, monitor_id: str) -> Optional[Monitor]:
+        """Active monitor by id, or None if it was deleted."""
+        result = await execute(
+            self.client.table("monitors")
+            .select("*")
+            .eq("id", monitor_id)
+            .eq("deleted", False)
+            .maybe_single()
+        )
+        if result is not None and result.data:
+            return Monitor(**result.data)
+        return None
+
+    async def list_by_repo(
+        self, repo: str, frequency: Optional[str] = None
+    ) -> List[Monitor]:
+        """Active monitors on ``repo`` across all orgs, optionally by frequency."""
+        # Case-insensitive exact match: escape LIKE wildcards in the name
+        pattern = repo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = (
+            self.client.table("monitors")
+            .select("*")
+            .ilike("repo", pattern)
+            .eq("deleted", False)
+        )
+        if frequency:
+            query = query.eq("frequency", frequency)
+        result = await execute(query)
+        if not result or not result.data:
+            return []
+        return [Monitor(**row) for row in result.data]
+
     async def create_monitor(
         self, data: MonitorCreate, created_by: str, github_token: Optional[str] = None
     ) -> Monitor:
@@ -76,6 +106,7 @@ class MonitorService:
             created_at=datetime.utcnow(),
             is_private=is_private,
             created_by=created_by,
+            email=data.email,
         )
         monitor_dict = {
             "id": str(monitor.id),
@@ -88,18 +119,21 @@ class MonitorService:
             "is_private": is_private,
             "created_by": created_by,
         }
-        insert_result = self.client.table("monitors").insert(monitor_dict).execute()
+        if monitor.email:
+            monitor_dict["email"] = monitor.email
+        insert_result = await execute(
+            self.client.table("monitors").insert(monitor_dict)
+        )
         if not insert_result or insert_result.data is None:
             raise Exception(f"Insert failed: {insert_result}")
         return monitor
 
     async def list_monitors(self, org_id: str) -> List[Monitor]:
-        result = (
+        result = await execute(
             self.client.table("monitors")
             .select("*")
             .eq("org_id", org_id)
             .eq("deleted", False)
-            .execute()
         )
         if not result or not result.data:
             return []
@@ -109,14 +143,13 @@ class MonitorService:
         self, monitor_id: str, org_id: str
     ) -> Optional[Dict[str, Any]]:
         # Fetch the monitor first
-        result = (
+        result = await execute(
             self.client.table("monitors")
             .select("*")
             .eq("id", monitor_id)
             .eq("org_id", org_id)
             .eq("deleted", False)
             .maybe_single()
-            .execute()
         )
         if not result or not result.data:
             logger.warning(
@@ -125,13 +158,14 @@ class MonitorService:
             return None
         monitor_data: Dict[str, Any] = result.data
         # Soft delete the monitor
-        del_result = (
+        del_result = await execute(
             self.client.table("monitors")
             .update({"deleted": True, "deleted_at": datetime.utcnow().isoformat()})
             .eq("id", monitor_id)
             .eq("org_id", org_id)
-            .execute()
         )
+        monitor_owners.invalidate(monitor_id)
+        dashboard_cache.invalidate_monitor(monitor_id, org_id)
         if del_result and del_result.data:
             logger.info(f"Soft deleted monitor {monitor_id} for org {org_id}")
             return monitor_data
@@ -141,13 +175,12 @@ class MonitorService:
     async def update_monitor_frequency(
         self, monitor_id: str, new_freq: str, org_id: str
     ) -> bool:
-        result = (
+        result = await execute(
             self.client.table("monitors")
             .update({"frequency": new_freq})
             .eq("id", monitor_id)
             .eq("org_id", org_id)
             .eq("deleted", False)
-            .execute()
         )
         if result and result.data:
             logger.info(
@@ -156,3 +189,26 @@ class MonitorService:
             return True
         logger.warning(f"Monitor {monitor_id} not found or not updated in org {org_id}")
         return False
+
+    async def advance_digest_cursor(
+        self, monitor_id: str, until: datetime, last_commit_sha: Optional[str]
+    ) -> bool:
+        """Move the monitor's high-water mark forward after a delivered digest.
+
+        The update only applies while the stored cursor is older than ``until``,
+        so a retried or late run can never move it backwards.
+        """
+        cursor = format_timestamp(until)
+        update: Dict[str, Any] = {"last_digest_until": cursor}
+        if last_commit_sha:
+            update["last_commit_sha"] = last_commit_sha
+        result = await execute(
+            self.client.table("monitors")
+            .update(update)
+            .eq("id", monitor_id)
+            .or_(f"last_digest_until.is.null,last_digest_until.lt.{cursor}")
+        )
+        if result and result.data:
+            logger.info(f"Advanced digest cursor of monitor {monitor_id} to {cursor}")
+            return True
+        return False
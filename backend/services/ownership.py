@@ -0,0 +1,64 @@
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+
+class OwnershipCache:
+    """Short-lived monitor id -> org id map for org-scoped lookups.
+
+    Entries expire after ``ttl`` seconds and are dropped as soon as a monitor
+    is deleted or its org disbanded, so a stale entry can only ever deny
+    access for at most ``ttl`` seconds, never grant it to another org.
+    """
+
+    def __init__(
+        self, ttl: Optional[float] = None, max_entries: Optional[int] = None
+    ) -> None:
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else float(os.getenv("MONITOR_OWNERSHIP_CACHE_SECONDS", "60"))
+        )
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else int(os.getenv("MONITOR_OWNERSHIP_CACHE_MAX_ENTRIES", "10000"))
+        )
+        self._owners: Dict[str, Tuple[float, str]] = {}
+
+    def get(self, monitor_id: str) -> Optional[str]:
+        entry = self._owners.get(str(monitor_id))
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._owners[str(monitor_id)]
+            return None
+        return entry[1]
+
+    def set(self, monitor_id: str, org_id: str) -> None:
+        if self.ttl <= 0:
+            return
+        key = str(monitor_id)
+        self._owners.pop(key, None)
+        if len(self._owners) >= self.max_entries:
+            # Dicts keep insertion order: the first entry is the oldest
+            del self._owners[next(iter(self._owners))]
+        self._owners[key] = (time.monotonic() + self.ttl, str(org_id))
+
+    def invalidate(self, monitor_id: str) -> None:
+        self._owners.pop(str(monitor_id), None)
+
+    def invalidate_org(self, org_id: str) -> None:
+        org_id = str(org_id)
+        for key in [k for k, (_, v) in self._owners.items() if v == org_id]:
+            del self._owners[key]
+
+    def clear(self) -> None:
+        self._owners.clear()
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+# Shared by the monitor, digest and org services
+monitor_owners = OwnershipCache()
@@ -0,0 +1,244 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+import httpx
+from services.metrics import metrics_service
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upstream statuses worth retrying; 429/403 throttling is paced elsewhere
+RETRYABLE_STATUS = frozenset([500, 502, 503, 504])
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the caller's overall deadline passes before or during a call."""
+
+
+def _env_float(name: str, default: str) -> float:
+    return float(os.getenv(name, default))
+
+
+@dataclass
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff."""
+
+    max_attempts: int = field(
+        default_factory=lambda: int(os.getenv("RESILIENCE_MAX_ATTEMPTS", "3"))
+    )
+    base_delay: float = field(
+        default_factory=lambda: _env_float("RESILIENCE_BASE_DELAY", "0.5")
+    )
+    max_delay: float = field(
+        default_factory=lambda: _env_float("RESILIENCE_MAX_DELAY", "8")
+    )
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one host.
+
+    After ``failure_threshold`` transient failures in a row the circuit opens
+    and calls fail fast for ``reset_timeout`` seconds; then one trial call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = (
+            failure_threshold
+            if failure_threshold is not None
+            else int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        )
+        self.reset_timeout = (
+            reset_timeout
+            if reset_timeout is not None
+            else _env_float("CIRCUIT_RESET_TIMEOUT", "30")
+        )
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"(resilience): Circuit for {self.host} is now {state}")
+        self.state = state
+        metrics_service.set_circuit_breaker_state(self.host, state)
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """Give back a half-open trial that was never attempted."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_in_flight = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = {"state": self.state, "failures": self.failures}
+        if self.state == self.OPEN:
+            snapshot["retry_in"] = round(
+                max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1
+            )
+        return snapshot
+
+
+class CircuitBreakerRegistry:
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host)
+        return self._breakers[host]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {host: b.snapshot() for host, b in sorted(self._breakers.items())}
+
+    def any_open(self) -> bool:
+        return any(b.state == CircuitBreaker.OPEN for b in self._breakers.values())
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+
+# Shared by every outbound client, keyed by host
+circuit_breakers = CircuitBreakerRegistry()
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "resilience_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound every resilient call made inside the block to ``seconds`` overall."""
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Network errors, timeouts and 5xx responses are worth retrying."""
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return False
+
+
+async def call_with_resilience(
+    host: str,
+    fn: Callable[[], Awaitable[T]],
+    policy: Optional[RetryPolicy] = None,
+    retry_on: Tuple[Type[BaseException], ...] = (),
+) -> T:
+    """Run ``fn`` behind the host's circuit breaker, retrying transient errors.
+
+    Retries stop at ``policy.max_attempts`` or when the enclosing
+    ``deadline`` would pass before the next attempt could start.
+    """
+    policy = policy or RetryPolicy()
+    breaker = circuit_breakers.get(host)
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}")
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            breaker.release()
+            raise DeadlineExceeded(f"Deadline exceeded before calling {host}")
+        try:
+            if remaining is None:
+                result = await fn()
+            else:
+                result = await asyncio.wait_for(fn(), remaining)
+        except Exception as e:
+            left = remaining_time()
+            if isinstance(e, asyncio.TimeoutError) and left is not None and left <= 0:
+                # Our own deadline cut the call short; that says nothing
+                # about the host's health
+                breaker.release()
+                raise DeadlineExceeded(f"Deadline exceeded calling {host}") from e
+            transient = is_transient(e) or isinstance(e, retry_on)
+            if not transient:
+                # The host answered; the failure is ours, not its health
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            attempt += 1
+            delay = policy.backoff(attempt - 1)
+            remaining = remaining_time()
+            if attempt >= policy.max_attempts or (
+                remaining is not None and delay >= remaining
+            ):
+                raise
+            logger.warning(
+                f"(resilience): {host} call failed ({type(e).__name__}: {e}), "
+                f"retry {attempt}/{policy.max_attempts - 1} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,75 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls for the same key into one in-flight task.
+
+    Successful results are kept for ``ttl`` seconds (bounded LRU), so callers
+    arriving shortly after the first one also share its result. Failures are
+    never cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1000) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+
+    def _cached(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._results.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._results[key]
+            return False, None
+        self._results.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: T) -> None:
+        if self.ttl <= 0:
+            return
+        self._results[key] = (time.monotonic() + self.ttl, value)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        hit, value = self._cached(key)
+        if hit:
+            logger.info(f"(singleflight): Reusing cached result for {key}")
+            return value  # type: ignore[no-any-return]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            logger.info(f"(singleflight): Joining in-flight call for {key}")
+        else:
+
+            async def run() -> T:
+                try:
+                    result = await fn()
+                    self._store(key, result)
+                    return result
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = asyncio.ensure_future(run())
+            # Keep the exception retrieved even if every caller was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        # Shield so one caller's cancellation doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._results.pop(key, None)
+
+    def clear(self) -> None:
+        self._results.clear()
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+GRANULARITIES: Dict[str, timedelta] = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+def _count(value: Any) -> int:
+    """A metric stored as a number counts as itself, a list by its length."""
+    if isinstance(value, list):
+        return len(value)
+    return int(value or 0)
+
+
+def metric_matrix(
+    rows: Sequence[Dict[str, Any]],
+    fields: Sequence[str],
+    nested: Optional[str] = None,
+) -> np.ndarray:
+    """(rows x fields) int64 matrix; metrics live under ``row[nested]`` if set."""
+    metrics = [row.get(nested) or {} for row in rows] if nested else rows
+    matrix = np.zeros((len(metrics), len(fields)), dtype=np.int64)
+    for j, field in enumerate(fields):
+        column = [m.get(field) or 0 for m in metrics]
+        if any(isinstance(value, list) for value in column):
+            column = [_count(value) for value in column]
+        matrix[:, j] = column
+    return matrix
+
+
+def parse_times(times: Sequence[str]) -> np.ndarray:
+    """UTC ISO timestamps or dates as datetime64[s]; offsets are dropped."""
+    return np.asarray([t[:19] for t in times], dtype="datetime64[s]")
+
+
+def bucket_sums(
+    times: np.ndarray,
+    values: np.ndarray,
+    start: datetime,
+    step: timedelta,
+    count: int,
+) -> np.ndarray:
+    """Sum ``values`` rows into ``count`` buckets of ``step`` from ``start``.
+
+    Rows outside [start, start + count * step) are ignored.
+    """
+    sums = np.zeros((count, values.shape[1]), dtype=np.int64)
+    if len(times) == 0:
+        return sums
+    offsets = times - np.datetime64(start.replace(tzinfo=None), "s")
+    index = offsets // np.timedelta64(int(step.total_seconds()), "s")
+    keep = (index >= 0) & (index < count)
+    np.add.at(sums, index[keep].astype(np.intp), values[keep])
+    return sums
+
+
+def bucket_rows(
+    rows: Sequence[Dict[str, Any]],
+    time_key: str,
+    fields: Sequence[str],
+    start: datetime,
+    step: timedelta,
+    count: int,
+    nested: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Bucket ``rows`` into the timeseries JSON shape, one dict per bucket.
+
+    Buckets are labelled with their start: a date for daily and weekly
+    buckets, a timestamp for hourly ones.
+    """
+    sums = bucket_sums(
+        parse_times([row[time_key] for row in rows]),
+        metric_matrix(rows, fields, nested),
+        start,
+        step,
+        count,
+    )
+    results = []
+    for i, totals in enumerate(sums.tolist()):
+        bucket = start + step * i
+        label = (
+            bucket.date().isoformat()
+            if step >= timedelta(days=1)
+            else bucket.strftime("%Y-%m-%dT%H:00:00")
+        )
+        results.append({"date": label, **dict(zip(fields, totals))})
+    return results
@@ -1,15 +1,11 @@
 # backend/services/user.py
 import os
-from supabase import create_client
 from cryptography.fernet import Fernet
+from services.db import execute, get_supabase
 import datetime
 from typing import Any, Dict, Optional, Tuple
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-if SUPABASE_URL is None or SUPABASE_SERVICE_ROLE_KEY is None:
-    raise ValueError("Supabase environment variables not set")
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+supabase = get_supabase()
 
 FERNET_KEY = os.environ.get("FERNET_KEY")
 fernet = Fernet(FERNET_KEY) if FERNET_KEY else None
@@ -34,19 +30,22 @@ async def get_or_create_user(
     encrypted_token = encrypt_token(access_token)
 
     # First, try to find active user (exclude deleted users)
-    resp = (
+    resp = await execute(
         supabase.table("users")
         .select("*")
         .eq("github_id", github_id)
         .eq("deleted", False)
-        .execute()
     )
     if resp.data and len(resp.data) > 0:
         # Update existing active user
         user = resp.data[0]
-        supabase.table("users").update(
-            {"username": username, "email": email, "access_token": encrypted_token}
-        ).eq("github_id", github_id).execute()
+        await execute(
+            supabase.table("users")
+            .update(
+                {"username": username, "email": email, "access_token": encrypted_token}
+            )
+            .eq("github_id", github_id)
+        )
         user.update(
             {"username": username, "email": email, "access_token": encrypted_token}
         )
@@ -55,25 +54,28 @@ async def get_or_create_user(
         return None
 
     # If no active user found, check if there's a deleted user with this github_id
-    deleted_resp = (
+    deleted_resp = await execute(
         supabase.table("users")
         .select("*")
         .eq("github_id", github_id)
         .eq("deleted", True)
-        .execute()
     )
     if deleted_resp.data and len(deleted_resp.data) > 0:
         # Reactivate the deleted user
         user = deleted_resp.data[0]
-        supabase.table("users").update(
-            {
-                "username": username,
-                "email": email,
-                "access_token": encrypted_token,
-                "deleted": False,
-                "deleted_at": None,
-            }
-        ).eq("github_id", github_id).execute()
+        await execute(
+            supabase.table("users")
+            .update(
+                {
+                    "username": username,
+                    "email": email,
+                    "access_token": encrypted_token,
+                    "deleted": False,
+                    "deleted_at": None,
+                }
+            )
+            .eq("github_id", github_id)
+        )
         user.update(
             {
                 "username": username,
@@ -89,9 +91,8 @@ async def get_or_create_user(
         return None
 
     # If no user exists at all, create a new one
-    insert_resp = (
-        supabase.table("users")
-        .insert(
+    insert_resp = await execute(
+        supabase.table("users").insert(
             {
                 "github_id": github_id,
                 "username": username,
@@ -99,7 +100,6 @@ async def get_or_create_user(
                 "access_token": encrypted_token,
             }
         )
-        .execute()
     )
     if insert_resp.data and isinstance(insert_resp.data[0], dict):
         return insert_resp.data[0]
@@ -108,14 +108,13 @@ async def get_or_create_user(
 
 async def get_user_org_and_role(user_id: str) -> Tuple[Optional[str], Optional[str]]:
     # Return the first org the user belongs to, only if both user_orgs and org are not deleted
-    resp = (
+    resp = await execute(
         supabase.table("user_orgs")
         .select("org_id,role,organizations!inner(id,deleted)")
         .eq("user_id", user_id)
         .eq("deleted", False)
         .eq("organizations.deleted", False)
         .limit(1)
-        .execute()
     )
     if resp.data and len(resp.data) > 0:
         return resp.data[0]["org_id"], resp.data[0]["role"]
@@ -123,13 +122,12 @@ async def get_user_org_and_role(user_id: str) -> Tuple[Optional[str], Optional[s
 
 
 async def get_user_github_token(user_id: str) -> Optional[str]:
-    resp = (
+    resp = await execute(
         supabase.table("users")
         .select("access_token")
         .eq("id", user_id)
         .eq("deleted", False)
         .maybe_single()
-        .execute()
     )
     if resp.data and resp.data.get("access_token"):
         try:
@@ -139,12 +137,12 @@ async def get_user_github_token(user_id: str) -> Optional[str]:
     return None
 
 
-def delete_user_and_data(user_id: str) -> None:
+async def delete_user_and_data(user_id: str) -> None:
     """Delete user with proper cleanup of org memberships and data"""
     try:
         # 1. Get user info first
-        user_result = (
-            supabase.table("users").select("*").eq("id", user_id).single().execute()
+        user_result = await execute(
+            supabase.table("users").select("*").eq("id", user_id).single()
         )
         if not user_result.data:
             print(f"User {user_id} not found for deletion")
@@ -156,12 +154,11 @@ def delete_user_and_data(user_id: str) -> None:
         )
 
         # 2. Get all org memberships for this user
-        memberships = (
+        memberships = await execute(
             supabase.table("user_orgs")
             .select("org_id, role")
             .eq("user_id", user_id)
             .eq("deleted", False)
-            .execute()
         )
 
         if not memberships.data:
@@ -179,14 +176,13 @@ def delete_user_and_data(user_id: str) -> None:
             # Check if user is the only admin in the org
             if role == "admin":
                 # Count all active admins in this org (excluding the user being deleted)
-                admin_count = (
+                admin_count = await execute(
                     supabase.table("user_orgs")
                     .select("user_id", count="exact")
                     .eq("org_id", org_id)
                     .eq("role", "admin")
                     .eq("deleted", False)
                     .neq("user_id", user_id)
-                    .execute()
                 )
 
                 print(f"Found {admin_count.count} other admins in org {org_id}")
@@ -199,8 +195,8 @@ def delete_user_and_data(user_id: str) -> None:
                     # Import here to avoid circular imports
                     from services.org import OrgService
 
-                    org_service = OrgService()
-                    result, error = org_service.disband_org(org_id)
+                    org_service = OrgService(supabase)
+                    result, error = await org_service.disband_org(org_id)
                     if error:
                         print(f"Error disbanding org {org_id}: {error}")
                         raise Exception(f"Failed to disband org {org_id}: {error}")
@@ -210,33 +206,47 @@ def delete_user_and_data(user_id: str) -> None:
                     print(
                         f"Removing admin user {user_id} from org {org_id} (other admins exist)"
                     )
-                    supabase.table("user_orgs").update(
+                    await execute(
+                        supabase.table("user_orgs")
+                        .update(
+                            {
+                                "deleted": True,
+                                "deleted_at": datetime.datetime.utcnow().isoformat(),
+                            }
+                        )
+                        .eq("org_id", org_id)
+                        .eq("user_id", user_id)
+                    )
+            else:
+                # User is not admin, just remove from org
+                print(f"Removing non-admin user {user_id} from org {org_id}")
+                await execute(
+                    supabase.table("user_orgs")
+                    .update(
                         {
                             "deleted": True,
                             "deleted_at": datetime.datetime.utcnow().isoformat(),
                         }
-                    ).eq("org_id", org_id).eq("user_id", user_id).execute()
-            else:
-                # User is not admin, just remove from org
-                print(f"Removing non-admin user {user_id} from org {org_id}")
-                supabase.table("user_orgs").update(
-                    {
-                        "deleted": True,
-                        "deleted_at": datetime.datetime.utcnow().isoformat(),
-                    }
-                ).eq("org_id", org_id).eq("user_id", user_id).execute()
+                    )
+                    .eq("org_id", org_id)
+                    .eq("user_id", user_id)
+                )
 
         # 4. Soft delete user data (keep for audit purposes)
         current_time = datetime.datetime.utcnow().isoformat()
-        supabase.table("users").update(
-            {
-                "deleted": True,
-                "deleted_at": current_time,
-                "email": f"deleted_{user_id}@deleted.user",
-                "username": f"deleted_{user_id}",
-                "access_token": None,
-            }
-        ).eq("id", user_id).execute()
+        await execute(
+            supabase.table("users")
+            .update(
+                {
+                    "deleted": True,
+                    "deleted_at": current_time,
+                    "email": f"deleted_{user_id}@deleted.user",
+                    "username": f"deleted_{user_id}",
+                    "access_token": None,
+                }
+            )
+            .eq("id", user_id)
+        )
 
         print(f"Successfully soft deleted user {user_id} and cleaned up memberships")
 
@@ -246,13 +256,12 @@ def delete_user_and_data(user_id: str) -> None:
 
 
 async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
-    resp = (
+    resp = await execute(
         supabase.table("users")
         .select("*")
         .eq("id", user_id)
         .eq("deleted", False)
         .maybe_single()
-        .execute()
     )
     data: Dict[str, Any] = resp.data
     if data:
@@ -260,7 +269,7 @@ async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def cleanup_deleted_users(days_old: int = 30) -> Tuple[int, str]:
+async def cleanup_deleted_users(days_old: int = 30) -> Tuple[int, str]:
     """Permanently delete users that were soft-deleted more than N days ago"""
     try:
         from datetime import datetime, timedelta
@@ -268,12 +277,11 @@ def cleanup_deleted_users(days_old: int = 30) -> Tuple[int, str]:
         cutoff_date = (datetime.utcnow() - timedelta(days=days_old)).isoformat()
 
         # Find users to permanently delete
-        users_to_delete = (
+        users_to_delete = await execute(
             supabase.table("users")
             .select("id")
             .eq("deleted", True)
             .lt("deleted_at", cutoff_date)
-            .execute()
         )
 
         if not users_to_delete.data:
@@ -284,7 +292,7 @@ def cleanup_deleted_users(days_old: int = 30) -> Tuple[int, str]:
             user_id = user["id"]
 
             # Permanently delete user
-            supabase.table("users").delete().eq("id", user_id).execute()
+            await execute(supabase.table("users").delete().eq("id", user_id))
 
             deleted_count += 1
             print(f"Permanently deleted user {user_id}")
@@ -296,16 +304,15 @@ def cleanup_deleted_users(days_old: int = 30) -> Tuple[int, str]:
         return 0, f"Error during cleanup: {e}"
 
 
-def validate_user_deletion_logic(user_id: str) -> Tuple[bool, str]:
+async def validate_user_deletion_logic(user_id: str) -> Tuple[bool, str]:
     """Validate that user deletion logic will work correctly for a given user"""
     try:
         # Get user's org memberships
-        memberships = (
+        memberships = await execute(
             supabase.table("user_orgs")
             .select("org_id, role")
             .eq("user_id", user_id)
             .eq("deleted", False)
-            .execute()
         )
 
         if not memberships.data:
@@ -319,14 +326,13 @@ def validate_user_deletion_logic(user_id: str) -> Tuple[bool, str]:
 
             if role == "admin":
                 # Check if user is the only admin
-                admin_count = (
+                admin_count = await execute(
                     supabase.table("user_orgs")
                     .select("user_id", count="exact")
                     .eq("org_id", org_id)
                     .eq("role", "admin")
                     .eq("deleted", False)
                     .neq("user_id", user_id)
-                    .execute()
                 )
 
                 if admin_count.count == 0:
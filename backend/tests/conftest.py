@@ -4,6 +4,76 @@ import pytest
 from unittest.mock import Mock, AsyncMock
 from cryptography.fernet import Fernet
 import uuid
+from types import SimpleNamespace
+from services.dashboard_cache import dashboard_cache
+from services.resilience import circuit_breakers
+
+
+class FakeQuery:
+    """Records a PostgREST query chain and answers execute() with canned rows."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return method
+
+    def called(self, name):
+        return [(args, kwargs) for n, args, kwargs in self.calls if n == name]
+
+    def execute(self):
+        data = self.client.responses.get(self.table)
+        if callable(data):
+            data = data(self)
+        return None if data is None else SimpleNamespace(data=data, count=None)
+
+
+class FakeSupabase:
+    """Supabase client stand-in; ``responses`` maps table name to rows."""
+
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.queries = []
+
+    def table(self, name):
+        query = FakeQuery(self, name)
+        self.queries.append(query)
+        return query
+
+    def rpc(self, name, params=None):
+        """Answered from ``responses["rpc:<name>"]``; params are kept."""
+        query = FakeQuery(self, f"rpc:{name}")
+        query.params = params or {}
+        self.queries.append(query)
+        return query
+
+
+@pytest.fixture
+def fake_supabase():
+    return FakeSupabase()
+
+
+@pytest.fixture(autouse=True)
+def fast_resilience(monkeypatch):
+    """Retry without backoff and start every test with closed circuits."""
+    monkeypatch.setenv("RESILIENCE_BASE_DELAY", "0")
+    circuit_breakers.reset()
+    yield
+    circuit_breakers.reset()
+
+
+@pytest.fixture(autouse=True)
+def empty_dashboard_cache():
+    """Start every test without cached metrics responses."""
+    dashboard_cache.clear()
+    yield
+    dashboard_cache.clear()
 
 
 @pytest.fixture
@@ -0,0 +1,68 @@
+from utils.commit_classifier import CommitClassifier
+
+
+class TestCommitClassifier:
+    """Test cases for the commit classifier."""
+
+    def test_keyword_matching_finds_every_category(self):
+        """Test one summary can match several categories in one pass."""
+        classifier = CommitClassifier()
+        assert classifier.classify("Speed up doc build and fix typo") == [
+            "bugfix",
+            "perf",
+            "docs",
+        ]
+        assert classifier.classify("Bump dependencies") == ["other"]
+
+    def test_conventional_prefix_takes_precedence(self):
+        """Test conventional commit types decide the category when mapped."""
+        classifier = CommitClassifier()
+        assert classifier.classify("fix(api): update docs link") == ["bugfix"]
+        assert classifier.classify("feat!: drop python 3.8") == ["feature"]
+        assert classifier.classify("perf(db): add index") == ["perf"]
+        # Unmapped types fall back to keyword matching
+        assert classifier.classify("chore: fix lint") == ["bugfix"]
+
+    def test_custom_categories(self):
+        """Test categories and keywords are configurable."""
+        classifier = CommitClassifier(
+            categories={"security": ["cve", "vuln"], "deps": ["bump"]},
+            conventional_types={"sec": "security"},
+        )
+        assert classifier.all_categories == ["security", "deps", "other"]
+        assert classifier.classify("Bump requests for CVE-2024-1") == [
+            "security",
+            "deps",
+        ]
+        assert classifier.classify("sec: rotate keys") == ["security"]
+        assert classifier.classify("fix: typo") == ["other"]
+
+    def test_overlapping_keywords_all_match(self):
+        """Test a keyword inside another still matches, however many are set."""
+        keywords = {f"cat{i}": [f"kw{i}a", f"kw{i}b"] for i in range(20)}
+        keywords["docs"] = ["doc"]
+        keywords["infra"] = ["docker"]
+        classifier = CommitClassifier(categories=keywords, conventional_types={})
+
+        assert classifier.classify("Pin docker base image") == ["docs", "infra"]
+        assert classifier.classify("kw3b and kw17a") == ["cat3", "cat17"]
+        assert classifier.classify("nothing relevant") == ["other"]
+
+    def test_keywords_sharing_characters_all_match(self):
+        """Test a keyword starting inside another match is still found."""
+        classifier = CommitClassifier()
+
+        assert classifier.classify("perfix the cache") == ["bugfix", "perf"]
+        assert classifier.classify("Speedoc update") == ["perf", "docs"]
+
+    def test_default_types_with_custom_categories(self):
+        """Test default types whose category is not configured are ignored."""
+        classifier = CommitClassifier(
+            categories={"bugfix": ["fix", "bug"], "feature": ["feat", "feature"]}
+        )
+
+        assert "perf" not in classifier.conventional_types
+        assert classifier.group(["perf: speed up parser"])["other"] == [
+            "perf: speed up parser"
+        ]
+        assert classifier.classify("fix: handle empty payload") == ["bugfix"]
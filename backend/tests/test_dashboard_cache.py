@@ -0,0 +1,103 @@
+import time
+from starlette.requests import Request
+from services.dashboard_cache import DashboardCache, cached_json, dashboard_cache
+from services.digest import DigestService
+from services.ownership import monitor_owners
+
+
+def make_request(if_none_match=None):
+    headers = []
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+class TestDashboardCache:
+    """Test cases for the dashboard metrics response cache."""
+
+    def test_entries_expire(self):
+        """Test bodies are forgotten after the TTL."""
+        cache = DashboardCache(ttl=0.02)
+        key = ("metrics", "org-1", "m1", 7, False)
+        cache.set(key, b"{}")
+
+        assert cache.get(key).body == b"{}"
+        time.sleep(0.03)
+        assert cache.get(key) is None
+
+    def test_least_recently_used_evicted(self):
+        """Test a full cache evicts the entry read longest ago."""
+        cache = DashboardCache(ttl=60, max_entries=2)
+        first, second, third = [("metrics", "org-1", m, 7, False) for m in "abc"]
+        cache.set(first, b"1")
+        cache.set(second, b"2")
+        cache.get(first)
+        cache.set(third, b"3")
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert len(cache) == 2
+
+    def test_invalidate_monitor(self):
+        """Test a monitor's entries and its org-wide entries are dropped."""
+        cache = DashboardCache(ttl=60)
+        monitor = ("metrics", "org-1", "m1", 7, False)
+        other = ("timeseries", "org-1", "m2", 30, None)
+        org_wide = ("metrics", "org-1", None, 7, True)
+        other_org = ("metrics", "org-2", None, 7, False)
+        for key in (monitor, other, org_wide, other_org):
+            cache.set(key, b"{}")
+
+        cache.invalidate_monitor("m1", "org-1")
+
+        assert cache.get(monitor) is None
+        assert cache.get(org_wide) is None
+        assert cache.get(other) is not None
+        assert cache.get(other_org) is not None
+
+    def test_body_computed_across_invalidation_not_stored(self):
+        """Test a result read before a digest write is not cached after it."""
+        cache = DashboardCache(ttl=60)
+        key = ("metrics", "org-1", "m1", 7, False)
+        generation = cache.generation
+        cache.invalidate_monitor("m1", "org-1")
+
+        entry = cache.set(key, b"{}", generation)
+
+        assert entry.etag
+        assert cache.get(key) is None
+
+    async def test_cached_json_serves_304(self):
+        """Test repeat requests hit the cache and matching ETags get a 304."""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"metrics": {"prs_opened": 2}, "period_days": 7}
+
+        key = ("metrics", "org-1", "m1", 7, False)
+        first = await cached_json(make_request(), key, compute)
+        etag = first.headers["etag"]
+        second = await cached_json(make_request(), key, compute)
+        revalidated = await cached_json(make_request(etag), key, compute)
+
+        assert first.body == b'{"metrics":{"prs_opened":2},"period_days":7}'
+        assert second.body == first.body
+        assert revalidated.status_code == 304
+        assert revalidated.body == b""
+        assert revalidated.headers["etag"] == etag
+        assert len(calls) == 1
+
+    async def test_log_digest_invalidates_monitor(self, fake_supabase):
+        """Test logging a digest drops the monitor's and its org's entries."""
+        monitor_owners.set("m1", "org-1")
+        monitor = ("metrics", "org-1", "m1", 7, False)
+        org_wide = ("metrics", "org-1", None, 7, False)
+        dashboard_cache.set(monitor, b"{}")
+        dashboard_cache.set(org_wide, b"{}")
+
+        await DigestService(fake_supabase).log_digest(
+            "m1", "summary", "sent", "2025-01-01T00:00:00", "slack"
+        )
+
+        assert len(dashboard_cache) == 0
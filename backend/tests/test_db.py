@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from services.db import execute, run_sync
+
+
+class SlowQuery:
+    def __init__(self) -> None:
+        self.thread = None
+
+    def execute(self) -> str:
+        self.thread = threading.current_thread()
+        time.sleep(0.05)
+        return "rows"
+
+
+class TestDatabasePool:
+    """Test cases for running sync Supabase queries off the event loop."""
+
+    async def test_execute_runs_on_pool_thread(self):
+        """Test queries execute on a worker thread and return their result."""
+        query = SlowQuery()
+
+        assert await execute(query) == "rows"
+        assert query.thread is not threading.current_thread()
+        assert query.thread.name.startswith("supabase")
+
+    async def test_queries_do_not_block_event_loop(self):
+        """Test concurrent queries overlap and the loop keeps running."""
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(execute(SlowQuery()) for _ in range(4)))
+        elapsed = time.perf_counter() - start
+        task.cancel()
+
+        assert results == ["rows"] * 4
+        assert elapsed < 0.15
+        assert ticks > 3
+
+    async def test_run_sync_passes_arguments(self):
+        """Test run_sync forwards positional and keyword arguments."""
+        assert await run_sync(divmod, 7, 2) == (3, 1)
+        assert await run_sync(int, "ff", base=16) == 255
+
+    async def test_async_queries_skip_the_pool(self):
+        """Test queries built on the async client are awaited on the loop."""
+
+        class AsyncQuery:
+            thread = None
+
+            async def execute(self) -> str:
+                self.thread = threading.current_thread()
+                return "rows"
+
+        query = AsyncQuery()
+
+        assert await execute(query) == "rows"
+        assert query.thread is threading.current_thread()
+
+
+class TestSupabaseClient:
+    """Test cases for the process-wide Supabase client."""
+
+    def test_services_share_one_client(self, mock_env_vars):
+        """Test every service reuses the same lazily created client."""
+        from services.audit import AuditLogService
+        from services.db import get_supabase
+        from services.digest import DigestService
+        from services.monitor import MonitorService
+        from services.org import OrgService
+
+        client = get_supabase()
+
+        assert get_supabase() is client
+        assert MonitorService().client is client
+        assert DigestService().client is client
+        assert AuditLogService().client is client
+        assert OrgService().supabase is client
+
+    async def test_async_client_is_shared(self, mock_env_vars):
+        """Test the async client is created once and closed on shutdown."""
+        from supabase import AsyncClient
+        from services.db import close_async_supabase, get_async_supabase
+
+        client = await get_async_supabase()
+
+        assert isinstance(client, AsyncClient)
+        assert await get_async_supabase() is client
+        await close_async_supabase()
+        assert await get_async_supabase() is not client
+        await close_async_supabase()
+
+    def test_services_accept_injected_client(self, mock_supabase_client):
+        """Test a client passed in (e.g. via Depends) is used as is."""
+        from services.digest import DigestService
+
+        assert DigestService(mock_supabase_client).client is mock_supabase_client
+
+    def test_monitor_routes_take_client_from_dependency(self, mock_supabase_client):
+        """Test digest routes build their service from the injected client."""
+        from fastapi.params import Depends
+        from inspect import signature
+        from routes.monitor import get_digest_service
+        from services.db import get_async_supabase
+
+        default = signature(get_digest_service).parameters["client"].default
+        assert isinstance(default, Depends) and default.dependency is get_async_supabase
+        service = get_digest_service(mock_supabase_client)
+        assert service.client is mock_supabase_client
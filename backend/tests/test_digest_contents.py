@@ -0,0 +1,104 @@
+import json
+import pytest
+from services.digest import DigestService
+from services.digest_contents import (
+    compress,
+    content_hash,
+    decompress,
+    from_bytea,
+    insert_digests,
+    pack_digest,
+    to_bytea,
+)
+from services.ownership import monitor_owners
+
+SUMMARY = "## Activity\n- 3 PRs merged\n- 1 bugfix\n" * 20
+
+
+@pytest.fixture(autouse=True)
+def clear_ownership_cache():
+    monitor_owners.clear()
+    yield
+    monitor_owners.clear()
+
+
+def digest(monitor_id="m1", summary=SUMMARY, raw_payload=None):
+    return {"monitor_id": monitor_id, "summary": summary, "raw_payload": raw_payload}
+
+
+class TestDigestContents:
+    """Test cases for content-addressed digest summary and payload storage."""
+
+    def test_compressed_bytea_round_trip(self):
+        """Test bodies survive compression and PostgREST's bytea encoding."""
+        data = SUMMARY.encode()
+        body = to_bytea(compress(data))
+
+        assert body.startswith("\\x")
+        assert len(body) < len(data)
+        assert decompress(from_bytea(body)) == data
+
+    async def test_identical_summaries_stored_once(self, fake_supabase):
+        """Test digests sharing a summary reference one content row."""
+        await insert_digests(fake_supabase, [digest("m1"), digest("m2")])
+
+        contents, touched, digests = fake_supabase.queries
+        assert contents.table == "digest_contents"
+        (stored,), options = contents.called("upsert")[0]
+        assert [c["hash"] for c in stored] == [content_hash(SUMMARY.encode())]
+        # Bodies already stored are not rewritten, only their timestamp
+        assert options == {"on_conflict": "hash", "ignore_duplicates": True}
+        assert touched.table == "digest_contents"
+        ((values,), _) = touched.called("update")[0]
+        assert list(values) == ["last_written_at"]
+        assert touched.called("in_")[0][0] == ("hash", [stored[0]["hash"]])
+        rows = digests.called("insert")[0][0][0]
+        assert {r["summary_hash"] for r in rows} == {stored[0]["hash"]}
+        assert all(r["summary"] is None for r in rows)
+
+    def test_raw_payload_optional_and_capped(self, monkeypatch):
+        """Test raw payloads are kept only when enabled and under the cap."""
+        payload = {"commits": ["a" * 50]}
+
+        packed, contents = pack_digest(digest(raw_payload=payload))
+        assert packed["raw_payload_hash"] is None
+        assert len(contents) == 1
+
+        monkeypatch.setenv("DIGEST_STORE_RAW_PAYLOAD", "true")
+        packed, contents = pack_digest(digest(raw_payload=payload))
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        assert packed["raw_payload"] is None
+        assert packed["raw_payload_hash"] == content_hash(raw)
+        assert decompress(from_bytea(contents[1]["body"])) == raw
+
+        monkeypatch.setenv("DIGEST_RAW_PAYLOAD_MAX_BYTES", "10")
+        packed, contents = pack_digest(digest(raw_payload=payload))
+        assert packed["raw_payload_hash"] is None
+        assert len(contents) == 1
+
+    async def test_history_reads_stored_summaries(self, fake_supabase):
+        """Test listed digests get their summary back from digest_contents."""
+        summary_hash = content_hash(SUMMARY.encode())
+        monitor_owners.set("m1", "org-1")
+        fake_supabase.responses["digests"] = [
+            {"id": "d2", "delivered_at": "2026-01-02", "summary_hash": summary_hash},
+            {"id": "d1", "delivered_at": "2026-01-01", "summary": "inline"},
+        ]
+        fake_supabase.responses["digest_contents"] = [
+            {
+                "hash": summary_hash,
+                "codec": "zstd",
+                "body": to_bytea(compress(SUMMARY.encode())),
+            }
+        ]
+        service = DigestService(fake_supabase)
+
+        page, _ = await service.page_monitor_digests("m1", org_id="org-1")
+
+        assert page == [
+            {"id": "d2", "delivered_at": "2026-01-02", "summary": SUMMARY},
+            {"id": "d1", "delivered_at": "2026-01-01", "summary": "inline"},
+        ]
+        assert fake_supabase.queries[1].called("in_") == [
+            (("hash", [summary_hash]), {})
+        ]
@@ -1,7 +1,280 @@
-from services.digest import DigestService
+import pytest
+from services.digest import (
+    DigestService,
+    MonitorNotFoundError,
+    decode_cursor,
+    encode_cursor,
+)
+from services.ownership import monitor_owners
+
+
+@pytest.fixture(autouse=True)
+def clear_ownership_cache():
+    monitor_owners.clear()
+    yield
+    monitor_owners.clear()
 
 
 class TestDigestService:
     def test_init_with_valid_config(self, mock_env_vars):
         service = DigestService()
         assert service.client is not None
+
+    async def test_digests_and_ownership_in_one_query(self, fake_supabase):
+        """Test the org check and digest fetch share one request."""
+        digests = [{"id": "d1", "delivered_at": "2026-01-02T00:00:00"}]
+        fake_supabase.responses["monitors"] = {"org_id": "org-1", "digests": digests}
+        service = DigestService(fake_supabase)
+
+        result = await service.get_monitor_digests("m1", 5, org_id="org-1")
+
+        assert result == digests
+        assert len(fake_supabase.queries) == 1
+        query = fake_supabase.queries[0]
+        assert query.table == "monitors"
+        assert "digests(" in query.called("select")[0][0][0]
+        assert (("org_id", "org-1"), {}) in query.called("eq")
+        assert query.called("limit") == [((5,), {"foreign_table": "digests"})]
+        assert monitor_owners.get("m1") == "org-1"
+
+    async def test_cached_owner_reads_digests_directly(self, fake_supabase):
+        """Test a cached owner skips the embedded monitor lookup."""
+        monitor_owners.set("m1", "org-1")
+        fake_supabase.responses["digests"] = [{"id": "d1"}]
+        service = DigestService(fake_supabase)
+
+        assert await service.get_monitor_digests("m1", org_id="org-1") == [{"id": "d1"}]
+        assert [q.table for q in fake_supabase.queries] == ["digests"]
+
+    async def test_digest_pages_continue_from_cursor(self, fake_supabase):
+        """Test pages are keyed on (delivered_at, id) and end without a cursor."""
+        rows = [
+            {
+                "id": f"00000000-0000-0000-0000-00000000000{i}",
+                "delivered_at": f"2026-01-0{9 - i}T00:00:00+00:00",
+            }
+            for i in range(3)
+        ]
+        monitor_owners.set("m1", "org-1")
+        fake_supabase.responses["digests"] = rows
+        service = DigestService(fake_supabase)
+
+        page, cursor = await service.page_monitor_digests("m1", 2, org_id="org-1")
+
+        assert page == rows[:2]
+        assert decode_cursor(cursor) == (
+            "2026-01-08T00:00:00+00:00",
+            "00000000-0000-0000-0000-000000000001",
+        )
+        first = fake_supabase.queries[0]
+        assert first.called("limit") == [((3,), {"foreign_table": None})]
+        assert [args[0] for args, _ in first.called("order")] == [
+            "delivered_at",
+            "id",
+        ]
+        assert first.called("or_") == []
+
+        fake_supabase.responses["digests"] = rows[2:]
+        page, next_cursor = await service.page_monitor_digests(
+            "m1", 2, org_id="org-1", cursor=cursor, fields="status"
+        )
+
+        assert page == rows[2:]
+        assert next_cursor is None
+        second = fake_supabase.queries[1]
+        assert second.called("select")[0][0][0] == "id, delivered_at, status"
+        assert (
+            ("delivered_at", "2026-01-08T00:00:00+00:00"),
+            {},
+        ) in second.called("lte")
+        assert second.called("or_") == [
+            (
+                (
+                    'delivered_at.lt."2026-01-08T00:00:00+00:00",'
+                    'and(delivered_at.eq."2026-01-08T00:00:00+00:00",'
+                    'id.lt."00000000-0000-0000-0000-000000000001")',
+                ),
+                {"reference_table": None},
+            )
+        ]
+
+    async def test_digest_page_rejects_bad_input(self, fake_supabase):
+        """Test malformed or crafted cursors and unknown fields raise ValueError."""
+        service = DigestService(fake_supabase)
+
+        with pytest.raises(ValueError):
+            await service.page_monitor_digests("m1", cursor="not-a-cursor")
+        # Well-formed JSON whose values would smuggle extra filter terms
+        for delivered_at, digest_id in (
+            ('2026-01-01",id.gt."0', "00000000-0000-0000-0000-000000000001"),
+            ("2026-01-01T00:00:00+00:00", 'x"),or(id.not.is.null'),
+        ):
+            crafted = encode_cursor({"delivered_at": delivered_at, "id": digest_id})
+            with pytest.raises(ValueError):
+                await service.page_monitor_digests("m1", cursor=crafted)
+        with pytest.raises(ValueError, match="raw_payload"):
+            await service.page_monitor_digests("m1", fields="status,raw_payload")
+        assert fake_supabase.queries == []
+
+    async def test_monitor_of_other_org_is_not_found(self, fake_supabase):
+        """Test another org's monitor raises, from the query or the cache."""
+        service = DigestService(fake_supabase)
+
+        with pytest.raises(MonitorNotFoundError):
+            await service.timeseries_metrics("m1", 7, org_id="org-2")
+        assert monitor_owners.get("m1") is None
+
+        monitor_owners.set("m1", "org-1")
+        queries = len(fake_supabase.queries)
+        with pytest.raises(MonitorNotFoundError):
+            await service.aggregate_metrics("org-2", monitor_id="m1")
+        assert len(fake_supabase.queries) == queries
+
+    async def test_aggregate_metrics_sums_in_database(self, fake_supabase):
+        """Test totals come from one RPC round-trip."""
+        fake_supabase.responses["rpc:digest_metrics_totals"] = [
+            {"prs_opened": 12, "prs_closed": 9, "bugfixes": 4, "perf": None}
+        ]
+        service = DigestService(fake_supabase)
+
+        totals = await service.aggregate_metrics("org-1", period_days=30)
+
+        assert totals["prs_opened"] == 12
+        assert totals["bugfixes"] == 4
+        assert totals["perf"] == 0
+        assert len(totals) == 9
+        assert len(fake_supabase.queries) == 1
+        params = fake_supabase.queries[0].params
+        assert params["p_org_id"] == "org-1"
+        assert params["p_monitor_id"] is None
+        assert params["p_until"] is None
+
+    async def test_aggregate_metrics_for_foreign_monitor(self, fake_supabase):
+        """Test no row back for a monitor means it is not in the org."""
+        service = DigestService(fake_supabase)
+
+        with pytest.raises(MonitorNotFoundError):
+            await service.aggregate_metrics("org-1", monitor_id="m9")
+        assert await service.aggregate_metrics("org-1") == {
+            "prs_opened": 0,
+            "prs_closed": 0,
+            "issues_opened": 0,
+            "issues_closed": 0,
+            "bugfixes": 0,
+            "docs": 0,
+            "features": 0,
+            "refactors": 0,
+            "perf": 0,
+        }
+
+    async def test_timeseries_reads_daily_rollup(self, fake_supabase):
+        """Test multi-day timeseries reads one rollup row per active day."""
+        from datetime import datetime, timedelta
+
+        today = datetime.utcnow().date()
+        yesterday = (today - timedelta(days=1)).isoformat()
+        monitor_owners.set("m1", "org-1")
+        fake_supabase.responses["digest_metrics_daily"] = [
+            {"day": yesterday, "prs_opened": 3, "bugfixes": 2},
+            {"day": today.isoformat(), "prs_opened": 1},
+        ]
+        service = DigestService(fake_supabase)
+
+        series = await service.timeseries_metrics("m1", 7, org_id="org-1")
+
+        assert [q.table for q in fake_supabase.queries] == ["digest_metrics_daily"]
+        assert len(series) == 7
+        assert series[-1]["date"] == today.isoformat()
+        assert series[-1]["prs_opened"] == 1
+        assert series[-2] == {
+            "date": yesterday,
+            "prs_opened": 3,
+            "prs_closed": 0,
+            "issues_opened": 0,
+            "issues_closed": 0,
+            "bugfixes": 2,
+            "docs": 0,
+            "features": 0,
+            "refactors": 0,
+            "perf": 0,
+        }
+        assert sum(day["prs_opened"] for day in series[:-2]) == 0
+
+    async def test_timeseries_weekly_buckets(self, fake_supabase):
+        """Test weekly buckets sum rollup days and end with the current week."""
+        from datetime import datetime, timedelta
+
+        today = datetime.utcnow().date()
+        monitor_owners.set("m1", "org-1")
+        fake_supabase.responses["digest_metrics_daily"] = [
+            {"day": today.isoformat(), "prs_opened": 1},
+            {"day": (today - timedelta(days=6)).isoformat(), "prs_opened": 2},
+            {"day": (today - timedelta(days=7)).isoformat(), "docs": [1, 2]},
+        ]
+        service = DigestService(fake_supabase)
+
+        series = await service.timeseries_metrics(
+            "m1", 14, org_id="org-1", granularity="week"
+        )
+
+        assert [week["date"] for week in series] == [
+            (today - timedelta(days=13)).isoformat(),
+            (today - timedelta(days=6)).isoformat(),
+        ]
+        assert series[1]["prs_opened"] == 3
+        assert series[0]["docs"] == 2
+
+    async def test_timeseries_hourly_buckets(self, fake_supabase):
+        """Test hourly buckets read raw digests and skip rows outside the window."""
+        from datetime import datetime, timedelta
+
+        hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        monitor_owners.set("m1", "org-1")
+        fake_supabase.responses["digests"] = [
+            {
+                "delivered_at": (hour + timedelta(minutes=5)).isoformat() + "+00:00",
+                "metrics_json": {"prs_opened": 2, "perf": 1},
+            },
+            {
+                "delivered_at": (hour - timedelta(minutes=30)).isoformat(),
+                "metrics_json": {"prs_opened": 4},
+            },
+            {
+                "delivered_at": (hour - timedelta(days=2)).isoformat(),
+                "metrics_json": {"prs_opened": 100},
+            },
+        ]
+        service = DigestService(fake_supabase)
+
+        series = await service.timeseries_metrics(
+            "m1", 1, org_id="org-1", granularity="hour"
+        )
+
+        assert [q.table for q in fake_supabase.queries] == ["digests"]
+        assert len(series) == 24
+        assert series[-1]["date"] == hour.strftime("%Y-%m-%dT%H:00:00")
+        assert series[-1]["prs_opened"] == 2
+        assert series[-1]["perf"] == 1
+        assert series[-2]["prs_opened"] == 4
+        assert sum(h["prs_opened"] for h in series) == 6
+
+    async def test_compare_metrics_in_one_query(self, fake_supabase):
+        """Test current and previous totals come from a single RPC."""
+        fake_supabase.responses["rpc:digest_metrics_compare"] = [
+            {"period": "current", "prs_opened": 5, "docs": 1},
+            {"period": "previous", "prs_opened": 2},
+        ]
+        service = DigestService(fake_supabase)
+
+        compared = await service.compare_metrics("org-1", monitor_id="m1")
+
+        assert compared["metrics"]["prs_opened"] == 5
+        assert compared["metrics"]["docs"] == 1
+        assert compared["previous_metrics"]["prs_opened"] == 2
+        assert compared["previous_metrics"]["docs"] == 0
+        assert len(fake_supabase.queries) == 1
+        assert monitor_owners.get("m1") == "org-1"
+
+        fake_supabase.responses["rpc:digest_metrics_compare"] = []
+        with pytest.raises(MonitorNotFoundError):
+            await service.compare_metrics("org-1", monitor_id="m2")
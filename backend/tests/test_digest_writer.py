@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+import routes.digest as digest_routes
+from models.monitor import Monitor
+from services.dashboard_cache import dashboard_cache
+from services.digest import DigestService
+from services.digest_writer import DigestLogWriter, digest_log_writer
+from services.monitor import MonitorService
+
+
+def inserted(fake_supabase):
+    """Monitor ids of each digests insert, in order."""
+    return [
+        [digest["monitor_id"] for digest in q.called("insert")[0][0][0]]
+        for q in fake_supabase.queries
+        if q.table == "digests"
+    ]
+
+
+def row(monitor_id="m1"):
+    return {"monitor_id": monitor_id, "summary": "s", "metrics_json": {}}
+
+
+class TestDigestLogWriter:
+    """Test cases for the batched digest log writer."""
+
+    async def test_flushes_full_batch(self, fake_supabase):
+        """Test a full batch is written as one bulk insert."""
+        writer = DigestLogWriter(fake_supabase, batch_size=3, flush_ms=10_000)
+        writer.start()
+        for _ in range(3):
+            await writer.put(row())
+        await writer.close()
+
+        assert inserted(fake_supabase) == [["m1", "m1", "m1"]]
+
+    async def test_flushes_partial_batch_after_interval(self, fake_supabase):
+        """Test a partial batch is written once the flush interval passes."""
+        writer = DigestLogWriter(fake_supabase, batch_size=100, flush_ms=10)
+        writer.start()
+        await writer.put(row())
+        await asyncio.sleep(0.2)
+
+        assert inserted(fake_supabase) == [["m1"]]
+        await writer.close()
+
+    async def test_close_drains_queue(self, fake_supabase):
+        """Test shutdown writes rows still waiting for their batch."""
+        writer = DigestLogWriter(fake_supabase, batch_size=100, flush_ms=10_000)
+        writer.start()
+        await writer.put(row("m1"))
+        await writer.put(row("m2"))
+
+        await asyncio.wait_for(writer.close(timeout=0.5), 1)
+
+        assert inserted(fake_supabase) == [["m1", "m2"]]
+        assert not writer.running
+
+    async def test_bad_row_does_not_drop_batch(self, fake_supabase):
+        """Test a failed bulk insert is retried row by row."""
+
+        def insert(query):
+            rows = query.called("insert")[0][0][0]
+            if len(rows) > 1 or rows[0]["monitor_id"] == "gone":
+                raise RuntimeError("foreign key violation")
+            return rows
+
+        fake_supabase.responses["digests"] = insert
+        dashboard_cache.set(("metrics", "org-1", "m1", 7, False), b"{}")
+        writer = DigestLogWriter(fake_supabase, batch_size=2, flush_ms=10_000)
+        writer.start()
+        await writer.put(row("gone"))
+        await writer.put(row("m1"))
+        await writer.close()
+
+        assert inserted(fake_supabase) == [["gone", "m1"], ["gone"], ["m1"]]
+        assert len(dashboard_cache) == 0
+
+    async def test_put_requires_running_writer(self, fake_supabase):
+        """Test rows are not silently queued with no worker to write them."""
+        with pytest.raises(RuntimeError):
+            await DigestLogWriter(fake_supabase).put(row())
+
+    async def test_log_digest_queues_while_running(self, fake_supabase):
+        """Test log_digest returns once queued and the row is written on drain."""
+        digest_log_writer.client = fake_supabase
+        digest_log_writer.flush_ms = 10_000
+        digest_log_writer.start()
+        try:
+            await DigestService(fake_supabase).log_digest(
+                "m1", "summary", "success", "2026-01-01T00:00:00", "slack"
+            )
+            assert inserted(fake_supabase) == []
+        finally:
+            await digest_log_writer.close()
+            digest_log_writer.client = None
+            digest_log_writer.flush_ms = 200
+
+        assert inserted(fake_supabase) == [["m1"]]
+
+    async def test_cursor_waits_for_digest_log(
+        self, monkeypatch, fake_supabase, sample_monitor_data
+    ):
+        """Test the cursor is not advanced when the digest log was not queued."""
+        repo_data = {
+            "repository": {"full_name": "test-owner/test-repo"},
+            "summary_counts": {"commits": 1},
+            "grouped_commits": {"feature": ["feat: add export"]},
+            "head_sha": "new",
+        }
+        monkeypatch.setattr(
+            digest_routes,
+            "fetch_and_summarize",
+            AsyncMock(return_value=(repo_data, "summary")),
+        )
+        monkeypatch.setattr(
+            digest_routes.SlackService, "send_digest", AsyncMock(return_value=True)
+        )
+        monkeypatch.setattr(
+            DigestService,
+            "log_digest",
+            AsyncMock(side_effect=RuntimeError("DigestLogWriter is not running")),
+        )
+        monitor_service = MonitorService(fake_supabase)
+        monitor_service.advance_digest_cursor = AsyncMock()
+
+        with pytest.raises(RuntimeError):
+            await digest_routes.run_monitor_digest(
+                Monitor(**sample_monitor_data),
+                delivery_method="slack",
+                webhook_url=sample_monitor_data["webhook_url"],
+                monitor_service=monitor_service,
+            )
+
+        monitor_service.advance_digest_cursor.assert_not_awaited()
@@ -0,0 +1,65 @@
+import pytest
+from datetime import timedelta
+from benchmarks.fake_github import (
+    FAKE_GITHUB_URL,
+    FakeGitHubConfig,
+    create_fake_github,
+    fake_github_client,
+)
+from services.github import GitHubService
+from services.github_ratelimit import RateLimitScheduler, token_fingerprint
+
+ONE_MINUTE = timedelta(minutes=1)
+
+
+def make_service(config: FakeGitHubConfig, **kwargs) -> GitHubService:
+    app = create_fake_github(config)
+    service = GitHubService(
+        "test-token",
+        client=fake_github_client(app),
+        base_url=FAKE_GITHUB_URL,
+        scheduler=RateLimitScheduler(jitter=0, base_backoff=0),
+        **kwargs,
+    )
+    service.app = app
+    return service
+
+
+class TestFakeGitHub:
+    """Test cases for GitHubService against the fake GitHub server."""
+
+    async def test_fetch_follows_pagination(self):
+        """Test a digest streams every commit page of the window."""
+        service = make_service(
+            FakeGitHubConfig(commit_interval=timedelta(minutes=5), max_per_page=50)
+        )
+
+        now = service.app.state.fake.now
+
+        result = await service.fetch_repository_data(
+            "octo/repo", since=now - timedelta(hours=10), until=now + ONE_MINUTE
+        )
+
+        # Ten hours at one commit per 5 minutes, both ends included
+        assert result["summary_counts"]["commits"] == 121
+        assert result["summary_counts"]["prs_opened"] == 12
+        assert service.app.state.fake.requests["/repos/octo/repo/commits"] == 3
+
+    async def test_rate_limit_headers_reach_scheduler(self):
+        """Test the fake's rate limit headers update the scheduler buckets."""
+        service = make_service(FakeGitHubConfig(rate_limit=100))
+
+        # Sequential, so the last response seen per bucket is deterministic
+        await service.fetch_repository_data("octo/repo", concurrent=False)
+
+        token_id = token_fingerprint("token test-token")
+        assert service.scheduler.remaining(token_id, "core") == 98
+        assert service.scheduler.remaining(token_id, "search") == 26
+
+    async def test_bad_gateway_surfaces_as_error(self):
+        """Test injected 502s fail the fetch once retries are spent."""
+        service = make_service(FakeGitHubConfig(bad_gateway_rate=1.0))
+
+        # Concurrent requests trip the host's breaker before all retries finish
+        with pytest.raises(Exception, match="502|Circuit open"):
+            await service.fetch_repository_data("octo/repo")
@@ -0,0 +1,158 @@
+import time
+import asyncio
+import httpx
+from jose import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from services.github_app import GitHubApp
+from services.github_tokens import GitHubTokenPool
+
+
+def make_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def pem(key: rsa.RSAPrivateKey) -> str:
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def expires_in(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + seconds))
+
+
+class TestGitHubApp:
+    """Test cases for GitHub App installation tokens."""
+
+    def test_app_jwt_is_rs256_signed_and_reused(self):
+        """Test the app JWT verifies with the public key and is cached."""
+        key = make_key()
+        app = GitHubApp("12345", pem(key))
+
+        token = app.app_jwt()
+        public = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        claims = jwt.decode(token, public.decode(), algorithms=["RS256"])
+
+        assert claims["iss"] == "12345"
+        assert claims["exp"] - claims["iat"] <= 600
+        assert app.app_jwt() == token
+
+    async def test_installation_token_minted_once_and_refreshed(self):
+        """Test concurrent callers share one mint until the refresh margin."""
+        minted = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/repos/test-owner/test-repo/installation":
+                return httpx.Response(200, json={"id": 42})
+            assert request.url.path == "/app/installations/42/access_tokens"
+            assert request.headers["Authorization"].startswith("Bearer ")
+            minted.append(request)
+            return httpx.Response(
+                201,
+                json={"token": f"ghs_{len(minted)}", "expires_at": expires_in(3600)},
+            )
+
+        app = GitHubApp(
+            "12345",
+            pem(make_key()),
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            refresh_margin=300,
+        )
+
+        tokens = await asyncio.gather(
+            *(app.token_for_repo("test-owner/test-repo") for _ in range(5))
+        )
+        assert set(tokens) == {"ghs_1"}
+        assert len(minted) == 1
+
+        # Inside the refresh margin a new token is minted
+        app._tokens["42"].expires_at = time.time() + 60
+        assert await app.installation_token("42") == "ghs_2"
+
+    async def test_uninstalled_repo_and_pool_refresh(self):
+        """Test repos without the app get None and pooled installs join the pool."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/installation"):
+                return httpx.Response(404, json={"message": "Not Found"})
+            return httpx.Response(
+                201, json={"token": "ghs_pool", "expires_at": expires_in(3600)}
+            )
+
+        app = GitHubApp(
+            "12345",
+            pem(make_key()),
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            pool_installations=["7"],
+        )
+        assert await app.token_for_repo("test-owner/private-repo") is None
+
+        pool = GitHubTokenPool(["ghp_static"])
+        await app.refresh_pool(pool)
+        assert pool.tokens == ["ghp_static", "ghs_pool"]
+
+    async def test_transient_errors_retried(self):
+        """Test app API calls go through the per-host retry and breaker."""
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request.url.path)
+            if len(attempts) == 1:
+                return httpx.Response(502)
+            if request.url.path.endswith("/installation"):
+                return httpx.Response(200, json={"id": 42})
+            return httpx.Response(
+                201, json={"token": "ghs_retried", "expires_at": expires_in(3600)}
+            )
+
+        app = GitHubApp(
+            "12345",
+            pem(make_key()),
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        assert await app.token_for_repo("test-owner/test-repo") == "ghs_retried"
+        assert attempts == [
+            "/repos/test-owner/test-repo/installation",
+            "/repos/test-owner/test-repo/installation",
+            "/app/installations/42/access_tokens",
+        ]
+
+    async def test_installations_with_private_repos_stay_out_of_pool(self):
+        """Test only installations covering public repos alone join the pool."""
+        listed = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/installation/repositories":
+                token = request.headers["Authorization"].split()[-1]
+                listed.append(token)
+                private = token == "ghs_8"
+                return httpx.Response(
+                    200,
+                    json={"repositories": [{"private": False}, {"private": private}]},
+                )
+            installation = request.url.path.split("/")[3]
+            return httpx.Response(
+                201,
+                json={"token": f"ghs_{installation}", "expires_at": expires_in(3600)},
+            )
+
+        app = GitHubApp(
+            "12345",
+            pem(make_key()),
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            pool_installations=["7", "8"],
+        )
+        pool = GitHubTokenPool([])
+        await app.refresh_pool(pool)
+        await app.refresh_pool(pool)
+
+        assert pool.tokens == ["ghs_7"]
+        # Each minted token is checked once
+        assert listed == ["ghs_7", "ghs_8"]
@@ -0,0 +1,69 @@
+import httpx
+from services.github import GitHubService
+from services.github_cache import (
+    CachedResponse,
+    InMemoryResponseCache,
+    SQLiteResponseCache,
+    cache_key,
+)
+
+
+class TestGitHubCache:
+    """Test cases for the GitHub conditional request cache."""
+
+    def test_cache_key_depends_on_token(self):
+        """Test the same URL is cached separately per token."""
+        url = "https://api.github.com/repos/a/b"
+        assert cache_key(url, None, "token a") != cache_key(url, None, "token b")
+        assert cache_key(url, {"x": 1, "y": 2}, None) == cache_key(
+            url, {"y": 2, "x": 1}, None
+        )
+
+    def test_in_memory_cache_evicts_least_recently_used(self):
+        """Test the in-memory backend keeps at most max_entries."""
+        cache = InMemoryResponseCache(max_entries=2)
+        cache.set("a", CachedResponse(body=b"a", etag='"a"'))
+        cache.set("b", CachedResponse(body=b"b", etag='"b"'))
+        cache.get("a")
+        cache.set("c", CachedResponse(body=b"c", etag='"c"'))
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a").body == b"a"
+
+    def test_sqlite_cache_round_trip_and_eviction(self, tmp_path):
+        """Test the SQLite backend persists entries and enforces its bound."""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = SQLiteResponseCache(path, max_entries=2)
+        cache.set("a", CachedResponse(body=b"a", etag='"a"', headers={"link": "x"}))
+        cache.set("b", CachedResponse(body=b"b", last_modified="yesterday"))
+        cache.set("c", CachedResponse(body=b"c", etag='"c"'))
+
+        reopened = SQLiteResponseCache(path, max_entries=2)
+        assert len(reopened) == 2
+        assert reopened.get("a") is None
+        assert reopened.get("b").last_modified == "yesterday"
+
+    async def test_not_modified_response_replays_cached_body(self):
+        """Test a 304 from GitHub is served from the cache."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200, json={"full_name": "a/b"}, headers={"ETag": '"v1"'}
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService(
+            "test-token", client=client, cache=InMemoryResponseCache()
+        )
+
+        first = await service._get("https://api.github.com/repos/a/b")
+        second = await service._get("https://api.github.com/repos/a/b")
+
+        assert seen == [None, '"v1"']
+        assert second.status_code == 200
+        assert second.json() == first.json() == {"full_name": "a/b"}
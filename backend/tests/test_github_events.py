@@ -0,0 +1,126 @@
+import hmac
+import hashlib
+from unittest.mock import AsyncMock
+import routes.github_webhook as github_webhook
+from services.monitor import MonitorService
+from services.github_events import (
+    GitHubEventStore,
+    event_from_payload,
+    is_merge_event,
+    verify_signature,
+)
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class TestGitHubEvents:
+    """Test cases for GitHub webhook verification and the event store."""
+
+    def test_verify_signature(self):
+        """Test only a matching HMAC-SHA256 signature is accepted."""
+        body = b'{"action": "closed"}'
+        assert verify_signature("secret", body, sign("secret", body))
+        assert not verify_signature("secret", body, sign("other", body))
+        assert not verify_signature("secret", body + b" ", sign("secret", body))
+        assert not verify_signature("secret", body, None)
+        assert not verify_signature("", body, sign("", body))
+
+    def test_is_merge_event(self):
+        """Test merged PRs and default-branch pushes count as merges."""
+        repository = {"full_name": "test-owner/test-repo", "default_branch": "main"}
+        assert is_merge_event(
+            "pull_request",
+            {"action": "closed", "pull_request": {"merged": True}},
+        )
+        assert not is_merge_event(
+            "pull_request",
+            {"action": "closed", "pull_request": {"merged": False}},
+        )
+        assert is_merge_event(
+            "push", {"ref": "refs/heads/main", "repository": repository}
+        )
+        assert not is_merge_event(
+            "push", {"ref": "refs/heads/feature", "repository": repository}
+        )
+
+    def test_event_store_deduplicates_and_bounds(self):
+        """Test redeliveries are rejected and old events are evicted."""
+        store = GitHubEventStore(":memory:", max_entries=2)
+        payload = {"repository": {"full_name": "Test-Owner/Test-Repo"}}
+
+        first = event_from_payload("delivery-1", "push", payload)
+        assert store.append(first)
+        assert not store.append(first)
+
+        store.append(event_from_payload("delivery-2", "push", payload))
+        store.append(event_from_payload("delivery-3", "push", payload))
+
+        events = store.events_since("test-owner/test-repo", 0)
+        assert len(store) == 2
+        assert [e.delivery_id for e in events] == ["delivery-2", "delivery-3"]
+
+    async def test_debounced_digests_reload_by_id(
+        self, monkeypatch, fake_supabase, sample_monitor_data
+    ):
+        """Test one task sends every digest, reloading monitors by id with email."""
+        email_monitor = dict(
+            sample_monitor_data,
+            id="00000000-0000-0000-0000-000000000002",
+            delivery_method="email",
+            email="team@example.com",
+        )
+        rows = {row["id"]: row for row in (sample_monitor_data, email_monitor)}
+        fake_supabase.responses["monitors"] = lambda q: rows[q.called("eq")[0][0][1]]
+        run_monitor_digest = AsyncMock()
+        monkeypatch.setattr(github_webhook, "run_monitor_digest", run_monitor_digest)
+        monkeypatch.setattr(github_webhook, "GITHUB_WEBHOOK_DEBOUNCE_SECONDS", 0)
+        monkeypatch.setattr(
+            github_webhook, "get_async_supabase", AsyncMock(return_value=fake_supabase)
+        )
+        github_webhook._pending_monitors.update(rows)
+
+        await github_webhook._debounced_digests(list(rows))
+
+        sent = {
+            str(call.args[0].id): call.kwargs
+            for call in run_monitor_digest.call_args_list
+        }
+        assert sent.keys() == rows.keys()
+        assert sent[email_monitor["id"]]["email"] == "team@example.com"
+        assert sent[email_monitor["id"]]["delivery_method"] == "email"
+        assert not github_webhook._pending_monitors
+
+    async def test_debounced_digest_skipped_when_merges_already_reported(
+        self, monkeypatch, fake_supabase, sample_monitor_data
+    ):
+        """Test a monitor whose last digest postdates every stored merge is skipped."""
+        store = GitHubEventStore(":memory:")
+        merge = event_from_payload(
+            "delivery-1",
+            "pull_request",
+            {
+                "action": "closed",
+                "pull_request": {"merged": True},
+                "repository": {"full_name": sample_monitor_data["repo"]},
+            },
+        )
+        merge.received_at = 1_700_000_000.0
+        store.append(merge)
+        monkeypatch.setattr(github_webhook, "get_event_store", lambda: store)
+        run_monitor_digest = AsyncMock()
+        monkeypatch.setattr(github_webhook, "run_monitor_digest", run_monitor_digest)
+        monitor_service = MonitorService(fake_supabase)
+
+        fake_supabase.responses["monitors"] = dict(
+            sample_monitor_data, last_digest_until="2023-11-14T22:20:00+00:00"
+        )
+        await github_webhook._send_digest(sample_monitor_data["id"], monitor_service)
+        run_monitor_digest.assert_not_called()
+
+        fake_supabase.responses["monitors"] = dict(
+            sample_monitor_data, last_digest_until="2023-11-14T22:10:00+00:00"
+        )
+        await github_webhook._send_digest(sample_monitor_data["id"], monitor_service)
+        run_monitor_digest.assert_awaited_once()
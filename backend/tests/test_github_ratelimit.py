@@ -0,0 +1,73 @@
+import time
+import httpx
+import pytest
+from services.github import GitHubService
+from services.github_cache import InMemoryResponseCache
+from services.github_ratelimit import (
+    GitHubRateLimitError,
+    RateLimitScheduler,
+    resource_for,
+    token_fingerprint,
+)
+
+
+class TestRateLimitScheduler:
+    """Test cases for the GitHub rate limit scheduler."""
+
+    def test_resource_for_url(self):
+        """Test URLs map to the core, search and graphql buckets."""
+        assert resource_for("https://api.github.com/repos/a/b") == "core"
+        assert resource_for("https://api.github.com/search/issues") == "search"
+        assert resource_for("https://api.github.com/graphql") == "graphql"
+
+    def test_update_tracks_budget_per_token(self):
+        """Test rate limit headers update only the matching token's bucket."""
+        scheduler = RateLimitScheduler()
+        response = httpx.Response(
+            200,
+            headers={
+                "X-RateLimit-Limit": "30",
+                "X-RateLimit-Remaining": "7",
+                "X-RateLimit-Reset": str(int(time.time()) + 60),
+                "X-RateLimit-Resource": "search",
+            },
+        )
+        scheduler.update("token-a", "search", response)
+
+        assert scheduler.remaining("token-a", "search") == 7
+        assert scheduler.remaining("token-b", "search") is None
+        assert scheduler.remaining("token-a", "core") is None
+
+    async def test_acquire_fails_fast_when_reset_is_too_far(self):
+        """Test an exhausted bucket raises instead of waiting past max_wait."""
+        scheduler = RateLimitScheduler(max_wait=1)
+        bucket = scheduler.bucket("token-a", "core")
+        bucket.remaining = 0
+        bucket.reset_at = time.time() + 3600
+
+        with pytest.raises(GitHubRateLimitError):
+            await scheduler.acquire("token-a", "core")
+
+    async def test_secondary_rate_limit_is_retried(self):
+        """Test a 403 with Retry-After is retried instead of failing the digest."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(
+                    403,
+                    headers={"Retry-After": "0"},
+                    json={"message": "You have exceeded a secondary rate limit"},
+                )
+            return httpx.Response(200, json={"private": False})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        scheduler = RateLimitScheduler(jitter=0)
+        service = GitHubService(
+            client=client, cache=InMemoryResponseCache(), scheduler=scheduler
+        )
+
+        assert not await service.is_repo_private("a/b", "user-token")
+        assert len(calls) == 2
+        assert token_fingerprint("token user-token") != "anonymous"
@@ -1,3 +1,6 @@
+import json
+import httpx
+from datetime import datetime, timezone
 from services.github import GitHubService
 
 
@@ -64,3 +67,260 @@ class TestGitHubService:
 
         assert len(result["other"]) == 1
         assert result["other"][0] == "unknown: some message"
+
+    def test_services_share_pooled_client(self):
+        """Test GitHubService instances reuse the application-scoped client."""
+        first = GitHubService("token-a")
+        second = GitHubService("token-b")
+        assert first.client is second.client
+
+    async def test_is_repo_private_uses_injected_client(self):
+        """Test is_repo_private goes through the injected client."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/repos/test-owner/test-repo"
+            assert request.headers["Authorization"] == "token user-token"
+            return httpx.Response(200, json={"private": True})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService(client=client)
+
+        assert await service.is_repo_private("test-owner/test-repo", "user-token")
+
+    async def test_fetch_repository_data_concurrent_matches_sequential(self):
+        """Test concurrent and sequential fetch modes return the same data."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/search/issues":
+                return httpx.Response(
+                    200, json={"total_count": 2, "items": [{"id": 1}]}
+                )
+            if request.url.path.endswith("/commits"):
+                return httpx.Response(
+                    200, json=[{"commit": {"message": "fix: handle timeout"}}]
+                )
+            return httpx.Response(200, json={"full_name": "test-owner/test-repo"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService("test-token", client=client)
+
+        until = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        sequential = await service.fetch_repository_data(
+            "test-owner/test-repo", concurrent=False, until=until
+        )
+        concurrent = await service.fetch_repository_data(
+            "test-owner/test-repo", concurrent=True, until=until
+        )
+
+        assert sequential == concurrent
+        assert concurrent["summary_counts"]["prs_opened"] == 2
+        assert concurrent["summary_counts"]["commits"] == 1
+        assert concurrent["grouped_commits"] == {"bugfix": ["fix: handle timeout"]}
+
+    async def test_fetch_repository_data_uses_cursor_window(self):
+        """Test searches and commits are bounded by the window and cursor sha."""
+        queries = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/search/issues":
+                queries.append(request.url.params["q"])
+                return httpx.Response(200, json={"total_count": 1, "items": []})
+            if request.url.path.endswith("/commits"):
+                assert request.url.params["since"] == "2024-01-01T00:00:00Z"
+                assert request.url.params["until"] == "2024-01-02T00:00:00Z"
+                return httpx.Response(
+                    200,
+                    json=[
+                        {"sha": "new", "commit": {"message": "feat: add export"}},
+                        {"sha": "seen", "commit": {"message": "fix: old change"}},
+                    ],
+                )
+            return httpx.Response(200, json={"full_name": "test-owner/test-repo"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService("test-token", client=client)
+
+        result = await service.fetch_repository_data(
+            "test-owner/test-repo",
+            since=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            until=datetime(2024, 1, 2, tzinfo=timezone.utc),
+            last_commit_sha="seen",
+        )
+
+        assert all(
+            q.endswith(":2024-01-01T00:00:00Z..2024-01-01T23:59:59Z") for q in queries
+        )
+        assert result["summary_counts"]["commits"] == 1
+        assert result["grouped_commits"] == {"feature": ["feat: add export"]}
+        assert result["head_sha"] == "new"
+        assert result["window"] == {
+            "since": "2024-01-01T00:00:00Z",
+            "until": "2024-01-02T00:00:00Z",
+        }
+
+    async def test_fetch_repositories_graphql_batches_repos(self):
+        """Test several repos are fetched with one aliased GraphQL request."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            query = json.loads(request.content)["query"]
+            assert "r0: repository" in query and "r1: repository" in query
+            history = {
+                "totalCount": 1,
+                "nodes": [{"oid": "abc", "message": "docs: update README"}],
+            }
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "r0": {
+                            "nameWithOwner": "test-owner/test-repo",
+                            "isPrivate": True,
+                            "defaultBranchRef": {"target": {"history": history}},
+                        },
+                        "r0_prs_opened": {"issueCount": 4},
+                        "r0_issues_closed": {"issueCount": 2},
+                        "r1": None,
+                    }
+                },
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService("test-token", client=client)
+
+        result = await service.fetch_repositories_graphql(
+            ["test-owner/test-repo", "test-owner/missing"]
+        )
+
+        assert len(requests) == 1
+        assert list(result) == ["test-owner/test-repo"]
+        data = result["test-owner/test-repo"]
+        assert data["repository"]["private"] is True
+        assert data["summary_counts"]["prs_opened"] == 4
+        assert data["summary_counts"]["issues_closed"] == 2
+        assert data["summary_counts"]["prs_closed"] == 0
+        assert data["grouped_commits"] == {"docs": ["docs: update README"]}
+
+    async def test_graphql_history_stops_at_last_commit_sha(self):
+        """Test the GraphQL backend skips commits already reported, like REST."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            history = {
+                "totalCount": 3,
+                "nodes": [
+                    {"oid": "new", "message": "feat: add export"},
+                    {"oid": "seen", "message": "fix: crash"},
+                    {"oid": "older", "message": "docs: update README"},
+                ],
+            }
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "r0": {
+                            "nameWithOwner": "test-owner/test-repo",
+                            "defaultBranchRef": {"target": {"history": history}},
+                        }
+                    }
+                },
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService("test-token", client=client)
+        service.fetch_backend = "graphql"
+
+        result = await service.fetch_repository_data(
+            "test-owner/test-repo", last_commit_sha="seen"
+        )
+        caught_up = await service.fetch_repository_data(
+            "test-owner/test-repo", last_commit_sha="new"
+        )
+
+        assert result["grouped_commits"] == {"feature": ["feat: add export"]}
+        assert result["summary_counts"]["commits"] == 1
+        assert result["head_sha"] == "new"
+        assert caught_up["summary_counts"]["commits"] == 0
+        assert caught_up["head_sha"] is None
+
+    async def test_graphql_history_pages_past_first_hundred(self):
+        """Test GraphQL windows over 100 commits page on, up to max_commits."""
+        shas = [f"c{i}" for i in range(250)]
+        afters = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            variables = json.loads(request.content)["variables"]
+            afters.append(variables.get("after"))
+            offset = int(variables.get("after") or 0)
+            page = shas[offset : offset + 100]
+            history = {
+                "totalCount": len(shas),
+                "pageInfo": {
+                    "hasNextPage": offset + 100 < len(shas),
+                    "endCursor": str(offset + len(page)),
+                },
+                "nodes": [{"oid": sha, "message": "fix: typo"} for sha in page],
+            }
+            repository = {
+                "nameWithOwner": "test-owner/test-repo",
+                "defaultBranchRef": {"target": {"history": history}},
+            }
+            key = "repository" if "after" in variables else "r0"
+            return httpx.Response(200, json={"data": {key: repository}})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService("test-token", client=client)
+        service.max_commits = 1000
+
+        result = await service.fetch_repositories_graphql(["test-owner/test-repo"])
+        data = result["test-owner/test-repo"]
+        assert afters == [None, "100", "200"]
+        assert data["summary_counts"]["commits"] == 250
+        assert len(data["grouped_commits"]["bugfix"]) == 250
+
+        afters.clear()
+        service.max_commits = 150
+        result = await service.fetch_repositories_graphql(["test-owner/test-repo"])
+        assert afters == [None, "100"]
+        assert result["test-owner/test-repo"]["summary_counts"]["commits"] == 150
+
+        afters.clear()
+        service.max_commits = 1000
+        result = await service.fetch_repositories_graphql(
+            ["test-owner/test-repo"], last_commit_shas={"test-owner/test-repo": "c120"}
+        )
+        assert afters == [None, "100"]
+        assert result["test-owner/test-repo"]["summary_counts"]["commits"] == 120
+
+    async def test_iter_commits_follows_next_links_within_budget(self):
+        """Test commit streaming follows Link headers and honours max_items."""
+        pages = {
+            "1": ([{"sha": "a"}, {"sha": "b"}], "2"),
+            "2": ([{"sha": "c"}, {"sha": "d"}], "3"),
+            "3": ([{"sha": "e"}], None),
+        }
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = request.url.params.get("page", "1")
+            requested.append(page)
+            items, next_page = pages[page]
+            headers = {}
+            if next_page:
+                headers["Link"] = (
+                    f"<https://api.github.com/repos/o/r/commits?page={next_page}>; "
+                    'rel="next"'
+                )
+            return httpx.Response(200, json=items, headers=headers)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = GitHubService("test-token", client=client)
+
+        everything = [c["sha"] async for c in service.iter_commits("o/r", "2024")]
+        budgeted = [
+            c["sha"] async for c in service.iter_commits("o/r", "2024", max_items=3)
+        ]
+
+        assert everything == ["a", "b", "c", "d", "e"]
+        assert budgeted == ["a", "b", "c"]
+        assert requested == ["1", "2", "3", "1", "2"]
@@ -0,0 +1,152 @@
+import httpx
+import pytest
+from services.github import GitHubService, RepositoryNotFoundError
+from services.github_cache import InMemoryResponseCache
+from services.github_ratelimit import RateLimitScheduler
+from services.github_tokens import GitHubTokenPool
+
+
+def rate_limited(remaining: int) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers={
+            "x-ratelimit-limit": "5000",
+            "x-ratelimit-remaining": str(remaining),
+            "x-ratelimit-reset": "9999999999",
+        },
+    )
+
+
+class TestGitHubTokenPool:
+    """Test cases for the GitHub token pool."""
+
+    def test_choose_prefers_most_remaining_budget(self):
+        """Test the token with the most remaining budget is picked."""
+        scheduler = RateLimitScheduler()
+        pool = GitHubTokenPool(["a", "b", "c"], scheduler=scheduler)
+        scheduler.update(pool.token_id("a"), "core", rate_limited(100))
+        scheduler.update(pool.token_id("b"), "core", rate_limited(4000))
+        scheduler.update(pool.token_id("c"), "core", rate_limited(0))
+
+        assert pool.choose("core") == "b"
+        assert pool.choose("core", exclude=["b"]) == "a"
+
+    def test_quarantined_tokens_are_skipped(self):
+        """Test quarantined tokens leave the pool until the quarantine ends."""
+        pool = GitHubTokenPool(["a", "b"], scheduler=RateLimitScheduler())
+        pool.quarantine("a", 401)
+        assert pool.available() == ["b"]
+        assert {pool.choose("core") for _ in range(4)} == {"b"}
+
+        # An expired quarantine returns the token to the pool
+        pool.quarantine_seconds = 0
+        pool.quarantine("a", 401)
+        assert pool.available() == ["a", "b"]
+
+    async def test_service_rotates_away_from_revoked_token(self):
+        """Test a 401 quarantines the token and the request moves on."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            auth = request.headers.get("Authorization")
+            seen.append(auth)
+            if auth == "token revoked":
+                return httpx.Response(401, json={"message": "Bad credentials"})
+            return httpx.Response(200, json={"private": False})
+
+        scheduler = RateLimitScheduler(jitter=0)
+        pool = GitHubTokenPool(["revoked", "good"], scheduler=scheduler)
+        # Make the revoked token look like the best choice
+        scheduler.update(pool.token_id("good"), "core", rate_limited(10))
+        service = GitHubService(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            scheduler=scheduler,
+            token_pool=pool,
+        )
+        service.cache = None
+
+        response = await service._get(f"{service.base_url}/repos/o/r")
+
+        assert response.status_code == 200
+        assert seen == ["token revoked", "token good"]
+        assert pool.available() == ["good"]
+
+    async def test_forbidden_on_every_token_is_not_quarantined(self):
+        """Test a 403 for the resource itself leaves the tokens in the pool."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(403, json={"message": "Repository access blocked"})
+
+        scheduler = RateLimitScheduler(jitter=0)
+        pool = GitHubTokenPool(["a", "b"], scheduler=scheduler)
+        service = GitHubService(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            scheduler=scheduler,
+            token_pool=pool,
+        )
+        service.cache = None
+
+        response = await service._send("GET", f"{service.base_url}/repos/o/r", {})
+
+        assert response.status_code == 403
+        assert pool.available() == ["a", "b"]
+
+    async def test_cache_keyed_on_pooled_token_used(self):
+        """Test pooled responses are cached per token, never shared across them."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            auth = request.headers["Authorization"]
+            seen.append((auth, request.headers.get("If-None-Match")))
+            return httpx.Response(200, json={}, headers={"etag": f'"{auth}"'})
+
+        scheduler = RateLimitScheduler(jitter=0)
+        pool = GitHubTokenPool(["a", "b"], scheduler=scheduler)
+        service = GitHubService(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            scheduler=scheduler,
+            token_pool=pool,
+            cache=InMemoryResponseCache(),
+        )
+        url = f"{service.base_url}/repos/o/r/commits"
+
+        scheduler.update(pool.token_id("b"), "core", rate_limited(10))
+        await service._get(url)
+        scheduler.update(pool.token_id("a"), "core", rate_limited(5))
+        scheduler.update(pool.token_id("b"), "core", rate_limited(4000))
+        await service._get(url)
+        scheduler.update(pool.token_id("a"), "core", rate_limited(4000))
+        await service._get(url)
+
+        assert seen == [
+            ("token a", None),
+            ("token b", None),
+            ("token a", '"token a"'),
+        ]
+        assert len(service.cache) == 2
+
+    async def test_pooled_fetch_refuses_private_repo(self):
+        """Test a pooled token that can see a private repo never serves it."""
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return httpx.Response(
+                200,
+                json={"full_name": "o/secret", "private": True},
+                headers={"etag": '"v1"'},
+            )
+
+        scheduler = RateLimitScheduler(jitter=0)
+        service = GitHubService(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            scheduler=scheduler,
+            token_pool=GitHubTokenPool(["pooled"], scheduler=scheduler),
+            cache=InMemoryResponseCache(),
+        )
+
+        with pytest.raises(RepositoryNotFoundError):
+            await service.fetch_repository_data("o/secret")
+
+        assert paths == ["/repos/o/secret"]
+        assert len(service.cache) == 0
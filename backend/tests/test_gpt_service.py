@@ -1,7 +1,33 @@
+from datetime import datetime, timedelta, timezone
 from services.gpt import GPTService
+from utils.prompts import build_summary_prompt, describe_window
 
 
 class TestGPTService:
     def test_constructor_runs(self):
         service = GPTService()
         assert service is not None
+
+    async def test_no_activity_message_names_the_window(self, monkeypatch):
+        """Test the no-activity message reports the digest's real window."""
+        monkeypatch.setenv("OPENAI_ENABLED", "false")
+        until = datetime(2024, 1, 8, tzinfo=timezone.utc)
+
+        summary = await GPTService().generate_digest_summary(
+            summary_counts={},
+            grouped_commits={},
+            repo_name="test-owner/test-repo",
+            since=until - timedelta(days=7),
+            until=until,
+        )
+
+        assert "No activity detected in the last 7 days" in summary
+
+    def test_prompt_names_the_window(self):
+        """Test the window wording reaches the summary prompt."""
+        until = datetime(2024, 1, 8, tzinfo=timezone.utc)
+
+        assert describe_window() == "the last 24 hours"
+        assert describe_window(until - timedelta(hours=6), until) == "the last 6 hours"
+        window = describe_window(until - timedelta(days=7), until)
+        assert "activity from the last 7 days" in build_summary_prompt("- x", window)
@@ -0,0 +1,39 @@
+import time
+from services.ownership import OwnershipCache
+
+
+class TestOwnershipCache:
+    """Test cases for the monitor -> org ownership cache."""
+
+    def test_entries_expire(self):
+        """Test owners are forgotten after the TTL."""
+        cache = OwnershipCache(ttl=0.02)
+        cache.set("m1", "org-1")
+
+        assert cache.get("m1") == "org-1"
+        time.sleep(0.03)
+        assert cache.get("m1") is None
+        assert len(cache) == 0
+
+    def test_invalidate_monitor_and_org(self):
+        """Test deleting a monitor or disbanding an org drops its entries."""
+        cache = OwnershipCache(ttl=60)
+        cache.set("m1", "org-1")
+        cache.set("m2", "org-1")
+        cache.set("m3", "org-2")
+
+        cache.invalidate("m3")
+        assert cache.get("m3") is None
+        cache.invalidate_org("org-1")
+        assert len(cache) == 0
+
+    def test_oldest_entry_evicted_when_full(self):
+        """Test the cache stays bounded."""
+        cache = OwnershipCache(ttl=60, max_entries=2)
+        cache.set("m1", "org-1")
+        cache.set("m2", "org-1")
+        cache.set("m3", "org-1")
+
+        assert cache.get("m1") is None
+        assert cache.get("m3") == "org-1"
+        assert len(cache) == 2
@@ -0,0 +1,126 @@
+import asyncio
+import httpx
+import pytest
+from services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    call_with_resilience,
+    circuit_breakers,
+    deadline,
+)
+
+FAST = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+def server_error(status: int = 503) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.example.com/x")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestRetry:
+    """Test cases for bounded retries."""
+
+    async def test_transient_error_is_retried(self):
+        """Test a 5xx is retried and a later success returned."""
+        calls = 0
+
+        async def flaky() -> str:
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise server_error()
+            return "ok"
+
+        assert await call_with_resilience("api.example.com", flaky, FAST) == "ok"
+        assert calls == 3
+        assert circuit_breakers.get("api.example.com").failures == 0
+
+    async def test_non_transient_error_is_not_retried(self):
+        """Test a 404 or programming error fails at once without a breaker hit."""
+        calls = 0
+
+        async def missing() -> None:
+            nonlocal calls
+            calls += 1
+            raise server_error(404)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_resilience("api.example.com", missing, FAST)
+        assert calls == 1
+        assert circuit_breakers.get("api.example.com").state == CircuitBreaker.CLOSED
+
+    async def test_attempts_are_bounded(self):
+        """Test retries stop after max_attempts."""
+        calls = 0
+
+        async def down() -> None:
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("refused")
+
+        with pytest.raises(httpx.ConnectError):
+            await call_with_resilience("api.example.com", down, FAST)
+        assert calls == 3
+
+    async def test_deadline_bounds_slow_calls(self):
+        """Test a call is cut off when the enclosing deadline passes."""
+
+        async def slow() -> None:
+            await asyncio.sleep(1)
+
+        breaker = circuit_breakers.get("slow.example.com")
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await call_with_resilience(
+                    "slow.example.com", slow, RetryPolicy(max_attempts=1)
+                )
+            # Running out of our own time is not a failure of the host
+            assert breaker.failures == 0
+            await asyncio.sleep(0.06)
+            with pytest.raises(DeadlineExceeded):
+                await call_with_resilience("slow.example.com", slow)
+
+
+class TestCircuitBreaker:
+    """Test cases for per-host circuit breakers."""
+
+    async def test_open_circuit_fails_fast(self):
+        """Test the circuit opens after repeated failures and skips calls."""
+        breaker = circuit_breakers.get("down.example.com")
+        breaker.failure_threshold = 3
+        calls = 0
+
+        async def down() -> None:
+            nonlocal calls
+            calls += 1
+            raise server_error(502)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_resilience("down.example.com", down, FAST)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert circuit_breakers.any_open()
+
+        with pytest.raises(CircuitOpenError):
+            await call_with_resilience("down.example.com", down, FAST)
+        assert calls == 3
+        assert circuit_breakers.snapshot()["down.example.com"]["state"] == "open"
+
+    async def test_half_open_trial_closes_circuit(self):
+        """Test one trial call is let through after the reset timeout."""
+        breaker = CircuitBreaker("h", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from routes.digest import fetch_and_summarize
+from services.github import GitHubService
+from services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for request coalescing."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test concurrent callers with the same key trigger one call."""
+        flight: SingleFlight[int] = SingleFlight(ttl=60)
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flight.do("repo", fetch) for _ in range(5)))
+
+        assert results == [42] * 5
+        assert calls == 1
+        assert await flight.do("repo", fetch) == 42
+        assert calls == 1
+
+    async def test_distinct_keys_and_failures_are_not_shared(self):
+        """Test different keys run separately and errors are not cached."""
+        flight: SingleFlight[str] = SingleFlight(ttl=60)
+        attempts = 0
+
+        async def flaky() -> str:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("GitHub unavailable")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await flight.do(("a/b", "1d", "public"), flaky)
+        assert await flight.do(("a/b", "1d", "public"), flaky) == "ok"
+        assert await flight.do(("a/b", "1d", "token"), flaky) == "ok"
+        assert attempts == 3
+
+    async def test_monitors_with_different_cursors_share_fetch(self):
+        """Test one fetch serves every cursor; only a trimmed window is re-summarized."""
+        github_service = GitHubService("test-token")
+        github_service.fetch_repository_data = AsyncMock(
+            return_value={
+                "repository": {"full_name": "test-owner/shared-repo"},
+                "summary_counts": {"commits": 2},
+                "grouped_commits": {"feature": ["feat: add export"]},
+                "head_sha": "new",
+                "commits": [
+                    {"sha": "new", "message": "feat: add export"},
+                    {"sha": "seen", "message": "fix: handle empty repos"},
+                ],
+            }
+        )
+        gpt_service = AsyncMock()
+        gpt_service.generate_digest_summary.side_effect = (
+            lambda summary_counts, **_: f"{summary_counts['commits']} commits"
+        )
+        until = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        window = {"since": until - timedelta(days=1), "until": until}
+
+        results = await asyncio.gather(
+            *(
+                fetch_and_summarize(
+                    github_service,
+                    gpt_service,
+                    "test-owner/shared-repo",
+                    last_commit_sha=sha,
+                    **window,
+                )
+                for sha in (None, "older", "seen")
+            )
+        )
+
+        github_service.fetch_repository_data.assert_awaited_once()
+        assert [summary for _, summary in results] == [
+            "2 commits",
+            "2 commits",
+            "1 commits",
+        ]
+        trimmed, _ = results[2]
+        assert trimmed["head_sha"] == "new"
+        assert [c["sha"] for c in trimmed["commits"]] == ["new"]
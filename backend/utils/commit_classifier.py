@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import logging
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Category -> keywords matched anywhere in the (lowercased) commit summary
+DEFAULT_CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "bugfix": ["fix", "bug"],
+    "feature": ["feat", "feature"],
+    "perf": ["perf", "speed"],
+    "docs": ["doc"],
+    "refactor": ["refactor"],
+}
+
+# Conventional commit type -> category; a mapped prefix decides the category
+DEFAULT_CONVENTIONAL_TYPES: Dict[str, str] = {
+    "fix": "bugfix",
+    "bugfix": "bugfix",
+    "hotfix": "bugfix",
+    "feat": "feature",
+    "feature": "feature",
+    "perf": "perf",
+    "docs": "docs",
+    "doc": "docs",
+    "refactor": "refactor",
+}
+
+FALLBACK_CATEGORY = "other"
+
+# Only a colon this close to the start can end a `type(scope)!:` prefix
+CONVENTIONAL_PREFIX_MAX = 40
+
+
+class CommitClassifier:
+    """Single-pass keyword classifier for commit summaries.
+
+    Every keyword is folded into one compiled alternation, longest first,
+    and each lowercased summary is scanned once with ``findall``. Overlaps
+    are resolved up front: a matched keyword also counts for every keyword
+    inside it (``docker`` for ``doc``), and the few keywords that could
+    start inside a match and run past it (``perf`` then ``fix`` in
+    ``perfix``) get a substring check when that match is seen. A
+    conventional-commit prefix with a mapped type takes precedence over
+    keyword matches.
+    """
+
+    def __init__(
+        self,
+        categories: Optional[Mapping[str, Sequence[str]]] = None,
+        conventional_types: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        categories = categories if categories is not None else DEFAULT_CATEGORY_KEYWORDS
+        self.categories: List[str] = list(categories)
+        conventional_types = (
+            conventional_types
+            if conventional_types is not None
+            else DEFAULT_CONVENTIONAL_TYPES
+        )
+        # Types mapped to a category that is not configured fall back to
+        # keyword matching instead of failing at group time
+        known = set(self.all_categories)
+        unknown = sorted(t for t, c in conventional_types.items() if c not in known)
+        if unknown:
+            logger.warning(
+                f"Ignoring conventional commit types for unconfigured categories: "
+                f"{unknown}"
+            )
+        self.conventional_types: Dict[str, str] = {
+            t: c for t, c in conventional_types.items() if c in known
+        }
+        keyword_categories: Dict[str, Set[int]] = {}
+        for index, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                if keyword:
+                    keyword_categories.setdefault(keyword.lower(), set()).add(index)
+        keywords_sorted = sorted(keyword_categories, key=len, reverse=True)
+        # A match also stands for every keyword it contains
+        self._keyword_categories: Dict[str, Tuple[int, ...]] = {
+            keyword: tuple(
+                sorted(
+                    index
+                    for other, indexes in keyword_categories.items()
+                    if other in keyword
+                    for index in indexes
+                )
+            )
+            for keyword in keywords_sorted
+        }
+        # Keywords that can begin inside a match and end past it, which a
+        # non-overlapping scan would skip
+        self._straddling: Dict[str, Tuple[Tuple[str, Tuple[int, ...]], ...]] = {}
+        for keyword in keywords_sorted:
+            straddling = tuple(
+                (other, self._keyword_categories[other])
+                for other in keywords_sorted
+                if other not in keyword
+                and any(other.startswith(keyword[i:]) for i in range(1, len(keyword)))
+            )
+            if straddling:
+                self._straddling[keyword] = straddling
+        self._pattern: Optional["re.Pattern[str]"] = (
+            re.compile("|".join(re.escape(k) for k in keywords_sorted))
+            if keywords_sorted
+            else None
+        )
+
+    @property
+    def all_categories(self) -> List[str]:
+        return self.categories + [FALLBACK_CATEGORY]
+
+    def classify(self, summary: str) -> List[str]:
+        """Return the categories for ``summary`` (``["other"]`` if none match)."""
+        grouped = self.group([summary])
+        return [category for category, items in grouped.items() if items]
+
+    def group(
+        self,
+        summaries: Iterable[str],
+        into: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict[str, List[str]]:
+        """Append each summary to every category it matches.
+
+        Returns ``into`` (or a new dict with one list per category, including
+        empty ones). This is the hot loop, so lookups are bound to locals.
+        """
+        grouped = (
+            into
+            if into is not None
+            else {category: [] for category in self.all_categories}
+        )
+        other = grouped[FALLBACK_CATEGORY]
+        conventional_types = self.conventional_types
+        lists = [grouped[category] for category in self.categories]
+        keyword_categories = self._keyword_categories
+        straddling = self._straddling
+        findall = self._pattern.findall if self._pattern is not None else None
+
+        for summary in summaries:
+            lowered = summary.lower()
+            colon = lowered.find(":", 0, CONVENTIONAL_PREFIX_MAX)
+            if colon > 0:
+                # `feat(scope)!: ...` -> "feat"; unknown types fall through
+                commit_type = lowered[:colon]
+                category = conventional_types.get(commit_type)
+                if category is None and (
+                    "(" in commit_type or commit_type.endswith("!")
+                ):
+                    category = conventional_types.get(
+                        commit_type.split("(", 1)[0].rstrip("!")
+                    )
+                if category:
+                    grouped[category].append(summary)
+                    continue
+
+            matches = findall(lowered) if findall is not None else None
+            if not matches:
+                other.append(summary)
+                continue
+            if len(matches) == 1 and matches[0] not in straddling:
+                for index in keyword_categories[matches[0]]:
+                    lists[index].append(summary)
+                continue
+            hits: Set[int] = set()
+            for match in matches:
+                hits.update(keyword_categories[match])
+                for keyword, indexes in straddling.get(match, ()):
+                    if keyword in lowered:
+                        hits.update(indexes)
+            for index in sorted(hits):
+                lists[index].append(summary)
+        return grouped
+
+
+def classifier_from_env() -> CommitClassifier:
+    """Build a classifier, optionally overridden by JSON in the environment.
+
+    COMMIT_CATEGORIES: {"bugfix": ["fix", "bug"], ...}
+    COMMIT_CONVENTIONAL_TYPES: {"fix": "bugfix", ...}
+    """
+    categories = None
+    conventional_types = None
+    try:
+        if os.getenv("COMMIT_CATEGORIES"):
+            categories = json.loads(os.environ["COMMIT_CATEGORIES"])
+        if os.getenv("COMMIT_CONVENTIONAL_TYPES"):
+            conventional_types = json.loads(os.environ["COMMIT_CONVENTIONAL_TYPES"])
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid commit category configuration, using defaults: {e}")
+        categories = conventional_types = None
+    return CommitClassifier(categories, conventional_types)
+
+
+_default_classifier: Optional[CommitClassifier] = None
+
+
+def get_commit_classifier() -> CommitClassifier:
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = classifier_from_env()
+    return _default_classifier
@@ -1,4 +1,24 @@
-def build_summary_prompt(grouped_highlights: str) -> str:
+from datetime import datetime
+from typing import Optional
+
+
+def describe_window(
+    since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> str:
+    """Wording for a digest window ending now, e.g. "the last 3 days"."""
+    if since is None or until is None:
+        return "the last 24 hours"
+    hours = round((until - since).total_seconds() / 3600)
+    if hours <= 1:
+        return "the last hour"
+    if hours <= 48:
+        return f"the last {hours} hours"
+    return f"the last {round(hours / 24)} days"
+
+
+def build_summary_prompt(
+    grouped_highlights: str, window: str = "the last 24 hours"
+) -> str:
 
     return f"""
 You are an assistant completing the Highlights section of a Slack digest summarizing GitHub activity.
@@ -28,7 +48,7 @@ Example highlights output format:
      • Optimized image rendering
 
 
-Data to use to create highlights:
+Data to use to create highlights (activity from {window}):
 {grouped_highlights}
 
 Your output:
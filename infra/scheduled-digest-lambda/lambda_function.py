@@ -106,6 +106,7 @@ async def trigger_digests(monitors):
                 "repo": monitor["repo"],
                 "delivery_method": monitor["delivery_method"],
                 "webhook_url": monitor["webhook_url"],
+                "email": monitor.get("email"),
                 "frequency": monitor["frequency"],
             }
 